@@ -28,6 +28,10 @@ extras["cli"] = [
     # Note: installs `prompt-toolkit` in the background
 ]
 
+extras["async"] = [
+    "aiohttp",
+]
+
 extras["torch"] = [
     "torch",
 ]
@@ -51,6 +55,7 @@ extras["testing"] = extras["cli"] + [
     "soundfile",
     "Pillow",
 ]
+extras["testing"] += extras["async"]
 
 # Typing extra dependencies list is duplicated in `.pre-commit-config.yaml`
 # Please make sure to update the list there when adding a new typing dependency.
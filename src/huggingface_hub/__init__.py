@@ -52,13 +52,22 @@ __version__ = "0.12.0.dev0"
 # WARNING: any comment added in this dictionary definition will be lost when
 # re-generating the file !
 _SUBMOD_ATTRS = {
+    "_async_hf_api": [
+        "AsyncHfApi",
+    ],
     "_login": [
         "interpreter_login",
         "login",
         "logout",
         "notebook_login",
     ],
+    "_remote_file": [
+        "HfRemoteFile",
+        "hf_hub_open",
+    ],
     "_snapshot_download": [
+        "SnapshotDownloadPlan",
+        "SnapshotPlanFile",
         "snapshot_download",
     ],
     "_space_api": [
@@ -93,11 +102,15 @@ _SUBMOD_ATTRS = {
         "push_to_hub_fastai",
     ],
     "file_download": [
+        "BatchDownloadError",
+        "CachedFileMmap",
         "HfFileMetadata",
         "cached_download",
         "get_hf_file_metadata",
         "hf_hub_download",
+        "hf_hub_download_many",
         "hf_hub_url",
+        "mmap_cached_file",
         "try_to_load_from_cache",
     ],
     "hf_api": [
@@ -134,6 +147,7 @@ _SUBMOD_ATTRS = {
         "get_full_repo_name",
         "get_model_tags",
         "get_repo_discussions",
+        "get_safetensors_metadata",
         "get_space_runtime",
         "like",
         "list_datasets",
@@ -146,6 +160,7 @@ _SUBMOD_ATTRS = {
         "merge_pull_request",
         "model_info",
         "move_repo",
+        "parse_safetensors_file_metadata",
         "rename_discussion",
         "repo_type_and_id_from_hf_id",
         "request_space_hardware",
@@ -189,6 +204,7 @@ _SUBMOD_ATTRS = {
         "Repository",
     ],
     "utils": [
+        "AdaptiveConcurrency",
         "CacheNotFound",
         "CachedFileInfo",
         "CachedRepoInfo",
@@ -197,8 +213,14 @@ _SUBMOD_ATTRS = {
         "DeleteCacheStrategy",
         "HFCacheInfo",
         "HfFolder",
+        "SafetensorsFileMetadata",
+        "SafetensorsParsingError",
+        "SafetensorsRepoMetadata",
+        "TensorInfo",
         "cached_assets_path",
+        "configure_http_backend",
         "dump_environment_info",
+        "get_session",
         "logging",
         "scan_cache_dir",
     ],
@@ -308,10 +330,15 @@ __getattr__, __dir__, __all__ = _attach(
 # make style
 # ```
 if TYPE_CHECKING:  # pragma: no cover
+    from ._async_hf_api import AsyncHfApi  # noqa: F401
     from ._login import interpreter_login  # noqa: F401
     from ._login import login  # noqa: F401
     from ._login import logout  # noqa: F401
     from ._login import notebook_login  # noqa: F401
+    from ._remote_file import HfRemoteFile  # noqa: F401
+    from ._remote_file import hf_hub_open  # noqa: F401
+    from ._snapshot_download import SnapshotDownloadPlan  # noqa: F401
+    from ._snapshot_download import SnapshotPlanFile  # noqa: F401
     from ._snapshot_download import snapshot_download  # noqa: F401
     from ._space_api import SpaceHardware  # noqa: F401
     from ._space_api import SpaceRuntime  # noqa: F401
@@ -336,11 +363,15 @@ if TYPE_CHECKING:  # pragma: no cover
     from .fastai_utils import _save_pretrained_fastai  # noqa: F401
     from .fastai_utils import from_pretrained_fastai  # noqa: F401
     from .fastai_utils import push_to_hub_fastai  # noqa: F401
+    from .file_download import BatchDownloadError  # noqa: F401
+    from .file_download import CachedFileMmap  # noqa: F401
     from .file_download import HfFileMetadata  # noqa: F401
     from .file_download import cached_download  # noqa: F401
     from .file_download import get_hf_file_metadata  # noqa: F401
     from .file_download import hf_hub_download  # noqa: F401
+    from .file_download import hf_hub_download_many  # noqa: F401
     from .file_download import hf_hub_url  # noqa: F401
+    from .file_download import mmap_cached_file  # noqa: F401
     from .file_download import try_to_load_from_cache  # noqa: F401
     from .hf_api import CommitInfo  # noqa: F401
     from .hf_api import CommitOperation  # noqa: F401
@@ -375,6 +406,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from .hf_api import get_full_repo_name  # noqa: F401
     from .hf_api import get_model_tags  # noqa: F401
     from .hf_api import get_repo_discussions  # noqa: F401
+    from .hf_api import get_safetensors_metadata  # noqa: F401
     from .hf_api import get_space_runtime  # noqa: F401
     from .hf_api import like  # noqa: F401
     from .hf_api import list_datasets  # noqa: F401
@@ -387,6 +419,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from .hf_api import merge_pull_request  # noqa: F401
     from .hf_api import model_info  # noqa: F401
     from .hf_api import move_repo  # noqa: F401
+    from .hf_api import parse_safetensors_file_metadata  # noqa: F401
     from .hf_api import rename_discussion  # noqa: F401
     from .hf_api import repo_type_and_id_from_hf_id  # noqa: F401
     from .hf_api import request_space_hardware  # noqa: F401
@@ -416,6 +449,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from .repocard_data import EvalResult  # noqa: F401
     from .repocard_data import ModelCardData  # noqa: F401
     from .repository import Repository  # noqa: F401
+    from .utils import AdaptiveConcurrency  # noqa: F401
     from .utils import CachedFileInfo  # noqa: F401
     from .utils import CachedRepoInfo  # noqa: F401
     from .utils import CachedRevisionInfo  # noqa: F401
@@ -424,8 +458,14 @@ if TYPE_CHECKING:  # pragma: no cover
     from .utils import DeleteCacheStrategy  # noqa: F401
     from .utils import HFCacheInfo  # noqa: F401
     from .utils import HfFolder  # noqa: F401
+    from .utils import SafetensorsFileMetadata  # noqa: F401
+    from .utils import SafetensorsParsingError  # noqa: F401
+    from .utils import SafetensorsRepoMetadata  # noqa: F401
+    from .utils import TensorInfo  # noqa: F401
     from .utils import cached_assets_path  # noqa: F401
+    from .utils import configure_http_backend  # noqa: F401
     from .utils import dump_environment_info  # noqa: F401
+    from .utils import get_session  # noqa: F401
     from .utils import logging  # noqa: F401
     from .utils import scan_cache_dir  # noqa: F401
     from .utils.endpoint_helpers import DatasetFilter  # noqa: F401
@@ -0,0 +1,333 @@
+"""
+Asyncio-based engine to download many files from a repo concurrently.
+
+Used by [`snapshot_download`] when `HF_HUB_ENABLE_ASYNC_DOWNLOAD` is set. Files are
+downloaded with `aiohttp` by a pool of workers sharing a single connection pool. The
+cache layout is the same as [`hf_hub_download`]: blobs are downloaded under a file lock,
+verified against their etag and symlinked from the snapshot folder.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlparse
+
+from filelock import FileLock, Timeout
+
+from .file_download import (
+    _chmod_and_replace,
+    _create_relative_symlink,
+    _get_etag_hasher,
+    _link_shared_blob,
+    _move_to_shared_blobs,
+    hf_hub_url,
+)
+from .utils import (
+    AdaptiveConcurrency,
+    ahf_raise_for_status,
+    is_aiohttp_available,
+    logging,
+)
+from .utils._concurrency import (
+    _CONGESTION_RETRY_DELAY,
+    _MAX_CONGESTION_RETRIES,
+    is_congestion_error,
+)
+
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+logger = logging.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Number of attempts to download a file before failing. Connection errors in the middle
+# of a download are resumed from the last byte received.
+_ASYNC_DOWNLOAD_MAX_ATTEMPTS = 5
+
+# Interval between two attempts to acquire a blob lock held by another process.
+_LOCK_POLL_INTERVAL = 0.1
+
+
+def run_coroutine(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from synchronous code and return its result.
+
+    If an event loop is already running in the current thread (e.g. in a notebook), the
+    coroutine is run in a new event loop in a separate thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()  # type: ignore
+
+
+async def _acquire_lock(lock: FileLock) -> None:
+    # Polling with a non-blocking acquire to avoid blocking the event loop.
+    while True:
+        try:
+            lock.acquire(timeout=0)
+            return
+        except Timeout:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+
+
+async def _download_blob(
+    session: "aiohttp.ClientSession",
+    url: str,
+    incomplete_path: str,
+    *,
+    etag: str,
+    size: Optional[int],
+    headers: Dict[str, str],
+    proxies: Optional[Dict],
+) -> None:
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    proxy = proxies.get(urlparse(url).scheme) if proxies else None
+    hasher = _get_etag_hasher(etag, size)
+    downloaded_size = 0
+
+    with open(incomplete_path, "wb") as f:
+        for attempt in range(_ASYNC_DOWNLOAD_MAX_ATTEMPTS):
+            request_headers = dict(headers)
+            if downloaded_size > 0:
+                request_headers["Range"] = f"bytes={downloaded_size}-"
+            try:
+                # Redirections to the CDN are followed. `aiohttp` drops the
+                # authorization header when redirected to another host.
+                async with session.get(
+                    url, headers=request_headers, proxy=proxy
+                ) as response:
+                    await ahf_raise_for_status(response)
+                    if downloaded_size > 0 and response.status != 206:
+                        # Range not supported by server => start over
+                        f.seek(0)
+                        f.truncate()
+                        downloaded_size = 0
+                        hasher = _get_etag_hasher(etag, size)
+                    async for chunk in response.content.iter_chunked(1024 * 1024):
+                        await loop.run_in_executor(None, f.write, chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+                        downloaded_size += len(chunk)
+                break
+            except (aiohttp.ClientPayloadError, aiohttp.ClientConnectionError) as error:
+                if attempt + 1 == _ASYNC_DOWNLOAD_MAX_ATTEMPTS:
+                    raise
+                logger.warning(
+                    f"Error while downloading {url}: '{error}'. Resuming from byte"
+                    f" {downloaded_size}."
+                )
+            except asyncio.TimeoutError:
+                if attempt + 1 == _ASYNC_DOWNLOAD_MAX_ATTEMPTS:
+                    raise
+                logger.warning(
+                    f"Timeout while downloading {url}. Resuming from byte"
+                    f" {downloaded_size}."
+                )
+
+    if hasher is not None and hasher.hexdigest() != etag:
+        os.remove(incomplete_path)
+        raise OSError(
+            f"Consistency check failed: content downloaded from {url} does not match"
+            f" its etag ({etag}). The download might have been corrupted. Please retry."
+        )
+
+
+async def _download_file(
+    session: "aiohttp.ClientSession",
+    *,
+    repo_id: str,
+    repo_type: str,
+    commit_hash: str,
+    storage_folder: str,
+    filename: str,
+    file_info: Dict[str, Any],
+    headers: Dict[str, str],
+    proxies: Optional[Dict],
+    fallback_download: Callable[[str], str],
+) -> bool:
+    """Download a file to the cache, following the same steps as [`hf_hub_download`].
+
+    Returns `False` if the file was already cached.
+    """
+    relative_filename = os.path.join(*filename.split("/"))
+    pointer_path = os.path.join(
+        storage_folder, "snapshots", commit_hash, relative_filename
+    )
+    if os.path.exists(pointer_path):
+        return False
+
+    etag = file_info.get("etag")
+    if etag is None:
+        # Etag is unknown => blob path cannot be known in advance
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, fallback_download, filename)
+        return True
+
+    blob_path = os.path.join(storage_folder, "blobs", etag)
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    os.makedirs(os.path.dirname(pointer_path), exist_ok=True)
+
+    lock_path = blob_path + ".lock"
+    lock = FileLock(lock_path)
+    await _acquire_lock(lock)
+    try:
+        # If the download just completed while the lock was activated.
+        if os.path.exists(pointer_path):
+            return False
+        if os.path.exists(blob_path) or _link_shared_blob(
+            storage_folder, etag, blob_path
+        ):
+            # we have the blob already (maybe from another repo), but not the pointer
+            _create_relative_symlink(blob_path, pointer_path, new_blob=False)
+            return False
+
+        incomplete_path = blob_path + ".incomplete"
+        await _download_blob(
+            session,
+            hf_hub_url(repo_id, filename, repo_type=repo_type, revision=commit_hash),
+            incomplete_path,
+            etag=etag,
+            size=file_info.get("size"),
+            headers=headers,
+            proxies=proxies,
+        )
+        _chmod_and_replace(incomplete_path, blob_path)
+        _move_to_shared_blobs(storage_folder, etag, blob_path)
+        _create_relative_symlink(blob_path, pointer_path, new_blob=True)
+        return True
+    finally:
+        lock.release()
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+async def download_snapshot_files(
+    *,
+    repo_id: str,
+    repo_type: str,
+    commit_hash: str,
+    storage_folder: str,
+    files: Dict[str, Dict[str, Any]],
+    headers: Dict[str, str],
+    proxies: Optional[Dict],
+    max_concurrency: Union[int, AdaptiveConcurrency],
+    fallback_download: Callable[[str], str],
+    progress: Any,
+) -> None:
+    """Download files of a commit concurrently with `aiohttp`.
+
+    Args:
+        files (`Dict[str, Dict[str, Any]]`):
+            Files to download, in order, with their `"size"` and `"etag"`.
+        headers (`Dict[str, str]`):
+            Headers sent to the Hub (see [`~utils.build_hf_headers`]).
+        max_concurrency (`int` or [`AdaptiveConcurrency`]):
+            Maximum number of files downloaded at the same time. If a controller is
+            passed, concurrency is adjusted to the observed throughput and downloads
+            failing because of congestion are retried.
+        fallback_download (`Callable[[str], str]`):
+            Synchronous function used to download a file if its etag is unknown. Run in
+            a thread.
+        progress (`tqdm`):
+            Progress bar updated each time a file is downloaded.
+
+    Raises the first error encountered. Files already being downloaded are completed
+    but no new download is started.
+    """
+    if not is_aiohttp_available():
+        raise ValueError(
+            "Async download is enabled (HF_HUB_ENABLE_ASYNC_DOWNLOAD=1) but 'aiohttp'"
+            " package is not available in your environment. Try `pip install aiohttp`."
+        )
+    import aiohttp
+
+    controller: Optional[AdaptiveConcurrency] = None
+    if isinstance(max_concurrency, AdaptiveConcurrency):
+        controller = max_concurrency
+        max_workers = controller.max_concurrency
+    else:
+        max_workers = max_concurrency
+
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for filename in files:
+        queue.put_nowait(filename)
+    errors: List[BaseException] = []
+    attempts: Dict[str, int] = {}
+
+    async def _worker(session: aiohttp.ClientSession) -> None:
+        while not queue.empty() and not errors:
+            filename = queue.get_nowait()
+            if controller is not None:
+                await controller.acquire_async()
+            start = loop.time()
+            try:
+                downloaded = await _download_file(
+                    session,
+                    repo_id=repo_id,
+                    repo_type=repo_type,
+                    commit_hash=commit_hash,
+                    storage_folder=storage_folder,
+                    filename=filename,
+                    file_info=files[filename],
+                    headers=headers,
+                    proxies=proxies,
+                    fallback_download=fallback_download,
+                )
+            except Exception as error:
+                if controller is not None:
+                    controller.release()
+                attempts[filename] = attempts.get(filename, 0) + 1
+                if (
+                    controller is None
+                    or attempts[filename] > _MAX_CONGESTION_RETRIES
+                    or not is_congestion_error(error)
+                ):
+                    errors.append(error)
+                    return
+                # Back off and retry the file later
+                controller.record_congestion()
+                await asyncio.sleep(
+                    _CONGESTION_RETRY_DELAY * 2 ** (attempts[filename] - 1)
+                )
+                queue.put_nowait(filename)
+                continue
+            if controller is not None:
+                controller.release()
+                # Cached files are not downloaded => no impact on throughput
+                controller.record_success(
+                    (files[filename].get("size") or 0) if downloaded else 0,
+                    loop.time() - start,
+                )
+            progress.update(1)
+
+    loop = asyncio.get_running_loop()
+    # Same timeouts as `hf_hub_download` (10s to connect and between 2 chunks)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=10)
+    connector = aiohttp.TCPConnector(limit=max_workers)
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, trust_env=True
+    ) as session:
+        num_workers = max(1, min(max_workers, len(files)))
+        await asyncio.gather(*(_worker(session) for _ in range(num_workers)))
+
+    if len(errors) > 0:
+        raise errors[0]
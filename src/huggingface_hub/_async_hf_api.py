@@ -0,0 +1,511 @@
+"""
+Asyncio client for the read endpoints of the Hub.
+
+[`AsyncHfApi`] mirrors the metadata methods of [`HfApi`] (`model_info`,
+`list_repo_refs`, `list_models`,...) and returns the same dataclasses. All requests go
+through a single `aiohttp` session, i.e. a single connection pool shared by all the
+coroutines using the client.
+"""
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+from urllib.parse import quote
+
+from .community import Discussion, DiscussionWithDetails
+from .constants import HF_HUB_HTTP_POOL_MAXSIZE, REPO_TYPE_MODEL, REPO_TYPES
+from .hf_api import (
+    DatasetInfo,
+    GitRefs,
+    HfApi,
+    ModelInfo,
+    SpaceInfo,
+    _parse_discussion,
+    _parse_discussion_details,
+    _parse_git_refs,
+)
+from .utils import (
+    HfHubHTTPError,
+    ahf_raise_for_status,
+    is_aiohttp_available,
+    validate_hf_hub_args,
+)
+from .utils._pagination import apaginate, encode_query_params
+from .utils._typing import Literal
+from .utils.endpoint_helpers import DatasetFilter, ModelFilter
+
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class AsyncHfApi:
+    """
+    Asyncio client to interact with the read endpoints of the Hub.
+
+    Methods have the same arguments as their [`HfApi`] equivalents and return the same
+    objects. Methods listing items (`list_models`, `get_repo_discussions`,...) return an
+    async iterator that fetches pages lazily.
+
+    The client owns an `aiohttp` session that must be closed once done, either with
+    `await api.close()` or by using the client as an async context manager. The session
+    is bound to the event loop in which it is first used.
+
+    Args:
+        endpoint (`str`, *optional*):
+            Hugging Face Hub base url. Defaults to `HF_ENDPOINT`.
+        token (`str`, *optional*):
+            Hugging Face token. Will default to the locally saved token if not provided.
+        library_name (`str`, *optional*):
+            The name of the library that is making the HTTP request.
+        library_version (`str`, *optional*):
+            The version of the library that is making the HTTP request.
+        user_agent (`str`, `dict`, *optional*):
+            The user agent info in the form of a dictionary or a single string.
+        max_connections (`int`, *optional*):
+            Maximum number of simultaneous connections. Defaults to
+            `HF_HUB_HTTP_POOL_MAXSIZE` (32).
+
+    Example:
+    ```py
+    >>> import asyncio
+    >>> from huggingface_hub import AsyncHfApi
+
+    >>> async def main():
+    ...     async with AsyncHfApi() as api:
+    ...         infos = await asyncio.gather(*(api.model_info(r) for r in ["gpt2", "bert-base-uncased"]))
+    ...         async for model in api.list_models(author="google", limit=10):
+    ...             print(model.modelId)
+
+    >>> asyncio.run(main())
+    ```
+
+    <Tip>
+
+    `aiohttp` has to be installed separately (`pip install huggingface_hub[async]`).
+
+    </Tip>
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        token: Optional[str] = None,
+        library_name: Optional[str] = None,
+        library_version: Optional[str] = None,
+        user_agent: Union[Dict, str, None] = None,
+        max_connections: int = HF_HUB_HTTP_POOL_MAXSIZE,
+    ) -> None:
+        # Sync client used to build headers and query parameters
+        self._api = HfApi(
+            endpoint=endpoint,
+            token=token,
+            library_name=library_name,
+            library_version=library_version,
+            user_agent=user_agent,
+        )
+        self.endpoint = self._api.endpoint
+        self.max_connections = max_connections
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def __aenter__(self) -> "AsyncHfApi":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying `aiohttp` session and its connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None:
+            if not is_aiohttp_available():
+                raise ValueError(
+                    "AsyncHfApi requires the 'aiohttp' package which is not available"
+                    " in your environment. Try `pip install huggingface_hub[async]`."
+                )
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                trust_env=True,
+            )
+        return self._session
+
+    async def _get_json(
+        self,
+        path: str,
+        *,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        import aiohttp
+
+        async with self._get_session().get(
+            path,
+            headers=headers,
+            params=encode_query_params(params or {}),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            await ahf_raise_for_status(response)
+            return await response.json(content_type=None)
+
+    async def whoami(self, token: Optional[str] = None) -> Dict:
+        """Async version of [`HfApi.whoami`]."""
+        headers = self._api._build_hf_headers(token=(token or self._api.token or True))
+        try:
+            return await self._get_json(
+                f"{self.endpoint}/api/whoami-v2", headers=headers
+            )
+        except HfHubHTTPError as e:
+            raise HfHubHTTPError(
+                "Invalid user token. If you didn't pass a user token, make sure you "
+                "are properly logged in by executing `huggingface-cli login`, and "
+                "if you did pass a user token, double-check it's correct.",
+                response=e.response,
+            ) from e
+
+    async def _repo_info(
+        self,
+        repo_id: str,
+        repo_type: str,
+        *,
+        revision: Optional[str],
+        timeout: Optional[float],
+        token: Optional[Union[bool, str]],
+        params: Dict[str, Any],
+    ) -> Dict:
+        path = f"{self.endpoint}/api/{repo_type}s/{repo_id}"
+        if revision is not None:
+            path += f"/revision/{quote(revision, safe='')}"
+        return await self._get_json(
+            path,
+            headers=self._api._build_hf_headers(token=token),
+            params=params,
+            timeout=timeout,
+        )
+
+    @validate_hf_hub_args
+    async def model_info(
+        self,
+        repo_id: str,
+        *,
+        revision: Optional[str] = None,
+        timeout: Optional[float] = None,
+        securityStatus: Optional[bool] = None,
+        files_metadata: bool = False,
+        token: Optional[Union[bool, str]] = None,
+    ) -> ModelInfo:
+        """Async version of [`HfApi.model_info`]."""
+        params: Dict[str, Any] = {}
+        if securityStatus:
+            params["securityStatus"] = True
+        if files_metadata:
+            params["blobs"] = True
+        data = await self._repo_info(
+            repo_id,
+            "model",
+            revision=revision,
+            timeout=timeout,
+            token=token,
+            params=params,
+        )
+        return ModelInfo(**data)
+
+    @validate_hf_hub_args
+    async def dataset_info(
+        self,
+        repo_id: str,
+        *,
+        revision: Optional[str] = None,
+        timeout: Optional[float] = None,
+        files_metadata: bool = False,
+        token: Optional[Union[bool, str]] = None,
+    ) -> DatasetInfo:
+        """Async version of [`HfApi.dataset_info`]."""
+        data = await self._repo_info(
+            repo_id,
+            "dataset",
+            revision=revision,
+            timeout=timeout,
+            token=token,
+            params={"blobs": True} if files_metadata else {},
+        )
+        return DatasetInfo(**data)
+
+    @validate_hf_hub_args
+    async def space_info(
+        self,
+        repo_id: str,
+        *,
+        revision: Optional[str] = None,
+        timeout: Optional[float] = None,
+        files_metadata: bool = False,
+        token: Optional[Union[bool, str]] = None,
+    ) -> SpaceInfo:
+        """Async version of [`HfApi.space_info`]."""
+        data = await self._repo_info(
+            repo_id,
+            "space",
+            revision=revision,
+            timeout=timeout,
+            token=token,
+            params={"blobs": True} if files_metadata else {},
+        )
+        return SpaceInfo(**data)
+
+    @validate_hf_hub_args
+    async def repo_info(
+        self,
+        repo_id: str,
+        *,
+        revision: Optional[str] = None,
+        repo_type: Optional[str] = None,
+        timeout: Optional[float] = None,
+        files_metadata: bool = False,
+        token: Optional[Union[bool, str]] = None,
+    ) -> Union[ModelInfo, DatasetInfo, SpaceInfo]:
+        """Async version of [`HfApi.repo_info`]."""
+        if repo_type is None or repo_type == "model":
+            method = self.model_info
+        elif repo_type == "dataset":
+            method = self.dataset_info  # type: ignore
+        elif repo_type == "space":
+            method = self.space_info  # type: ignore
+        else:
+            raise ValueError("Unsupported repo type.")
+        return await method(
+            repo_id,
+            revision=revision,
+            token=token,
+            timeout=timeout,
+            files_metadata=files_metadata,
+        )
+
+    @validate_hf_hub_args
+    async def list_repo_files(
+        self,
+        repo_id: str,
+        *,
+        revision: Optional[str] = None,
+        repo_type: Optional[str] = None,
+        timeout: Optional[float] = None,
+        token: Optional[Union[bool, str]] = None,
+    ) -> List[str]:
+        """Async version of [`HfApi.list_repo_files`]."""
+        repo_info = await self.repo_info(
+            repo_id,
+            revision=revision,
+            repo_type=repo_type,
+            token=token,
+            timeout=timeout,
+        )
+        return [f.rfilename for f in repo_info.siblings]
+
+    @validate_hf_hub_args
+    async def list_repo_refs(
+        self,
+        repo_id: str,
+        *,
+        repo_type: Optional[str] = None,
+        token: Optional[Union[bool, str]] = None,
+    ) -> GitRefs:
+        """Async version of [`HfApi.list_repo_refs`]."""
+        repo_type = repo_type or REPO_TYPE_MODEL
+        data = await self._get_json(
+            f"{self.endpoint}/api/{repo_type}s/{repo_id}/refs",
+            headers=self._api._build_hf_headers(token=token),
+        )
+        return _parse_git_refs(data)
+
+    @validate_hf_hub_args
+    async def get_repo_discussions(
+        self,
+        repo_id: str,
+        *,
+        repo_type: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> AsyncIterator[Discussion]:
+        """Async version of [`HfApi.get_repo_discussions`].
+
+        Returns an async iterator: pages of discussions are fetched while iterating.
+        """
+        if repo_type not in REPO_TYPES:
+            raise ValueError(f"Invalid repo type, must be one of {REPO_TYPES}")
+        if repo_type is None:
+            repo_type = REPO_TYPE_MODEL
+
+        headers = self._api._build_hf_headers(token=token)
+        has_next, page_index = True, 0
+        while has_next:
+            paginated_discussions = await self._get_json(
+                f"{self.endpoint}/api/{repo_type}s/{repo_id}/discussions",
+                headers=headers,
+                params={"p": page_index},
+            )
+            total = paginated_discussions["count"]
+            start = paginated_discussions["start"]
+            discussions = paginated_discussions["discussions"]
+            has_next = (start + len(discussions)) < total
+            for discussion in discussions:
+                yield _parse_discussion(discussion)
+            page_index = page_index + 1
+
+    @validate_hf_hub_args
+    async def get_discussion_details(
+        self,
+        repo_id: str,
+        discussion_num: int,
+        *,
+        repo_type: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> DiscussionWithDetails:
+        """Async version of [`HfApi.get_discussion_details`]."""
+        if not isinstance(discussion_num, int) or discussion_num <= 0:
+            raise ValueError("Invalid discussion_num, must be a positive integer")
+        if repo_type not in REPO_TYPES:
+            raise ValueError(f"Invalid repo type, must be one of {REPO_TYPES}")
+        if repo_type is None:
+            repo_type = REPO_TYPE_MODEL
+
+        data = await self._get_json(
+            f"{self.endpoint}/api/{repo_type}s/{repo_id}/discussions/{discussion_num}",
+            headers=self._api._build_hf_headers(token=token),
+            params={"diff": "1"},
+        )
+        return _parse_discussion_details(data)
+
+    async def list_models(
+        self,
+        *,
+        filter: Union[ModelFilter, str, Iterable[str], None] = None,
+        author: Optional[str] = None,
+        search: Optional[str] = None,
+        sort: Union[Literal["lastModified"], str, None] = None,
+        direction: Optional[Literal[-1]] = None,
+        limit: Optional[int] = None,
+        full: Optional[bool] = None,
+        cardData: bool = False,
+        fetch_config: bool = False,
+        token: Optional[Union[bool, str]] = None,
+    ) -> AsyncIterator[ModelInfo]:
+        """Async version of [`HfApi.list_models`].
+
+        Returns an async iterator: pages of results are fetched while iterating,
+        following the "Link" header of the responses.
+        """
+        params = self._api._list_models_params(
+            filter=filter,
+            author=author,
+            search=search,
+            sort=sort,
+            direction=direction,
+            limit=limit,
+            full=full,
+            cardData=cardData,
+            fetch_config=fetch_config,
+        )
+        async for item in self._paginate(
+            f"{self.endpoint}/api/models", params=params, token=token, limit=limit
+        ):
+            yield ModelInfo(**item)
+
+    async def list_datasets(
+        self,
+        *,
+        filter: Union[DatasetFilter, str, Iterable[str], None] = None,
+        author: Optional[str] = None,
+        search: Optional[str] = None,
+        sort: Union[Literal["lastModified"], str, None] = None,
+        direction: Optional[Literal[-1]] = None,
+        limit: Optional[int] = None,
+        full: Optional[bool] = None,
+        token: Optional[str] = None,
+    ) -> AsyncIterator[DatasetInfo]:
+        """Async version of [`HfApi.list_datasets`].
+
+        Returns an async iterator: pages of results are fetched while iterating,
+        following the "Link" header of the responses.
+        """
+        params = self._api._list_datasets_params(
+            filter=filter,
+            author=author,
+            search=search,
+            sort=sort,
+            direction=direction,
+            limit=limit,
+            full=full,
+        )
+        async for item in self._paginate(
+            f"{self.endpoint}/api/datasets", params=params, token=token, limit=limit
+        ):
+            yield DatasetInfo(**item)
+
+    async def list_spaces(
+        self,
+        *,
+        filter: Union[str, Iterable[str], None] = None,
+        author: Optional[str] = None,
+        search: Optional[str] = None,
+        sort: Union[Literal["lastModified"], str, None] = None,
+        direction: Optional[Literal[-1]] = None,
+        limit: Optional[int] = None,
+        datasets: Union[str, Iterable[str], None] = None,
+        models: Union[str, Iterable[str], None] = None,
+        linked: bool = False,
+        full: Optional[bool] = None,
+        token: Optional[str] = None,
+    ) -> AsyncIterator[SpaceInfo]:
+        """Async version of [`HfApi.list_spaces`].
+
+        Returns an async iterator: pages of results are fetched while iterating,
+        following the "Link" header of the responses.
+        """
+        params = self._api._list_spaces_params(
+            filter=filter,
+            author=author,
+            search=search,
+            sort=sort,
+            direction=direction,
+            limit=limit,
+            datasets=datasets,
+            models=models,
+            linked=linked,
+            full=full,
+        )
+        async for item in self._paginate(
+            f"{self.endpoint}/api/spaces", params=params, token=token, limit=limit
+        ):
+            yield SpaceInfo(**item)
+
+    async def _paginate(
+        self,
+        path: str,
+        *,
+        params: Dict[str, Any],
+        token: Optional[Union[bool, str]],
+        limit: Optional[int],
+    ) -> AsyncIterator[Any]:
+        if limit is not None and limit <= 0:
+            return
+        count = 0
+        async for item in apaginate(
+            self._get_session(),
+            path,
+            params=params,
+            headers=self._api._build_hf_headers(token=token),
+        ):
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return  # Do not iterate over all pages
@@ -0,0 +1,583 @@
+"""
+Read-through cache server for the `resolve/` endpoints of the Hub.
+
+Started with `huggingface-cli serve-cache`. Machines pointing `HF_ENDPOINT` to this server
+download files from it instead of the Hub. Files are stored in a cache with the same
+layout as `HUGGINGFACE_HUB_CACHE` (blobs, snapshots and refs). A missing file is fetched
+from the Hub only once: clients requesting it while it is being fetched are streamed the
+bytes as soon as they arrive. Other requests (e.g. `/api/...`) are forwarded to the Hub
+without caching.
+"""
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import BinaryIO, Dict, NamedTuple, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+import requests
+from filelock import FileLock
+
+from .constants import ENDPOINT, HUGGINGFACE_HUB_CACHE, REPO_TYPE_MODEL
+from .file_download import (
+    REGEX_COMMIT_HASH,
+    _cache_commit_hash_for_specific_revision,
+    _chmod_and_replace,
+    _create_relative_symlink,
+    _get_fresh_cached_commit_hash,
+    _link_shared_blob,
+    _move_to_shared_blobs,
+    get_hf_file_metadata,
+    http_get,
+    repo_folder_name,
+)
+from .utils import HfHubHTTPError, build_hf_headers, get_session, logging
+
+
+logger = logging.get_logger(__name__)
+
+_RESOLVE_PATH_REGEX = re.compile(
+    r"^/(?:(?P<repo_type>datasets|spaces)/)?(?P<repo_id>.+?)/resolve/"
+    r"(?P<revision>[^/]+)/(?P<filename>.+)$"
+)
+
+_RANGE_REGEX = re.compile(r"^bytes=(\d+)-(\d*)$")
+
+# Headers sent back to the client when the Hub returns an error
+_FORWARDED_ERROR_HEADERS = (
+    "Content-Type",
+    "X-Error-Code",
+    "X-Error-Message",
+    "X-Repo-Commit",
+    "X-Request-Id",
+)
+
+# Headers only valid for a single connection, not forwarded
+_HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Cached files are served without checking the client's token on the Hub only for repos
+# that have been downloaded anonymously within this number of seconds.
+_PUBLIC_REPO_TTL = 10 * 60
+
+
+class _CachedFile(NamedTuple):
+    commit_hash: str
+    etag: str
+    size: Optional[int]
+    blob_path: str
+    pointer_path: str
+    # URL to fetch the file from (`None` if the file is already cached)
+    download_url: Optional[str]
+
+
+class _Fetch:
+    """State of a blob being fetched from the Hub, shared with the clients it streams to."""
+
+    def __init__(self, incomplete_path: str) -> None:
+        self.incomplete_path = incomplete_path
+        self.condition = threading.Condition()
+        self.written = 0
+        # Incremented each time the download restarts from scratch
+        self.generation = 0
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class _NotifyingFile:
+    """File object notifying the clients of a `_Fetch` each time bytes are written."""
+
+    def __init__(self, file: BinaryIO, fetch: _Fetch) -> None:
+        self._file = file
+        self._fetch = fetch
+        self.name = file.name
+
+    def write(self, data: bytes) -> int:
+        written = self._file.write(data)
+        self._file.flush()
+        with self._fetch.condition:
+            self._fetch.written += len(data)
+            self._fetch.condition.notify_all()
+        return written
+
+    def seek(self, offset: int) -> int:
+        return self._file.seek(offset)
+
+    def truncate(self) -> int:
+        with self._fetch.condition:
+            self._fetch.written = 0
+            self._fetch.generation += 1
+            self._fetch.condition.notify_all()
+        return self._file.truncate()
+
+
+class CacheServer(ThreadingHTTPServer):
+    """
+    HTTP server caching files downloaded from the Hub.
+
+    Args:
+        server_address (`Tuple[str, int]`):
+            Host and port to listen to.
+        cache_dir (`str`, *optional*):
+            Folder where files are cached. Defaults to `HUGGINGFACE_HUB_CACHE`.
+        upstream (`str`, *optional*):
+            Url of the Hub to fetch files from. Defaults to `HF_ENDPOINT`.
+        timeout (`float`, *optional*, defaults to 10):
+            Timeout of the requests made to the Hub.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        *,
+        cache_dir: Optional[str] = None,
+        upstream: Optional[str] = None,
+        timeout: float = 10,
+    ) -> None:
+        super().__init__(server_address, _CacheServerRequestHandler)
+        self.cache_dir = cache_dir or HUGGINGFACE_HUB_CACHE
+        self.upstream = (upstream or ENDPOINT).rstrip("/")
+        self.upstream_timeout = timeout
+        self._fetches: Dict[str, _Fetch] = {}
+        self._fetches_lock = threading.Lock()
+        # Last time each repo has been accessed on the Hub without token
+        self._public_repos: Dict[Tuple[str, str], float] = {}
+
+    @property
+    def url(self) -> str:
+        """Url to set as `HF_ENDPOINT` on the clients."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def resolve(
+        self,
+        path: str,
+        *,
+        repo_type: str,
+        repo_id: str,
+        revision: str,
+        filename: str,
+        token: Union[str, bool],
+    ) -> _CachedFile:
+        """Locate a file in the cache, checking the Hub if the revision is not fresh.
+
+        Files are served from the cache without calling the Hub only if the repo is known
+        to be public. Otherwise, the Hub is called with the token of the client to check
+        it has access to the file. If the Hub cannot be reached, files of public repos
+        are served with the last known commit of the revision.
+
+        Raises `ValueError` if the file would be located outside of the cache.
+        """
+        storage_folder = os.path.join(
+            self.cache_dir, repo_folder_name(repo_id=repo_id, repo_type=repo_type)
+        )
+        is_public = self._is_public(repo_type, repo_id)
+
+        commit_hash = _get_fresh_cached_commit_hash(storage_folder, revision)
+        if is_public and commit_hash is not None:
+            cached = _get_cached_file(storage_folder, commit_hash, filename)
+            if cached is not None:
+                return cached
+
+        try:
+            metadata = get_hf_file_metadata(
+                self.upstream + path, token=token, timeout=self.upstream_timeout
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            commit_hash = _read_cached_commit_hash(storage_folder, revision)
+            if is_public and commit_hash is not None:
+                cached = _get_cached_file(storage_folder, commit_hash, filename)
+                if cached is not None:
+                    logger.warning(f"Hub cannot be reached. Serving {path} from cache.")
+                    return cached
+            raise
+        if not token:
+            with self._fetches_lock:
+                self._public_repos[(repo_type, repo_id)] = time.monotonic()
+
+        if metadata.commit_hash is None or metadata.etag is None:
+            raise OSError(
+                f"Distant resource {self.upstream + path} does not have a commit hash"
+                " or an ETag. Make sure the upstream server is a Hugging Face Hub."
+            )
+        if revision != metadata.commit_hash:
+            os.makedirs(storage_folder, exist_ok=True)
+            _cache_commit_hash_for_specific_revision(
+                storage_folder, revision, metadata.commit_hash
+            )
+
+        blob_path = os.path.join(storage_folder, "blobs", metadata.etag)
+        pointer_path = _get_pointer_path(storage_folder, metadata.commit_hash, filename)
+        if not _is_within(blob_path, os.path.join(storage_folder, "blobs")):
+            raise ValueError(f"Invalid ETag for {path}: '{metadata.etag}'.")
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            _link_shared_blob(storage_folder, metadata.etag, blob_path)
+        if os.path.exists(blob_path) and not os.path.exists(pointer_path):
+            os.makedirs(os.path.dirname(pointer_path), exist_ok=True)
+            _create_relative_symlink(blob_path, pointer_path, new_blob=False)
+        return _CachedFile(
+            commit_hash=metadata.commit_hash,
+            etag=metadata.etag,
+            size=metadata.size,
+            blob_path=blob_path,
+            pointer_path=pointer_path,
+            download_url=metadata.location,
+        )
+
+    def _is_public(self, repo_type: str, repo_id: str) -> bool:
+        with self._fetches_lock:
+            last_public_access = self._public_repos.get((repo_type, repo_id))
+        return (
+            last_public_access is not None
+            and time.monotonic() - last_public_access < _PUBLIC_REPO_TTL
+        )
+
+    def get_fetch(
+        self, cached: _CachedFile, token: Union[str, bool]
+    ) -> Optional[_Fetch]:
+        """Return the fetch of a blob, starting it if needed. `None` if blob is cached."""
+        with self._fetches_lock:
+            if os.path.exists(cached.blob_path):
+                return None
+            fetch = self._fetches.get(cached.blob_path)
+            if fetch is None:
+                fetch = _Fetch(cached.blob_path + ".incomplete")
+                self._fetches[cached.blob_path] = fetch
+                threading.Thread(
+                    target=self._run_fetch, args=(fetch, cached, token), daemon=True
+                ).start()
+            return fetch
+
+    def _run_fetch(
+        self, fetch: _Fetch, cached: _CachedFile, token: Union[str, bool]
+    ) -> None:
+        assert cached.download_url is not None
+        try:
+            os.makedirs(os.path.dirname(cached.blob_path), exist_ok=True)
+            os.makedirs(os.path.dirname(cached.pointer_path), exist_ok=True)
+            # Same lock as `hf_hub_download` in case the cache is shared
+            with FileLock(cached.blob_path + ".lock"):
+                if not os.path.exists(cached.blob_path):
+                    # Resume from a previous (interrupted) fetch if any
+                    with open(fetch.incomplete_path, "ab") as f:
+                        resume_size = f.tell()
+                        with fetch.condition:
+                            fetch.written = resume_size
+                        logger.info(f"Fetching {cached.download_url}")
+                        http_get(
+                            cached.download_url,
+                            _NotifyingFile(f, fetch),  # type: ignore
+                            resume_size=resume_size,
+                            headers=build_hf_headers(token=token),
+                            timeout=self.upstream_timeout,
+                            expected_etag=cached.etag,
+                            expected_size=cached.size,
+                        )
+                    _chmod_and_replace(fetch.incomplete_path, cached.blob_path)
+                    _move_to_shared_blobs(
+                        os.path.dirname(os.path.dirname(cached.blob_path)),
+                        cached.etag,
+                        cached.blob_path,
+                    )
+                if not os.path.exists(cached.pointer_path):
+                    _create_relative_symlink(
+                        cached.blob_path, cached.pointer_path, new_blob=True
+                    )
+        except Exception as error:
+            logger.error(f"Error while fetching {cached.download_url}: {error}")
+            fetch.error = error
+        finally:
+            with self._fetches_lock:
+                self._fetches.pop(cached.blob_path, None)
+            with fetch.condition:
+                fetch.done = True
+                fetch.condition.notify_all()
+
+
+class _CacheServerRequestHandler(BaseHTTPRequestHandler):
+    server: CacheServer
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def _get_token(self) -> Union[str, bool]:
+        # Clients are authenticated with their own token (never the one of the server)
+        authorization = self.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            return authorization[len("Bearer ") :]
+        return False
+
+    def _handle(self, send_body: bool) -> None:
+        path = urlparse(self.path).path
+        match = _RESOLVE_PATH_REGEX.match(path)
+        if match is None:
+            self._forward(send_body=send_body)
+            return
+
+        # Validate the decoded values: an encoded "/" could be used to exit the cache
+        repo_id = unquote(match.group("repo_id"))
+        revision = unquote(match.group("revision"))
+        filename = unquote(match.group("filename"))
+        if not all(_is_safe_path(value) for value in (repo_id, revision, filename)):
+            self.send_error(400, f"Invalid path: {path}")
+            return
+
+        token = self._get_token()
+        repo_type = match.group("repo_type")
+        try:
+            cached = self.server.resolve(
+                path,
+                repo_type=repo_type[:-1] if repo_type else REPO_TYPE_MODEL,
+                repo_id=repo_id,
+                revision=revision,
+                filename=filename,
+                token=token,
+            )
+        except ValueError as error:
+            self.send_error(400, str(error))
+            return
+        except HfHubHTTPError as error:
+            self._send_upstream_error(error)
+            return
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self.send_error(504, f"Cannot reach {self.server.upstream}")
+            return
+        except OSError as error:
+            self.send_error(502, str(error))
+            return
+
+        fetch = self.server.get_fetch(cached, token)
+        size = cached.size
+        if size is None:
+            # Size is unknown => wait for the end of the fetch to send Content-Length
+            if fetch is not None:
+                with fetch.condition:
+                    fetch.condition.wait_for(lambda: fetch.done)  # type: ignore
+                fetch = None
+            if not os.path.exists(cached.blob_path):
+                self.send_error(502, f"Error while fetching {path}")
+                return
+            size = os.path.getsize(cached.blob_path)
+
+        start, end = 0, size - 1
+        range_match = _RANGE_REGEX.match(self.headers.get("Range", ""))
+        if range_match is not None and int(range_match.group(1)) < size:
+            start = int(range_match.group(1))
+            end = min(int(range_match.group(2) or size - 1), size - 1)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", f'"{cached.etag}"')
+        self.send_header("X-Repo-Commit", cached.commit_hash)
+        self.send_header("X-Linked-Size", str(size))
+        self.end_headers()
+        if not send_body:
+            return
+
+        try:
+            if fetch is not None:
+                start = _stream_from_fetch(fetch, self.wfile, start, end)
+            if start <= end:
+                _stream_from_file(cached.blob_path, self.wfile, start, end)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client disconnected
+        except Exception as error:
+            # Headers already sent => only way to notify the client is to close
+            logger.error(f"Error while streaming {path}: {error}")
+            self.close_connection = True
+
+    def _send_upstream_error(self, error: HfHubHTTPError) -> None:
+        response = error.response
+        body = response.content or b""
+        self.send_response(response.status_code)
+        for header in _FORWARDED_ERROR_HEADERS:
+            if header in response.headers:
+                self.send_header(header, response.headers[header])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _forward(self, send_body: bool) -> None:
+        """Forward a request to the Hub, without caching."""
+        headers = {
+            key: value
+            for key, value in self.headers.items()
+            if key.lower() not in _HOP_BY_HOP_HEADERS and key.lower() != "host"
+        }
+        headers.setdefault("Accept-Encoding", "identity")
+        try:
+            response = get_session().request(
+                self.command,
+                self.server.upstream + self.path,
+                headers=headers,
+                stream=True,
+                allow_redirects=False,
+                timeout=self.server.upstream_timeout,
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self.send_error(504, f"Cannot reach {self.server.upstream}")
+            return
+
+        with response:
+            self.send_response(response.status_code)
+            for key, value in response.headers.items():
+                if key.lower() not in _HOP_BY_HOP_HEADERS:
+                    self.send_header(key, value)
+            if "Content-Length" not in response.headers:
+                self.close_connection = True
+            self.end_headers()
+            if send_body:
+                for chunk in response.raw.stream(_CHUNK_SIZE, decode_content=False):
+                    self.wfile.write(chunk)
+
+
+def _get_cached_file(
+    storage_folder: str, commit_hash: str, filename: str
+) -> Optional[_CachedFile]:
+    pointer_path = _get_pointer_path(storage_folder, commit_hash, filename)
+    if not os.path.exists(pointer_path):
+        return None
+    blob_path = os.path.realpath(pointer_path)
+    # Blob can be in the folder of the repo or in the shared blobs of the cache
+    if not _is_within(blob_path, os.path.dirname(storage_folder)):
+        raise ValueError(f"Invalid file in cache: {pointer_path}")
+    return _CachedFile(
+        commit_hash=commit_hash,
+        etag=os.path.basename(blob_path),
+        size=os.path.getsize(blob_path),
+        blob_path=blob_path,
+        pointer_path=pointer_path,
+        download_url=None,
+    )
+
+
+def _get_pointer_path(storage_folder: str, commit_hash: str, filename: str) -> str:
+    """Path of `filename` in the snapshot of `commit_hash`.
+
+    Raises `ValueError` if the path is not within the snapshot folder (e.g. `filename`
+    contains `".."` or a parent folder is a symlink).
+    """
+    snapshot_folder = os.path.join(storage_folder, "snapshots", commit_hash)
+    if not _is_safe_path(commit_hash) or not _is_safe_path(filename):
+        raise ValueError(f"Invalid file: '{filename}' at revision '{commit_hash}'.")
+    pointer_path = os.path.join(snapshot_folder, *filename.split("/"))
+    # The pointer itself is a symlink to a blob: only its parent folder is resolved
+    if not _is_within(os.path.dirname(pointer_path), snapshot_folder):
+        raise ValueError(f"Invalid file: '{filename}' at revision '{commit_hash}'.")
+    return pointer_path
+
+
+def _is_safe_path(path: str) -> bool:
+    """Return `True` if `path` is a relative path of "/"-separated names.
+
+    Empty names, `"."`, `".."`, absolute paths and names containing an OS separator or a
+    drive are rejected.
+    """
+    for name in path.split("/"):
+        if (
+            name in ("", ".", "..")
+            or "\0" in name
+            or os.sep in name
+            or (os.altsep is not None and os.altsep in name)
+            or os.path.isabs(name)
+            or os.path.splitdrive(name)[0] != ""
+        ):
+            return False
+    return True
+
+
+def _is_within(path: str, folder: str) -> bool:
+    """Return `True` if `path` is `folder` or inside it, once symlinks are resolved."""
+    path = os.path.realpath(path)
+    folder = os.path.realpath(folder)
+    try:
+        return os.path.commonpath([path, folder]) == folder
+    except ValueError:  # Different drives on Windows
+        return False
+
+
+def _read_cached_commit_hash(storage_folder: str, revision: str) -> Optional[str]:
+    """Commit hash of a revision in cache, whatever its age."""
+    if REGEX_COMMIT_HASH.match(revision):
+        return revision
+    ref_path = os.path.join(storage_folder, "refs", revision)
+    if os.path.isfile(ref_path):
+        with open(ref_path) as f:
+            return f.read()
+    return None
+
+
+def _stream_from_fetch(fetch: _Fetch, wfile: BinaryIO, start: int, end: int) -> int:
+    """Stream bytes of a blob being fetched, as they arrive.
+
+    Returns the offset at which to continue from the complete blob once the fetch is
+    done. Raises the error of the fetch if it fails before the end.
+    """
+    offset = start
+    generation = fetch.generation
+    file: Optional[BinaryIO] = None
+    try:
+        while offset <= end:
+            with fetch.condition:
+                # Lambda is only called within this iteration
+                fetch.condition.wait_for(
+                    lambda: fetch.done or fetch.written > offset  # noqa: B023
+                )
+                if fetch.generation != generation:
+                    raise OSError("Fetch restarted from scratch.")
+                written, done, error = fetch.written, fetch.done, fetch.error
+            if done and error is None:
+                break  # Continue from the complete blob
+            if written <= offset:
+                raise error or OSError("Fetch failed.")
+            if file is None:
+                try:
+                    file = open(fetch.incomplete_path, "rb")
+                except FileNotFoundError:
+                    # Fetch just completed => blob has been moved to its final path
+                    file = open(fetch.incomplete_path[: -len(".incomplete")], "rb")
+            file.seek(offset)
+            data = file.read(min(_CHUNK_SIZE, written - offset, end + 1 - offset))
+            wfile.write(data)
+            offset += len(data)
+    finally:
+        if file is not None:
+            file.close()
+    return offset
+
+
+def _stream_from_file(path: str, wfile: BinaryIO, start: int, end: int) -> None:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end + 1 - start
+        while remaining > 0:
+            data = f.read(min(_CHUNK_SIZE, remaining))
+            if not data:
+                raise OSError(f"File {path} is smaller than expected.")
+            wfile.write(data)
+            remaining -= len(data)
@@ -3,21 +3,47 @@ Type definitions and utilities for the `create_commit` API
 """
 import base64
 import io
+import json
 import os
 import warnings
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from contextlib import contextmanager
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path, PurePosixPath
-from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from tqdm.contrib.concurrent import thread_map
 
-import requests
-
 from .constants import ENDPOINT
-from .lfs import UploadInfo, _validate_batch_actions, lfs_upload, post_lfs_batch_info
-from .utils import build_hf_headers, chunk_iterable, hf_raise_for_status, logging
+from .lfs import (
+    LFS_MULTIPART_NUM_THREADS,
+    UploadInfo,
+    _validate_batch_actions,
+    lfs_upload,
+    post_lfs_batch_info,
+)
+from .utils import (
+    AdaptiveConcurrency,
+    build_hf_headers,
+    chunk_iterable,
+    get_session,
+    hf_raise_for_status,
+    logging,
+)
 from .utils import tqdm as hf_tqdm
 from .utils import tqdm_stream_file, validate_hf_hub_args
 from .utils._deprecation import _deprecate_method
@@ -29,6 +55,13 @@ logger = logging.get_logger(__name__)
 
 UploadMode = Literal["lfs", "regular"]
 
+# Files are hashed concurrently: `hashlib` releases the GIL on large inputs.
+UPLOAD_INFO_NUM_THREADS = min(8, os.cpu_count() or 1)
+
+# Regular files are base64-encoded in the commit payload by chunks of this size (must be
+# a multiple of 3 to encode chunks independently).
+B64_ENCODE_CHUNK_SIZE = 3 * 256 * 1024
+
 
 @dataclass
 class CommitOperationDelete:
@@ -87,10 +120,9 @@ class CommitOperationAdd:
 
     path_in_repo: str
     path_or_fileobj: Union[str, Path, bytes, BinaryIO]
-    upload_info: UploadInfo = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        """Validates `path_or_fileobj` and compute `upload_info`."""
+        """Validates `path_or_fileobj`. `upload_info` is computed on first access."""
         # Validate `path_or_fileobj` value
         if isinstance(self.path_or_fileobj, Path):
             self.path_or_fileobj = str(self.path_or_fileobj)
@@ -118,13 +150,26 @@ class CommitOperationAdd:
                     " seek() and tell()"
                 ) from exc
 
-        # Compute "upload_info" attribute
-        if isinstance(self.path_or_fileobj, str):
-            self.upload_info = UploadInfo.from_path(self.path_or_fileobj)
-        elif isinstance(self.path_or_fileobj, bytes):
-            self.upload_info = UploadInfo.from_bytes(self.path_or_fileobj)
-        else:
-            self.upload_info = UploadInfo.from_fileobj(self.path_or_fileobj)
+        self._cached_upload_info: Optional[UploadInfo] = None
+
+    @property
+    def upload_info(self) -> UploadInfo:
+        """
+        (property) Size, sha256 and first 512 bytes of the content to upload.
+
+        Computed the first time it is accessed, which reads the whole content. See
+        [`compute_upload_infos`] to compute it for several operations concurrently.
+        """
+        if self._cached_upload_info is None:
+            if isinstance(self.path_or_fileobj, (str, Path)):
+                self._cached_upload_info = UploadInfo.from_path(
+                    str(self.path_or_fileobj)
+                )
+            elif isinstance(self.path_or_fileobj, bytes):
+                self._cached_upload_info = UploadInfo.from_bytes(self.path_or_fileobj)
+            else:
+                self._cached_upload_info = UploadInfo.from_fileobj(self.path_or_fileobj)
+        return self._cached_upload_info
 
     @_deprecate_method(
         version="0.14", message="Operation is validated at initialization."
@@ -247,6 +292,54 @@ def warn_on_overwriting_operations(operations: List[CommitOperation]) -> None:
                     )
 
 
+def compute_upload_infos(
+    additions: List[CommitOperationAdd], num_threads: Optional[int] = None
+) -> None:
+    """
+    Compute the `upload_info` (size, sha256 and sample) of the additions that don't have
+    it yet, hashing files concurrently.
+
+    Operations reading from a file object are hashed one after the other in the current
+    thread as a same file object could be shared by several operations.
+
+    Args:
+        additions (`List` of `CommitOperationAdd`):
+            The files to hash.
+        num_threads (`int`, *optional*):
+            The number of files to hash concurrently. Defaults to the number of CPUs,
+            capped to 8.
+    """
+    num_threads = num_threads if num_threads is not None else UPLOAD_INFO_NUM_THREADS
+    pending = {id(op): op for op in additions if op._cached_upload_info is None}
+    sequential = [
+        op
+        for op in pending.values()
+        if not isinstance(op.path_or_fileobj, (str, bytes))
+    ]
+    concurrent = [
+        op for op in pending.values() if isinstance(op.path_or_fileobj, (str, bytes))
+    ]
+    if len(concurrent) <= 1 or num_threads <= 1:
+        sequential += concurrent
+        concurrent = []
+
+    for op in sequential:
+        op.upload_info  # computed on first access
+
+    if len(concurrent) > 0:
+        logger.debug(
+            f"Hashing {len(concurrent)} files using up to {num_threads} threads"
+            " concurrently"
+        )
+        thread_map(
+            lambda op: op.upload_info,
+            concurrent,
+            desc=f"Hash {len(concurrent)} files",
+            max_workers=num_threads,
+            tqdm_class=hf_tqdm,
+        )
+
+
 @validate_hf_hub_args
 def upload_lfs_files(
     *,
@@ -255,7 +348,8 @@ def upload_lfs_files(
     repo_id: str,
     token: Optional[str],
     endpoint: Optional[str] = None,
-    num_threads: int = 5,
+    num_threads: Union[int, AdaptiveConcurrency] = 5,
+    num_threads_per_file: int = LFS_MULTIPART_NUM_THREADS,
 ):
     """
     Uploads the content of `additions` to the Hub using the large file storage protocol.
@@ -273,9 +367,14 @@ def upload_lfs_files(
             by a `/`.
         token (`str`, *optional*):
             An authentication token ( See https://huggingface.co/settings/tokens )
-        num_threads (`int`, *optional*):
-            The number of concurrent threads to use when uploading. Defaults to 5.
-
+        num_threads (`int` or [`AdaptiveConcurrency`], *optional*):
+            The number of concurrent threads to use when uploading. Defaults to 5. If an
+            [`AdaptiveConcurrency`] controller is passed, the number of concurrent uploads
+            is adjusted to the observed throughput instead.
+        num_threads_per_file (`int`, *optional*):
+            The number of parts uploaded concurrently for a single file when the
+            multipart transfer protocol is used. Independent from `num_threads`.
+            Defaults to 4.
 
     Raises: `RuntimeError` if an upload failed for any reason
 
@@ -332,13 +431,31 @@ def upload_lfs_files(
         try:
             operation = oid2addop[batch_action["oid"]]
             return _upload_lfs_object(
-                operation=operation, lfs_batch_action=batch_action, token=token
+                operation=operation,
+                lfs_batch_action=batch_action,
+                token=token,
+                num_threads=num_threads_per_file,
             )
         except Exception as exc:
             raise RuntimeError(
                 f"Error while uploading '{operation.path_in_repo}' to the Hub."
             ) from exc
 
+    if isinstance(num_threads, AdaptiveConcurrency):
+        logger.debug(
+            f"Uploading {len(filtered_actions)} LFS files to the Hub using adaptive"
+            f" concurrency (up to {num_threads.max_concurrency} threads)"
+        )
+        num_threads.map(
+            _inner_upload_lfs_object,
+            filtered_actions,
+            sizes=[
+                oid2addop[action["oid"]].upload_info.size for action in filtered_actions
+            ],
+            desc=f"Upload {len(filtered_actions)} LFS files",
+        )
+        return
+
     logger.debug(
         f"Uploading {len(filtered_actions)} LFS files to the Hub using up to"
         f" {num_threads} threads concurrently"
@@ -353,7 +470,10 @@ def upload_lfs_files(
 
 
 def _upload_lfs_object(
-    operation: CommitOperationAdd, lfs_batch_action: dict, token: Optional[str]
+    operation: CommitOperationAdd,
+    lfs_batch_action: dict,
+    token: Optional[str],
+    num_threads: int = LFS_MULTIPART_NUM_THREADS,
 ):
     """
     Handles uploading a given object to the Hub with the LFS protocol.
@@ -371,6 +491,8 @@ def _upload_lfs_object(
             See [`~utils.lfs.post_lfs_batch_info`] for more details.
         token (`str`, *optional*):
             A [user access token](https://hf.co/settings/tokens) to authenticate requests against the Hub
+        num_threads (`int`, *optional*):
+            Maximum number of parts uploaded concurrently in case of a multipart upload.
 
     Raises: `ValueError` if `lfs_batch_action` is improperly formatted
     """
@@ -394,6 +516,7 @@ def _upload_lfs_object(
             verify_action=verify_action,
             upload_info=upload_info,
             token=token,
+            num_threads=num_threads,
         )
         logger.debug(f"{operation.path_in_repo}: Upload successful")
 
@@ -422,6 +545,7 @@ def fetch_upload_modes(
     revision: str,
     endpoint: Optional[str] = None,
     create_pr: bool = False,
+    num_hash_threads: Optional[int] = None,
 ) -> Dict[str, UploadMode]:
     """
     Requests the Hub "preupload" endpoint to determine wether each input file
@@ -440,6 +564,10 @@ def fetch_upload_modes(
             An authentication token ( See https://huggingface.co/settings/tokens )
         revision (`str`):
             The git revision to upload the files to. Can be any valid git revision.
+        num_hash_threads (`int`, *optional*):
+            The number of files to hash concurrently. Files are hashed chunk by chunk,
+            right before requesting their upload mode. Defaults to the number of CPUs,
+            capped to 8.
 
     Returns: `Dict[str, UploadMode]`
         Key is the file path, value is the upload mode ("regular" or "lfs").
@@ -455,7 +583,9 @@ def fetch_upload_modes(
 
     # Fetch upload mode (LFS or regular) chunk by chunk.
     upload_modes: Dict[str, UploadMode] = {}
-    for chunk in chunk_iterable(additions, 256):
+    for chunk_iterator in chunk_iterable(additions, 256):
+        chunk = list(chunk_iterator)
+        compute_upload_infos(chunk, num_threads=num_hash_threads)
         payload = {
             "files": [
                 {
@@ -468,7 +598,7 @@ def fetch_upload_modes(
             ]
         }
 
-        resp = requests.post(
+        resp = get_session().post(
             f"{endpoint}/api/{repo_type}s/{repo_id}/preupload/{revision}",
             json=payload,
             headers=headers,
@@ -499,6 +629,299 @@ def fetch_upload_modes(
     return upload_modes
 
 
+@validate_hf_hub_args
+def upload_additions(
+    *,
+    additions: List[CommitOperationAdd],
+    repo_type: str,
+    repo_id: str,
+    token: Optional[str],
+    revision: str,
+    endpoint: Optional[str] = None,
+    create_pr: bool = False,
+    num_threads: Union[int, AdaptiveConcurrency] = 5,
+    num_threads_per_file: int = LFS_MULTIPART_NUM_THREADS,
+    num_hash_threads: Optional[int] = None,
+) -> Dict[str, UploadMode]:
+    """
+    Hashes `additions`, fetches their upload mode and uploads the LFS ones, as a pipeline.
+
+    Equivalent to [`fetch_upload_modes`] followed by [`upload_lfs_files`] except that the
+    three steps overlap: a file is sent to the "preupload" endpoint as soon as it is
+    hashed and uploaded as soon as the LFS batch endpoint returned instructions for it.
+    Files are grouped by chunks of at most 256 for the "preupload" and LFS batch calls.
+    At most one call of each kind is in flight: files ready in the meantime are sent
+    together in the next call.
+
+    Args:
+        additions (`List` of `CommitOperationAdd`):
+            The files to upload.
+        repo_type (`str`):
+            Type of the repo to upload to: `"model"`, `"dataset"` or `"space"`.
+        repo_id (`str`):
+            A namespace (user or an organization) and a repo name separated
+            by a `/`.
+        token (`str`, *optional*):
+            An authentication token ( See https://huggingface.co/settings/tokens )
+        revision (`str`):
+            The git revision to upload the files to. Can be any valid git revision.
+        num_threads (`int` or [`AdaptiveConcurrency`], *optional*):
+            The number of concurrent threads to use when uploading. Defaults to 5. If an
+            [`AdaptiveConcurrency`] controller is passed, the number of concurrent uploads
+            is adjusted to the observed throughput instead.
+        num_threads_per_file (`int`, *optional*):
+            The number of parts uploaded concurrently for a single file when the
+            multipart transfer protocol is used. Defaults to 4.
+        num_hash_threads (`int`, *optional*):
+            The number of files to hash concurrently. Defaults to the number of CPUs,
+            capped to 8.
+
+    Returns: `Dict[str, UploadMode]`
+        Key is the file path, value is the upload mode ("regular" or "lfs").
+
+    Raises: `RuntimeError` if an upload failed for any reason
+
+    Raises: `ValueError` if the server returns malformed responses
+
+    Raises: [`~utils.HfHubHTTPError`] if the Hub API returned an error
+
+    The first error stops the pipeline: files not uploaded yet are not uploaded.
+    """
+    if len(additions) == 0:
+        return {}
+    return _UploadPipeline(
+        additions=additions,
+        repo_type=repo_type,
+        repo_id=repo_id,
+        token=token,
+        revision=revision,
+        endpoint=endpoint,
+        create_pr=create_pr,
+        num_threads=num_threads,
+        num_threads_per_file=num_threads_per_file,
+        num_hash_threads=num_hash_threads,
+    ).run()
+
+
+class _UploadPipeline:
+    """State of a running [`upload_additions`].
+
+    Work is done in thread pools (hashing, calls to the Hub API, LFS uploads). Results
+    are collected in the calling thread which schedules the next steps. The calling
+    thread is the only one to mutate the state of the pipeline.
+    """
+
+    def __init__(
+        self,
+        additions: List[CommitOperationAdd],
+        repo_type: str,
+        repo_id: str,
+        token: Optional[str],
+        revision: str,
+        endpoint: Optional[str],
+        create_pr: bool,
+        num_threads: Union[int, AdaptiveConcurrency],
+        num_threads_per_file: int,
+        num_hash_threads: Optional[int],
+    ) -> None:
+        # Same operation passed twice is processed once
+        self.additions = list({id(op): op for op in additions}.values())
+        self.repo_type = repo_type
+        self.repo_id = repo_id
+        self.token = token
+        self.revision = revision
+        self.endpoint = endpoint
+        self.create_pr = create_pr
+        self.num_threads = num_threads
+        self.num_threads_per_file = num_threads_per_file
+        self.num_hash_threads = (
+            num_hash_threads
+            if num_hash_threads is not None
+            else UPLOAD_INFO_NUM_THREADS
+        )
+
+        self.upload_modes: Dict[str, UploadMode] = {}
+        self._pending: Dict[Future, Callable[[Any], None]] = {}
+        self._to_preupload: List[CommitOperationAdd] = []
+        self._to_batch: List[CommitOperationAdd] = []
+        self._batched_oids: Set[str] = set()
+        self._preupload_in_flight = False
+        self._batch_in_flight = False
+        self._hash_progress: Optional[hf_tqdm] = None
+        self._upload_progress: Optional[hf_tqdm] = None
+        self._nb_uploads = 0
+
+        self._hash_executor = ThreadPoolExecutor(max_workers=self.num_hash_threads)
+        self._api_executor = ThreadPoolExecutor(max_workers=2)
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=(
+                num_threads.max_concurrency
+                if isinstance(num_threads, AdaptiveConcurrency)
+                else num_threads
+            )
+        )
+
+    def run(self) -> Dict[str, UploadMode]:
+        failed = False
+        try:
+            self._submit_hashes()
+            while len(self._pending) > 0:
+                done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    callback = self._pending.pop(future)
+                    callback(future.result())
+                self._schedule_api_calls()
+        except BaseException:
+            failed = True
+            for future in self._pending:
+                future.cancel()
+            raise
+        finally:
+            # On failure, files being hashed (possibly large ones) are not waited for:
+            # they are hashed in the background and their result is ignored.
+            self._hash_executor.shutdown(wait=not failed)
+            self._api_executor.shutdown(wait=True)
+            self._upload_executor.shutdown(wait=True)
+            for progress in (self._hash_progress, self._upload_progress):
+                if progress is not None:
+                    progress.close()
+        return self.upload_modes
+
+    def _submit_hashes(self) -> None:
+        # A same file object could be shared by several operations: file objects are
+        # hashed one after the other, before any upload starts.
+        compute_upload_infos(
+            [
+                op
+                for op in self.additions
+                if not isinstance(op.path_or_fileobj, (str, bytes))
+            ]
+        )
+        to_hash = [op for op in self.additions if op._cached_upload_info is None]
+        if len(to_hash) > 1:
+            self._hash_progress = hf_tqdm(
+                total=len(to_hash), desc=f"Hash {len(to_hash)} files"
+            )
+        for op in self.additions:
+            if op._cached_upload_info is not None:
+                self._to_preupload.append(op)
+            else:
+                future = self._hash_executor.submit(lambda op: op.upload_info, op)
+                self._pending[future] = partial(self._on_hashed, op)
+        self._schedule_api_calls()
+
+    def _schedule_api_calls(self) -> None:
+        # At most one call of each kind is in flight. Files ready in the meantime are
+        # sent together in the next call.
+        if len(self._to_preupload) > 0 and not self._preupload_in_flight:
+            chunk = self._to_preupload[:256]
+            self._to_preupload = self._to_preupload[256:]
+            preupload_future = self._api_executor.submit(
+                fetch_upload_modes,
+                additions=chunk,
+                repo_type=self.repo_type,
+                repo_id=self.repo_id,
+                token=self.token,
+                revision=self.revision,
+                endpoint=self.endpoint,
+                create_pr=self.create_pr,
+            )
+            self._pending[preupload_future] = partial(self._on_preuploaded, chunk)
+            self._preupload_in_flight = True
+
+        if len(self._to_batch) > 0 and not self._batch_in_flight:
+            chunk = self._to_batch[:256]
+            self._to_batch = self._to_batch[256:]
+            batch_future = self._api_executor.submit(
+                post_lfs_batch_info,
+                upload_infos=[op.upload_info for op in chunk],
+                token=self.token,
+                repo_id=self.repo_id,
+                repo_type=self.repo_type,
+                endpoint=self.endpoint,
+            )
+            self._pending[batch_future] = partial(self._on_batched, chunk)
+            self._batch_in_flight = True
+
+    def _on_hashed(self, op: CommitOperationAdd, _: UploadInfo) -> None:
+        if self._hash_progress is not None:
+            self._hash_progress.update(1)
+        self._to_preupload.append(op)
+
+    def _on_preuploaded(
+        self, chunk: List[CommitOperationAdd], upload_modes: Dict[str, UploadMode]
+    ) -> None:
+        self._preupload_in_flight = False
+        self.upload_modes.update(upload_modes)
+        for op in chunk:
+            if upload_modes[op.path_in_repo] != "lfs":
+                continue
+            # Files with the same content are uploaded once
+            oid = op.upload_info.sha256.hex()
+            if oid not in self._batched_oids:
+                self._batched_oids.add(oid)
+                self._to_batch.append(op)
+
+    def _on_batched(
+        self, chunk: List[CommitOperationAdd], batch_info: Tuple[List[dict], List[dict]]
+    ) -> None:
+        self._batch_in_flight = False
+        batch_actions, batch_errors = batch_info
+        if batch_errors:
+            message = "\n".join(
+                [
+                    f'Encountered error for file with OID {err.get("oid")}:'
+                    f' `{err.get("error", {}).get("message")}'
+                    for err in batch_errors
+                ]
+            )
+            raise ValueError(f"LFS batch endpoint returned errors:\n{message}")
+
+        oid2addop = {op.upload_info.sha256.hex(): op for op in chunk}
+        for action in batch_actions:
+            operation = oid2addop[action["oid"]]
+            if action.get("actions") is None:
+                logger.debug(
+                    f"Content of file {operation.path_in_repo} is already present"
+                    " upstream - skipping upload."
+                )
+                continue
+            self._nb_uploads += 1
+            if self._upload_progress is None:
+                self._upload_progress = hf_tqdm(total=0, desc="Upload LFS files")
+            self._upload_progress.total = self._nb_uploads
+            self._upload_progress.refresh()
+            future = self._upload_executor.submit(self._upload, operation, action)
+            self._pending[future] = self._on_uploaded
+
+    def _upload(self, operation: CommitOperationAdd, batch_action: dict) -> None:
+        def _inner_upload_lfs_object(batch_action: dict) -> None:
+            _upload_lfs_object(
+                operation=operation,
+                lfs_batch_action=batch_action,
+                token=self.token,
+                num_threads=self.num_threads_per_file,
+            )
+
+        try:
+            if isinstance(self.num_threads, AdaptiveConcurrency):
+                self.num_threads.run(
+                    _inner_upload_lfs_object,
+                    batch_action,
+                    size=operation.upload_info.size,
+                )
+            else:
+                _inner_upload_lfs_object(batch_action)
+        except Exception as exc:
+            raise RuntimeError(
+                f"Error while uploading '{operation.path_in_repo}' to the Hub."
+            ) from exc
+
+    def _on_uploaded(self, _: None) -> None:
+        if self._upload_progress is not None:
+            self._upload_progress.update(1)
+
+
 def prepare_commit_payload(
     operations: Iterable[CommitOperation],
     upload_modes: Dict[str, UploadMode],
@@ -510,19 +933,102 @@ def prepare_commit_payload(
     Builds the payload to POST to the `/commit` API of the Hub.
 
     Payload is returned as an iterator so that it can be streamed as a ndjson in the
-    POST request.
+    POST request. Each regular file is held in memory (base64-encoded) while its item is
+    processed. Use [`stream_commit_payload`] to encode the payload by chunks instead.
 
     For more information, see:
         - https://github.com/huggingface/huggingface_hub/issues/1085#issuecomment-1265208073
         - http://ndjson.org/
     """
+    for item, regular_file in _iter_commit_items(
+        operations=operations,
+        upload_modes=upload_modes,
+        commit_message=commit_message,
+        commit_description=commit_description,
+        parent_commit=parent_commit,
+    ):
+        if regular_file is not None:
+            item["value"]["content"] = regular_file.b64content().decode()
+        yield item
+
+
+def stream_commit_payload(
+    operations: Iterable[CommitOperation],
+    upload_modes: Dict[str, UploadMode],
+    commit_message: str,
+    commit_description: Optional[str] = None,
+    parent_commit: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Builds the payload to POST to the `/commit` API of the Hub, as a stream of ndjson
+    bytes.
+
+    Same payload as [`prepare_commit_payload`], except that the content of regular files
+    is read and base64-encoded by chunks, directly in the stream. Memory usage does not
+    depend on the size of the files.
+    """
+    for item, regular_file in _iter_commit_items(
+        operations=operations,
+        upload_modes=upload_modes,
+        commit_message=commit_message,
+        commit_description=commit_description,
+        parent_commit=parent_commit,
+    ):
+        if regular_file is None:
+            yield json.dumps(item).encode()
+            yield b"\n"
+            continue
+        # Base64 only uses characters that don't need to be escaped in JSON: the item is
+        # written by hand to insert the content chunk by chunk.
+        yield (
+            b'{"key": "file", "value": {"path": '
+            + json.dumps(regular_file.path_in_repo).encode()
+            + b', "encoding": "base64", "content": "'
+        )
+        yield from _iter_b64content(regular_file)
+        yield b'"}}\n'
+
+
+def _iter_b64content(
+    operation: CommitOperationAdd, chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield the base64-encoded content of `operation`, chunk by chunk."""
+    chunk_size = chunk_size if chunk_size is not None else B64_ENCODE_CHUNK_SIZE
+    remainder = b""
+    with operation.as_file() as file:
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+            # `read` can return less than requested: only encode complete 3-byte groups
+            data = remainder + data
+            cut = len(data) - len(data) % 3
+            remainder = data[cut:]
+            if cut > 0:
+                yield base64.b64encode(data[:cut])
+    if remainder:
+        yield base64.b64encode(remainder)
+
+
+def _iter_commit_items(
+    operations: Iterable[CommitOperation],
+    upload_modes: Dict[str, UploadMode],
+    commit_message: str,
+    commit_description: Optional[str] = None,
+    parent_commit: Optional[str] = None,
+) -> Iterator[Tuple[Dict[str, Any], Optional[CommitOperationAdd]]]:
+    """Yield the items of the commit payload.
+
+    Items adding a regular file are yielded without content, together with the
+    operation to read it from. Other items are yielded with `None`.
+    """
     commit_description = commit_description if commit_description is not None else ""
 
     # 1. Send a header item with the commit metadata
     header_value = {"summary": commit_message, "description": commit_description}
     if parent_commit is not None:
         header_value["parentCommit"] = parent_commit
-    yield {"key": "header", "value": header_value}
+    yield {"key": "header", "value": header_value}, None
 
     # 2. Send operations, one per line
     for operation in operations:
@@ -533,12 +1039,8 @@ def prepare_commit_payload(
         ):
             yield {
                 "key": "file",
-                "value": {
-                    "content": operation.b64content().decode(),
-                    "path": operation.path_in_repo,
-                    "encoding": "base64",
-                },
-            }
+                "value": {"path": operation.path_in_repo, "encoding": "base64"},
+            }, operation
         # 2.b. Case adding an LFS file
         elif (
             isinstance(operation, CommitOperationAdd)
@@ -552,13 +1054,13 @@ def prepare_commit_payload(
                     "oid": operation.upload_info.sha256.hex(),
                     "size": operation.upload_info.size,
                 },
-            }
+            }, None
         # 2.c. Case deleting a file or folder
         elif isinstance(operation, CommitOperationDelete):
             yield {
                 "key": "deletedFolder" if operation.is_folder else "deletedFile",
                 "value": {"path": operation.path_in_repo},
-            }
+            }, None
         # 2.d. Never expected to happen
         else:
             raise ValueError(
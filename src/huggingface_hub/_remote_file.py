@@ -0,0 +1,391 @@
+"""
+Seekable file-like object reading a file from the Hub with HTTP range requests.
+
+Useful to read only a few KB of huge files (e.g. parquet footers, safetensors headers or
+zip central directories) without downloading them.
+"""
+import io
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+
+from .constants import DEFAULT_REVISION, HUGGINGFACE_HUB_CACHE, REPO_TYPES
+from .file_download import (
+    _request_wrapper,
+    get_hf_file_metadata,
+    hf_hub_download,
+    hf_hub_url,
+    try_to_load_from_cache,
+)
+from .utils import build_hf_headers, hf_raise_for_status, logging, validate_hf_hub_args
+
+
+logger = logging.get_logger(__name__)
+
+
+class HfRemoteFile(io.RawIOBase):
+    """
+    Read-only, seekable file object over a file of the Hub, returned by [`hf_hub_open`].
+
+    Reads are done with HTTP range requests by blocks of `block_size` bytes. Blocks are
+    kept in a LRU cache so that reading twice the same part of the file does not trigger
+    a new request. When the file is read sequentially, the next blocks are fetched in
+    the same request (readahead).
+
+    The file is pinned to the commit resolved when opening it: reads are consistent even
+    if the revision is updated in the meantime. If the file is already in the local
+    cache, it is read from the disk instead.
+
+    Attributes:
+        repo_id (`str`):
+            Repo the file belongs to.
+        filename (`str`):
+            Path of the file in the repo.
+        commit_hash (`str`):
+            Commit the file is read from.
+        size (`int`):
+            Size of the file in bytes.
+        local_path (`str`, *optional*):
+            Path of the file in the local cache if it is read from the disk.
+    """
+
+    def __init__(
+        self,
+        repo_id: str,
+        filename: str,
+        *,
+        repo_type: Optional[str] = None,
+        revision: Optional[str] = None,
+        cache_dir: Union[str, Path, None] = None,
+        token: Union[bool, str, None] = None,
+        proxies: Optional[Dict] = None,
+        block_size: int = 1024 * 1024,
+        max_cached_blocks: int = 32,
+        readahead: int = 4,
+        fill_cache_threshold: Optional[float] = None,
+        timeout: float = 10,
+    ) -> None:
+        super().__init__()
+        self._position = 0
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._last_block: Optional[int] = None
+        self._fetched_size = 0
+        self._local_file: Optional[BinaryIO] = None
+        self.local_path: Optional[str] = None
+
+        if block_size <= 0:
+            raise ValueError(f"`block_size` must be positive, got {block_size}.")
+        if max_cached_blocks <= 0:
+            raise ValueError(
+                f"`max_cached_blocks` must be positive, got {max_cached_blocks}."
+            )
+        if fill_cache_threshold is not None and not 0 < fill_cache_threshold <= 1:
+            raise ValueError(
+                f"`fill_cache_threshold` must be in ]0, 1], got {fill_cache_threshold}."
+            )
+        if repo_type is None:
+            repo_type = "model"
+        if repo_type not in REPO_TYPES:
+            raise ValueError(f"Invalid repo type: {repo_type}")
+
+        self.repo_id = repo_id
+        self.filename = filename
+        self.repo_type = repo_type
+        self.block_size = block_size
+        self.max_cached_blocks = max_cached_blocks
+        self.readahead = readahead
+        self.fill_cache_threshold = fill_cache_threshold
+        self._cache_dir = cache_dir if cache_dir is not None else HUGGINGFACE_HUB_CACHE
+        self._token = token
+        self._proxies = proxies
+        self._timeout = timeout
+
+        url = hf_hub_url(
+            repo_id,
+            filename,
+            repo_type=repo_type,
+            revision=revision if revision is not None else DEFAULT_REVISION,
+        )
+        metadata = get_hf_file_metadata(
+            url, token=token, proxies=proxies, timeout=timeout
+        )
+        if metadata.commit_hash is None or metadata.size is None:
+            raise OSError(
+                "Distant resource does not seem to be on huggingface.co (missing"
+                " commit or size header)."
+            )
+        self.commit_hash: str = metadata.commit_hash
+        self.size: int = metadata.size
+
+        # Reuse resolved location (e.g. CDN url of a LFS file) for all range requests
+        self._headers = build_hf_headers(token=token)
+        if metadata.location != url:
+            self._url = metadata.location
+            # Remove authorization header when downloading a LFS blob
+            self._headers.pop("authorization", None)
+        else:
+            # Pin the commit to get consistent reads
+            self._url = hf_hub_url(
+                repo_id, filename, repo_type=repo_type, revision=self.commit_hash
+            )
+
+        cached_path = try_to_load_from_cache(
+            repo_id,
+            filename,
+            cache_dir=self._cache_dir,
+            revision=self.commit_hash,
+            repo_type=repo_type,
+        )
+        if isinstance(cached_path, str):
+            self._open_local_file(cached_path)
+
+    def __repr__(self) -> str:
+        return (
+            f"HfRemoteFile(repo_id={self.repo_id!r}, filename={self.filename!r},"
+            f" commit_hash={self.commit_hash!r}, size={self.size})"
+        )
+
+    @property
+    def name(self) -> str:
+        return self.filename
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()  # type: ignore
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._checkClosed()  # type: ignore
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence}, should be 0, 1 or 2).")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}.")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:  # type: ignore
+        self._checkClosed()  # type: ignore
+        end = min(self._position + len(buffer), self.size)
+        if end <= self._position:
+            return 0
+        data = self._read_range(self._position, end)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def readall(self) -> bytes:
+        self._checkClosed()  # type: ignore
+        if self._position >= self.size:
+            return b""
+        data = self._read_range(self._position, self.size)
+        self._position = self.size
+        return data
+
+    def close(self) -> None:
+        if self._local_file is not None:
+            self._local_file.close()
+        self._blocks.clear()
+        super().close()
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        """Read bytes from `start` (included) to `end` (excluded)."""
+        if self._local_file is not None:
+            self._local_file.seek(start)
+            return self._local_file.read(end - start)
+
+        first_block = start // self.block_size
+        last_block = (end - 1) // self.block_size
+        blocks: Dict[int, bytes] = {}
+        missing = []
+        for index in range(first_block, last_block + 1):
+            block = self._blocks.get(index)
+            if block is None:
+                missing.append(index)
+            else:
+                blocks[index] = block
+                self._blocks.move_to_end(index)
+
+        if len(missing) > 0:
+            fetch_end = missing[-1]
+            if self._last_block is not None and first_block == self._last_block + 1:
+                # Sequential read => read ahead
+                fetch_end += self.readahead
+            fetch_end = min(fetch_end, (self.size - 1) // self.block_size)
+            blocks.update(self._fetch_blocks(missing[0], fetch_end))
+        self._last_block = last_block
+
+        if self._should_fill_cache():
+            self._fill_cache()
+            return self._read_range(start, end)
+
+        chunks = [blocks[index] for index in range(first_block, last_block + 1)]
+        data = b"".join(chunks)
+        offset = start - first_block * self.block_size
+        return data[offset : offset + end - start]
+
+    def _fetch_blocks(self, first_block: int, last_block: int) -> Dict[int, bytes]:
+        """Fetch blocks from `first_block` to `last_block` (included) in 1 request."""
+        start = first_block * self.block_size
+        end = min((last_block + 1) * self.block_size, self.size)
+        response = _request_wrapper(
+            method="GET",
+            url=self._url,
+            headers={**self._headers, "Range": f"bytes={start}-{end - 1}"},
+            proxies=self._proxies,
+            timeout=self._timeout,
+        )
+        hf_raise_for_status(response)
+        content = response.content
+        if response.status_code != 206:
+            # Server doesn't support range requests and returned the whole file
+            content = content[start:end]
+        if len(content) != end - start:
+            raise OSError(
+                f"Consistency check failed: expected {end - start} bytes from"
+                f" {self._url} (range {start}-{end - 1}) but got {len(content)}."
+            )
+        self._fetched_size += len(content)
+
+        blocks = {}
+        for index in range(first_block, last_block + 1):
+            offset = (index - first_block) * self.block_size
+            blocks[index] = content[offset : offset + self.block_size]
+            self._blocks[index] = blocks[index]
+            self._blocks.move_to_end(index)
+        while len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+        return blocks
+
+    def _should_fill_cache(self) -> bool:
+        return (
+            self.fill_cache_threshold is not None
+            and self._local_file is None
+            and self._fetched_size >= self.fill_cache_threshold * self.size
+        )
+
+    def _fill_cache(self) -> None:
+        """Download the entire file to the local cache and read from it from now on."""
+        logger.info(
+            f"Read {self._fetched_size} bytes out of {self.size} from {self.filename}:"
+            " downloading it to the cache."
+        )
+        path = hf_hub_download(
+            self.repo_id,
+            self.filename,
+            repo_type=self.repo_type,
+            revision=self.commit_hash,
+            cache_dir=self._cache_dir,
+            token=self._token,
+            proxies=self._proxies,
+        )
+        self._open_local_file(path)
+
+    def _open_local_file(self, path: str) -> None:
+        self.local_path = path
+        self._local_file = open(path, "rb")
+        self._blocks.clear()
+
+
+@validate_hf_hub_args
+def hf_hub_open(
+    repo_id: str,
+    filename: str,
+    *,
+    repo_type: Optional[str] = None,
+    revision: Optional[str] = None,
+    cache_dir: Union[str, Path, None] = None,
+    token: Union[bool, str, None] = None,
+    proxies: Optional[Dict] = None,
+    block_size: int = 1024 * 1024,
+    max_cached_blocks: int = 32,
+    readahead: int = 4,
+    fill_cache_threshold: Optional[float] = None,
+    timeout: float = 10,
+) -> HfRemoteFile:
+    """Open a file of the Hub for random access reads, without downloading it.
+
+    The returned [`HfRemoteFile`] is a read-only, seekable binary file object that can
+    be passed to libraries expecting one (e.g. `pyarrow.parquet.ParquetFile` or
+    `zipfile.ZipFile`). Only the parts of the file that are read are fetched, using HTTP
+    range requests. Files already in the local cache are read from the disk.
+
+    Args:
+        repo_id (`str`):
+            A user or an organization name and a repo name separated by a `/`.
+        filename (`str`):
+            The name of the file in the repo.
+        repo_type (`str`, *optional*):
+            Set to `"dataset"` or `"space"` if reading from a dataset or space, `None` or
+            `"model"` if reading from a model. Default is `None`.
+        revision (`str`, *optional*):
+            An optional Git revision id which can be a branch name, a tag, or a commit
+            hash.
+        cache_dir (`str`, `Path`, *optional*):
+            Path to the folder where cached files are stored.
+        token (`str`, `bool`, *optional*):
+            A token to be used for the download.
+                - If `True`, the token is read from the HuggingFace config
+                  folder.
+                - If a string, it's used as the authentication token.
+        proxies (`dict`, *optional*):
+            Dictionary mapping protocol to the URL of the proxy passed to
+            `requests.request`.
+        block_size (`int`, *optional*, defaults to 1MB):
+            Size of the blocks fetched from the Hub.
+        max_cached_blocks (`int`, *optional*, defaults to 32):
+            Maximum number of blocks kept in memory. Least recently used blocks are
+            evicted first.
+        readahead (`int`, *optional*, defaults to 4):
+            Number of blocks fetched in advance when the file is read sequentially.
+        fill_cache_threshold (`float`, *optional*):
+            If set, the entire file is downloaded to the local cache (as with
+            [`hf_hub_download`]) once this fraction of its size has been fetched. Next
+            reads are done from the disk.
+        timeout (`float`, *optional*, defaults to 10):
+            How many seconds to wait for the server to send data before giving up.
+
+    Returns:
+        [`HfRemoteFile`]: a file object to be closed once done.
+
+    Example:
+    ```py
+    >>> import json, struct
+    >>> from huggingface_hub import hf_hub_open
+    >>> with hf_hub_open("gpt2", "model.safetensors") as f:
+    ...     header_size = struct.unpack("<Q", f.read(8))[0]
+    ...     header = json.loads(f.read(header_size))
+    ```
+
+    <Tip>
+
+    Raises the same errors as [`hf_hub_download`] if the file cannot be found or
+    accessed.
+
+    </Tip>
+    """
+    return HfRemoteFile(
+        repo_id,
+        filename,
+        repo_type=repo_type,
+        revision=revision,
+        cache_dir=cache_dir,
+        token=token,
+        proxies=proxies,
+        block_size=block_size,
+        max_cached_blocks=max_cached_blocks,
+        readahead=readahead,
+        fill_cache_threshold=fill_cache_threshold,
+        timeout=timeout,
+    )
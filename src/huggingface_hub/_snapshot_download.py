@@ -1,27 +1,217 @@
+import json
 import os
+import shutil
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union, overload
 
 from tqdm.auto import tqdm as base_tqdm
 from tqdm.contrib.concurrent import thread_map
 
 from .constants import (
     DEFAULT_REVISION,
+    HF_HUB_ASYNC_DOWNLOAD_MAX_CONCURRENCY,
+    HF_HUB_ENABLE_ASYNC_DOWNLOAD,
     HF_HUB_ENABLE_HF_TRANSFER,
     HUGGINGFACE_HUB_CACHE,
     REPO_TYPES,
 )
-from .file_download import REGEX_COMMIT_HASH, hf_hub_download, repo_folder_name
+from .file_download import (
+    REGEX_COMMIT_HASH,
+    _cache_commit_hash_for_specific_revision,
+    _get_fresh_cached_commit_hash,
+    _get_shared_blob_path,
+    hf_hub_download,
+    repo_folder_name,
+)
 from .hf_api import HfApi
-from .utils import filter_repo_objects, logging
+from .utils import AdaptiveConcurrency, build_hf_headers, filter_repo_objects, logging
 from .utils import tqdm as hf_tqdm
 from .utils import validate_hf_hub_args
+from .utils._typing import Literal
 
 
 logger = logging.get_logger(__name__)
 
+# Metadata of each file of a commit, as stored in a snapshot manifest.
+_MANIFEST_FILES_T = Dict[str, Dict[str, Any]]
 
-@validate_hf_hub_args
+
+@dataclass(frozen=True)
+class SnapshotPlanFile:
+    """Data structure containing information about a file in a [`SnapshotDownloadPlan`].
+
+    Args:
+        filename (`str`):
+            Path of the file in the repo.
+        size (`int`, *optional*):
+            Size of the file in bytes.
+        etag (`str`, *optional*):
+            Etag of the file (sha256 for LFS files, git blob sha1 otherwise).
+        is_cached (`bool`):
+            Whether the file content is already in the local cache, i.e. nothing needs
+            to be downloaded.
+    """
+
+    filename: str
+    size: Optional[int]
+    etag: Optional[str]
+    is_cached: bool
+
+
+@dataclass(frozen=True)
+class SnapshotDownloadPlan:
+    """Data structure describing what [`snapshot_download`] would do.
+
+    Returned by [`snapshot_download`] when `dry_run=True`.
+
+    Args:
+        repo_id (`str`):
+            Repo to download.
+        repo_type (`str`):
+            Type of the repo (`"model"`, `"dataset"` or `"space"`).
+        commit_hash (`str`):
+            Commit hash the revision has been resolved to.
+        snapshot_folder (`str`):
+            Local folder where the snapshot is (or would be) downloaded.
+        files (`List[SnapshotPlanFile]`):
+            Files matching `allow_patterns` and `ignore_patterns`, sorted by size (largest
+            first). This is the order in which they are scheduled.
+        download_size (`int`):
+            Total number of bytes to download (files not cached yet).
+        free_disk_space (`int`):
+            Free disk space in the cache directory, in bytes.
+    """
+
+    repo_id: str
+    repo_type: str
+    commit_hash: str
+    snapshot_folder: str
+    files: List[SnapshotPlanFile]
+    download_size: int
+    free_disk_space: int
+
+
+def _build_download_plan(
+    *,
+    repo_id: str,
+    repo_type: str,
+    storage_folder: str,
+    commit_hash: str,
+    files: _MANIFEST_FILES_T,
+) -> SnapshotDownloadPlan:
+    snapshot_folder = os.path.join(storage_folder, "snapshots", commit_hash)
+    plan_files = []
+    for filename, file_info in files.items():
+        etag = file_info.get("etag")
+        is_cached = os.path.exists(os.path.join(snapshot_folder, filename)) or (
+            etag is not None and _is_blob_cached(storage_folder, etag)
+        )
+        plan_files.append(
+            SnapshotPlanFile(
+                filename=filename,
+                size=file_info.get("size"),
+                etag=etag,
+                is_cached=is_cached,
+            )
+        )
+    plan_files.sort(key=lambda file: file.size or 0, reverse=True)
+    return SnapshotDownloadPlan(
+        repo_id=repo_id,
+        repo_type=repo_type,
+        commit_hash=commit_hash,
+        snapshot_folder=snapshot_folder,
+        files=plan_files,
+        download_size=sum(file.size or 0 for file in plan_files if not file.is_cached),
+        free_disk_space=shutil.disk_usage(_get_existing_parent(storage_folder)).free,
+    )
+
+
+def _get_existing_parent(path: str) -> str:
+    """Return `path` or its nearest parent that exists (e.g. cache not created yet)."""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _is_blob_cached(storage_folder: str, etag: str) -> bool:
+    """Whether a blob is in the repo cache or in the folder shared by all repos."""
+    if os.path.exists(os.path.join(storage_folder, "blobs", etag)):
+        return True
+    shared_blob_path = _get_shared_blob_path(storage_folder, etag)
+    return shared_blob_path is not None and os.path.exists(shared_blob_path)
+
+
+def _get_manifest_path(storage_folder: str, commit_hash: str) -> str:
+    return os.path.join(storage_folder, ".manifests", f"{commit_hash}.json")
+
+
+def _read_snapshot_manifest(
+    storage_folder: str, commit_hash: str
+) -> Optional[_MANIFEST_FILES_T]:
+    """Return the files of a commit (with their size and etag) if a manifest has been
+    saved for it. Returns `None` otherwise."""
+    try:
+        with open(_get_manifest_path(storage_folder, commit_hash)) as f:
+            manifest = json.load(f)
+        if manifest["commit_hash"] == commit_hash:
+            return manifest["files"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _write_snapshot_manifest(
+    storage_folder: str, commit_hash: str, files: _MANIFEST_FILES_T
+) -> None:
+    """Save the list of files of a commit, with their size and etag.
+
+    A commit is immutable so the manifest never needs to be updated. Failing to write
+    it (e.g. read-only cache) is not an error.
+    """
+    manifest_path = _get_manifest_path(storage_folder, commit_hash)
+    tmp_path = manifest_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"commit_hash": commit_hash, "files": files}, f)
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        logger.info(f"Could not save snapshot manifest to {manifest_path}: {e}")
+
+
+def _filter_manifest(
+    files: _MANIFEST_FILES_T,
+    allow_patterns: Optional[Union[List[str], str]],
+    ignore_patterns: Optional[Union[List[str], str]],
+) -> _MANIFEST_FILES_T:
+    return {
+        filename: files[filename]
+        for filename in filter_repo_objects(
+            items=list(files.keys()),
+            allow_patterns=allow_patterns,
+            ignore_patterns=ignore_patterns,
+        )
+    }
+
+
+def _is_snapshot_complete(snapshot_folder: str, files: _MANIFEST_FILES_T) -> bool:
+    """Whether all `files` exist in `snapshot_folder` with the expected size."""
+    for filename, file_info in files.items():
+        try:
+            size = os.stat(os.path.join(snapshot_folder, filename)).st_size
+        except OSError:
+            return False
+        if file_info.get("size") is not None and size != file_info["size"]:
+            return False
+    return True
+
+
+@overload
 def snapshot_download(
     repo_id: str,
     *,
@@ -38,9 +228,58 @@ def snapshot_download(
     local_files_only: bool = False,
     allow_patterns: Optional[Union[List[str], str]] = None,
     ignore_patterns: Optional[Union[List[str], str]] = None,
-    max_workers: int = 8,
+    max_workers: Optional[Union[int, AdaptiveConcurrency]] = None,
     tqdm_class: Optional[base_tqdm] = None,
+    dry_run: Literal[False] = False,
 ) -> str:
+    ...
+
+
+@overload
+def snapshot_download(
+    repo_id: str,
+    *,
+    revision: Optional[str] = None,
+    repo_type: Optional[str] = None,
+    cache_dir: Union[str, Path, None] = None,
+    library_name: Optional[str] = None,
+    library_version: Optional[str] = None,
+    user_agent: Optional[Union[Dict, str]] = None,
+    proxies: Optional[Dict] = None,
+    etag_timeout: float = 10,
+    resume_download: bool = False,
+    token: Optional[Union[bool, str]] = None,
+    local_files_only: bool = False,
+    allow_patterns: Optional[Union[List[str], str]] = None,
+    ignore_patterns: Optional[Union[List[str], str]] = None,
+    max_workers: Optional[Union[int, AdaptiveConcurrency]] = None,
+    tqdm_class: Optional[base_tqdm] = None,
+    dry_run: Literal[True],
+) -> SnapshotDownloadPlan:
+    ...
+
+
+@validate_hf_hub_args
+def snapshot_download(
+    repo_id: str,
+    *,
+    revision: Optional[str] = None,
+    repo_type: Optional[str] = None,
+    cache_dir: Union[str, Path, None] = None,
+    library_name: Optional[str] = None,
+    library_version: Optional[str] = None,
+    user_agent: Optional[Union[Dict, str]] = None,
+    proxies: Optional[Dict] = None,
+    etag_timeout: float = 10,
+    resume_download: bool = False,
+    token: Optional[Union[bool, str]] = None,
+    local_files_only: bool = False,
+    allow_patterns: Optional[Union[List[str], str]] = None,
+    ignore_patterns: Optional[Union[List[str], str]] = None,
+    max_workers: Optional[Union[int, AdaptiveConcurrency]] = None,
+    tqdm_class: Optional[base_tqdm] = None,
+    dry_run: bool = False,
+) -> Union[str, SnapshotDownloadPlan]:
     """Download all files of a repo.
 
     Downloads a whole snapshot of a repo's files at the specified revision. This
@@ -51,6 +290,11 @@ def snapshot_download(
     An alternative would be to just clone a repo but this would require that the
     user always has git and git-lfs installed, and properly configured.
 
+    Once a snapshot is downloaded, the list of files of the commit (with their size and
+    etag) is saved in the cache. If `revision` is a commit hash or a branch/tag resolved
+    recently (see `HF_HUB_REFS_TTL`), the snapshot is returned without any network call
+    if all requested files are already cached.
+
     Args:
         repo_id (`str`):
             A user or an organization name and a repo name separated by a `/`.
@@ -88,18 +332,28 @@ def snapshot_download(
             If provided, only files matching at least one pattern are downloaded.
         ignore_patterns (`List[str]` or `str`, *optional*):
             If provided, files matching any of the patterns are not downloaded.
-        max_workers (`int`, *optional*):
+        max_workers (`int` or [`AdaptiveConcurrency`], *optional*):
             Number of concurrent threads to download files (1 thread = 1 file download).
-            Defaults to 8.
+            Defaults to 8. If an [`AdaptiveConcurrency`] controller is passed, the number
+            of concurrent downloads is adjusted to the observed throughput instead. If
+            `HF_HUB_ENABLE_ASYNC_DOWNLOAD` is set, this is the maximum number of
+            concurrent requests instead and defaults to
+            `HF_HUB_ASYNC_DOWNLOAD_MAX_CONCURRENCY` (128).
         tqdm_class (`tqdm`, *optional*):
             If provided, overwrites the default behavior for the progress bar. Passed
             argument must inherit from `tqdm.auto.tqdm` or at least mimic its behavior.
             Note that the `tqdm_class` is not passed to each individual download.
             Defaults to the custom HF progress bar that can be disabled by setting
             `HF_HUB_DISABLE_PROGRESS_BARS` environment variable.
+        dry_run (`bool`, *optional*, defaults to `False`):
+            If `True`, nothing is downloaded and the cache is not modified. Returns a
+            [`SnapshotDownloadPlan`] listing the files to download with their size, which
+            ones are already cached, the total number of bytes to download and the free
+            disk space. Cannot be used with `local_files_only=True`.
 
     Returns:
-        Local folder path (string) of repo snapshot
+        Local folder path (string) of repo snapshot. If `dry_run=True`, a
+        [`SnapshotDownloadPlan`] instead.
 
     <Tip>
 
@@ -108,7 +362,8 @@ def snapshot_download(
     - [`EnvironmentError`](https://docs.python.org/3/library/exceptions.html#EnvironmentError)
       if `token=True` and the token cannot be found.
     - [`OSError`](https://docs.python.org/3/library/exceptions.html#OSError) if
-      ETag cannot be determined.
+      ETag cannot be determined or if there is not enough free disk space to download
+      the files.
     - [`ValueError`](https://docs.python.org/3/library/exceptions.html#ValueError)
       if some parameter value is invalid
 
@@ -138,6 +393,10 @@ def snapshot_download(
     # If the specified revision is a commit hash, look inside "snapshots".
     # If the specified revision is a branch or tag, look inside "refs".
     if local_files_only:
+        if dry_run:
+            raise ValueError(
+                "`dry_run=True` cannot be used with `local_files_only=True`."
+            )
         if REGEX_COMMIT_HASH.match(revision):
             commit_hash = revision
         else:
@@ -149,6 +408,15 @@ def snapshot_download(
         snapshot_folder = os.path.join(storage_folder, "snapshots", commit_hash)
 
         if os.path.exists(snapshot_folder):
+            manifest_files = _read_snapshot_manifest(storage_folder, commit_hash)
+            if manifest_files is not None and not _is_snapshot_complete(
+                snapshot_folder,
+                _filter_manifest(manifest_files, allow_patterns, ignore_patterns),
+            ):
+                logger.warning(
+                    f"Snapshot {snapshot_folder} is incomplete: some requested files"
+                    " are missing from the local cache."
+                )
             return snapshot_folder
 
         raise ValueError(
@@ -158,67 +426,156 @@ def snapshot_download(
             " False."
         )
 
-    # if we have internet connection we retrieve the correct folder name from the huggingface api
-    _api = HfApi()
-    repo_info = _api.repo_info(
-        repo_id=repo_id,
-        repo_type=repo_type,
-        revision=revision,
-        token=token,
-    )
-    assert (
-        repo_info.sha is not None
-    ), "Repo info returned from server must have a revision sha."
-    filtered_repo_files = list(
-        filter_repo_objects(
-            items=[f.rfilename for f in repo_info.siblings],
-            allow_patterns=allow_patterns,
-            ignore_patterns=ignore_patterns,
-        )
-    )
-    commit_hash = repo_info.sha
-    snapshot_folder = os.path.join(storage_folder, "snapshots", commit_hash)
-    # if passed revision is not identical to commit_hash
-    # then revision has to be a branch name or tag name.
-    # In that case store a ref.
-    if revision != commit_hash:
-        ref_path = os.path.join(storage_folder, "refs", revision)
-        os.makedirs(os.path.dirname(ref_path), exist_ok=True)
-        with open(ref_path, "w") as f:
-            f.write(commit_hash)
-
-    # we pass the commit_hash to hf_hub_download
-    # so no network call happens if we already
-    # have the file locally.
-    def _inner_hf_hub_download(repo_file: str):
-        return hf_hub_download(
-            repo_id,
-            filename=repo_file,
+    # if revision is a commit hash or a fresh ref (see `HF_HUB_REFS_TTL`) and a manifest
+    # has been saved for this commit, we already know the list of files: no need to call
+    # the api. If all requested files are cached, return without any network call.
+    manifest_files = None
+    fresh_commit_hash = _get_fresh_cached_commit_hash(storage_folder, revision)
+    if fresh_commit_hash is not None:
+        manifest_files = _read_snapshot_manifest(storage_folder, fresh_commit_hash)
+
+    if manifest_files is not None and fresh_commit_hash is not None:
+        commit_hash = fresh_commit_hash
+    else:
+        # if we have internet connection we retrieve the correct folder name from the huggingface api
+        _api = HfApi()
+        repo_info = _api.repo_info(
+            repo_id=repo_id,
             repo_type=repo_type,
-            revision=commit_hash,
-            cache_dir=cache_dir,
-            library_name=library_name,
-            library_version=library_version,
-            user_agent=user_agent,
-            proxies=proxies,
-            etag_timeout=etag_timeout,
-            resume_download=resume_download,
+            revision=revision,
             token=token,
+            files_metadata=True,
         )
+        assert (
+            repo_info.sha is not None
+        ), "Repo info returned from server must have a revision sha."
+        manifest_files = {
+            sibling.rfilename: {
+                "size": sibling.size,
+                "etag": (
+                    sibling.lfs["sha256"]
+                    if sibling.lfs is not None
+                    else sibling.blob_id
+                ),
+            }
+            for sibling in repo_info.siblings
+        }
+        commit_hash = repo_info.sha
+        # if passed revision is not identical to commit_hash
+        # then revision has to be a branch name or tag name.
+        # In that case store a ref (unless dry run: cache must not be modified).
+        if not dry_run:
+            os.makedirs(storage_folder, exist_ok=True)
+            _cache_commit_hash_for_specific_revision(
+                storage_folder, revision, commit_hash
+            )
 
-    if HF_HUB_ENABLE_HF_TRANSFER:
-        # when using hf_transfer we don't want extra parallelism
-        # from the one hf_transfer provides
-        for file in filtered_repo_files:
-            _inner_hf_hub_download(file)
-    else:
-        thread_map(
-            _inner_hf_hub_download,
-            filtered_repo_files,
-            desc=f"Fetching {len(filtered_repo_files)} files",
-            max_workers=max_workers,
-            # User can use its own tqdm class or the default one from `huggingface_hub.utils`
-            tqdm_class=tqdm_class or hf_tqdm,
-        )
+    snapshot_folder = os.path.join(storage_folder, "snapshots", commit_hash)
+    filtered_manifest_files = _filter_manifest(
+        manifest_files, allow_patterns, ignore_patterns
+    )
+    plan = _build_download_plan(
+        repo_id=repo_id,
+        repo_type=repo_type,
+        storage_folder=storage_folder,
+        commit_hash=commit_hash,
+        files=filtered_manifest_files,
+    )
+    if dry_run:
+        return plan
+
+    if not _is_snapshot_complete(snapshot_folder, filtered_manifest_files):
+        if plan.download_size > plan.free_disk_space:
+            raise OSError(
+                f"Not enough free disk space to download {repo_id} in {cache_dir}:"
+                f" {plan.download_size} bytes to download but only"
+                f" {plan.free_disk_space} bytes available."
+            )
+
+        # we pass the commit_hash to hf_hub_download
+        # so no network call happens if we already
+        # have the file locally.
+        def _inner_hf_hub_download(repo_file: str):
+            return hf_hub_download(
+                repo_id,
+                filename=repo_file,
+                repo_type=repo_type,
+                revision=commit_hash,
+                cache_dir=cache_dir,
+                library_name=library_name,
+                library_version=library_version,
+                user_agent=user_agent,
+                proxies=proxies,
+                etag_timeout=etag_timeout,
+                resume_download=resume_download,
+                token=token,
+            )
+
+        # Largest files first so that workers are not idle waiting for a big file
+        # started last.
+        filtered_repo_files = [file.filename for file in plan.files]
+        if HF_HUB_ENABLE_HF_TRANSFER:
+            # when using hf_transfer we don't want extra parallelism
+            # from the one hf_transfer provides
+            for file in filtered_repo_files:
+                _inner_hf_hub_download(file)
+        elif HF_HUB_ENABLE_ASYNC_DOWNLOAD:
+            # asyncio engine: hundreds of concurrent requests instead of 8 threads.
+            # Useful for repos with many small files.
+            from ._async_download import download_snapshot_files, run_coroutine
+
+            progress_class: Any = tqdm_class or hf_tqdm
+            with progress_class(
+                total=len(filtered_repo_files),
+                desc=f"Fetching {len(filtered_repo_files)} files",
+            ) as progress:
+                run_coroutine(
+                    download_snapshot_files(
+                        repo_id=repo_id,
+                        repo_type=repo_type,
+                        commit_hash=commit_hash,
+                        storage_folder=storage_folder,
+                        files={
+                            file: filtered_manifest_files[file]
+                            for file in filtered_repo_files
+                        },
+                        headers=build_hf_headers(
+                            token=token,
+                            library_name=library_name,
+                            library_version=library_version,
+                            user_agent=user_agent,
+                        ),
+                        proxies=proxies,
+                        max_concurrency=(
+                            max_workers
+                            if max_workers is not None
+                            else HF_HUB_ASYNC_DOWNLOAD_MAX_CONCURRENCY
+                        ),
+                        fallback_download=_inner_hf_hub_download,
+                        progress=progress,
+                    )
+                )
+        elif isinstance(max_workers, AdaptiveConcurrency):
+            max_workers.map(
+                _inner_hf_hub_download,
+                filtered_repo_files,
+                # Cached files are not downloaded => no impact on throughput
+                sizes=[0 if file.is_cached else file.size or 0 for file in plan.files],
+                desc=f"Fetching {len(filtered_repo_files)} files",
+                tqdm_class=tqdm_class,
+            )
+        else:
+            thread_map(
+                _inner_hf_hub_download,
+                filtered_repo_files,
+                desc=f"Fetching {len(filtered_repo_files)} files",
+                max_workers=max_workers if max_workers is not None else 8,
+                # User can use its own tqdm class or the default one from `huggingface_hub.utils`
+                tqdm_class=tqdm_class or hf_tqdm,
+            )
+
+    # All files downloaded => save list of files for future calls (no-op if exists)
+    if _read_snapshot_manifest(storage_folder, commit_hash) is None:
+        _write_snapshot_manifest(storage_folder, commit_hash, manifest_files)
 
     return snapshot_folder
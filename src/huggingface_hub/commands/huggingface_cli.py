@@ -19,6 +19,7 @@ from huggingface_hub.commands.delete_cache import DeleteCacheCommand
 from huggingface_hub.commands.env import EnvironmentCommand
 from huggingface_hub.commands.lfs import LfsCommands
 from huggingface_hub.commands.scan_cache import ScanCacheCommand
+from huggingface_hub.commands.serve_cache import ServeCacheCommand
 from huggingface_hub.commands.user import UserCommands
 
 
@@ -34,6 +35,7 @@ def main():
     LfsCommands.register_subcommand(commands_parser)
     ScanCacheCommand.register_subcommand(commands_parser)
     DeleteCacheCommand.register_subcommand(commands_parser)
+    ServeCacheCommand.register_subcommand(commands_parser)
 
     # Let's go
     args = parser.parse_args()
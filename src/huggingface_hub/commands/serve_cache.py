@@ -0,0 +1,93 @@
+# coding=utf-8
+# Copyright 2023-present, the HuggingFace Inc. team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Contains command to serve files from the HF cache to other machines.
+
+Usage:
+    huggingface-cli serve-cache
+    huggingface-cli serve-cache --host 0.0.0.0 --port 8080
+    huggingface-cli serve-cache --dir /mnt/shared/hub --upstream https://huggingface.co
+
+Other machines download files through the server by setting `HF_ENDPOINT`:
+    HF_ENDPOINT=http://<host>:8080 python train.py
+"""
+from argparse import _SubParsersAction
+from typing import Optional
+
+from .._cache_server import CacheServer
+from ..utils import logging
+from . import BaseHuggingfaceCLICommand
+
+
+class ServeCacheCommand(BaseHuggingfaceCLICommand):
+    @staticmethod
+    def register_subcommand(parser: _SubParsersAction):
+        serve_cache_parser = parser.add_parser(
+            "serve-cache",
+            help=(
+                "Serve files from the cache directory, fetching missing ones from the"
+                " Hub."
+            ),
+        )
+
+        serve_cache_parser.add_argument(
+            "--dir",
+            type=str,
+            default=None,
+            help=(
+                "cache directory to serve files from (optional). Default to the"
+                " default HuggingFace cache."
+            ),
+        )
+        serve_cache_parser.add_argument(
+            "--host",
+            type=str,
+            default="127.0.0.1",
+            help=(
+                "host to listen to. Use 0.0.0.0 to accept connections from other"
+                " machines. Default to 127.0.0.1."
+            ),
+        )
+        serve_cache_parser.add_argument(
+            "--port", type=int, default=8080, help="port to listen to. Default to 8080."
+        )
+        serve_cache_parser.add_argument(
+            "--upstream",
+            type=str,
+            default=None,
+            help="url of the Hub to fetch files from. Default to HF_ENDPOINT.",
+        )
+        serve_cache_parser.set_defaults(func=ServeCacheCommand)
+
+    def __init__(self, args):
+        self.cache_dir: Optional[str] = args.dir
+        self.host: str = args.host
+        self.port: int = args.port
+        self.upstream: Optional[str] = args.upstream
+
+    def run(self):
+        logging.set_verbosity_info()
+        server = CacheServer(
+            (self.host, self.port), cache_dir=self.cache_dir, upstream=self.upstream
+        )
+        print(
+            f"Serving {server.cache_dir} on {server.url} (upstream: {server.upstream})."
+            f"\nSet HF_ENDPOINT={server.url} on the clients to download through it."
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -30,6 +30,11 @@ FLAX_WEIGHTS_NAME = "flax_model.msgpack"
 CONFIG_NAME = "config.json"
 REPOCARD_NAME = "README.md"
 
+# Safetensors header: 8 bytes (header length, little-endian) + JSON header.
+# Headers are fetched with a single range request of this size when possible.
+SAFETENSORS_HEADER_PREFETCH_SIZE = 100_000
+SAFETENSORS_MAX_HEADER_LENGTH = 25_000_000
+
 # Git-related constants
 
 DEFAULT_REVISION = "main"
@@ -123,3 +128,56 @@ HF_HUB_DISABLE_IMPLICIT_TOKEN: bool = _is_true(
 # - https://pypi.org/project/hf-transfer/
 # - https://github.com/huggingface/hf_transfer (private)
 HF_HUB_ENABLE_HF_TRANSFER: bool = _is_true(os.environ.get("HF_HUB_ENABLE_HF_TRANSFER"))
+
+# Enable built-in parallel download of large files using HTTP range requests.
+# Contrary to `hf_transfer`, it supports resume, retries, proxies and progress bars.
+HF_HUB_ENABLE_PARALLEL_DOWNLOAD: bool = _is_true(
+    os.environ.get("HF_HUB_ENABLE_PARALLEL_DOWNLOAD")
+)
+HF_HUB_PARALLEL_DOWNLOAD_NUM_THREADS: int = int(
+    os.environ.get("HF_HUB_PARALLEL_DOWNLOAD_NUM_THREADS") or 8
+)
+
+# Enable asyncio-based download engine in `snapshot_download`. Useful for repos with
+# many small files. Requires `aiohttp`.
+HF_HUB_ENABLE_ASYNC_DOWNLOAD: bool = _is_true(
+    os.environ.get("HF_HUB_ENABLE_ASYNC_DOWNLOAD")
+)
+HF_HUB_ASYNC_DOWNLOAD_MAX_CONCURRENCY: int = int(
+    os.environ.get("HF_HUB_ASYNC_DOWNLOAD_MAX_CONCURRENCY") or 128
+)
+
+# A download is considered stalled if its average throughput stays below
+# `HF_HUB_DOWNLOAD_MIN_THROUGHPUT` (in bytes/s) for `HF_HUB_DOWNLOAD_STALL_TIMEOUT`
+# seconds. Stalled downloads are resumed on a new connection.
+HF_HUB_DOWNLOAD_STALL_TIMEOUT: float = float(
+    os.environ.get("HF_HUB_DOWNLOAD_STALL_TIMEOUT") or 30
+)
+HF_HUB_DOWNLOAD_MIN_THROUGHPUT: int = int(
+    os.environ.get("HF_HUB_DOWNLOAD_MIN_THROUGHPUT") or 10 * 1024
+)
+
+# Number of seconds during which a cached branch or tag is considered fresh. Within this
+# window, `hf_hub_download` resolves files from the cache without calling the Hub.
+# Defaults to 0 (always revalidate).
+HF_HUB_REFS_TTL: int = int(os.environ.get("HF_HUB_REFS_TTL") or 0)
+
+# Number of seconds during which a file known to be missing at a given commit (cached
+# in `.no_exist/`) is not looked up again on the Hub. Defaults to 0 (always look up).
+HF_HUB_NO_EXIST_TTL: int = int(os.environ.get("HF_HUB_NO_EXIST_TTL") or 0)
+
+# Store LFS files in a content-addressed folder shared by all repos of the cache
+# (`<cache>/blobs/<sha256>`). Per-repo blobs are symlinks to it. A file common to several
+# repos (e.g. a base checkpoint) is then downloaded and stored only once.
+HF_HUB_ENABLE_SHARED_BLOBS: bool = _is_true(
+    os.environ.get("HF_HUB_ENABLE_SHARED_BLOBS")
+)
+SHARED_BLOBS_FOLDER_NAME = "blobs"
+
+# Disable the persistent cache of the sha256 of uploaded files. Entries are keyed on the
+# path, device, inode, size, modification and change times of each file.
+HF_HUB_DISABLE_HASH_CACHE: bool = _is_true(os.environ.get("HF_HUB_DISABLE_HASH_CACHE"))
+
+# Maximum number of connections kept alive per host by the shared HTTP session.
+# See `huggingface_hub.utils.get_session`.
+HF_HUB_HTTP_POOL_MAXSIZE: int = int(os.environ.get("HF_HUB_HTTP_POOL_MAXSIZE") or 32)
@@ -2,19 +2,36 @@ import copy
 import fnmatch
 import io
 import json
+import mmap
 import os
 import re
 import shutil
 import stat
+import sys
 import tempfile
+import threading
+import time
 import uuid
 import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
 from functools import partial
-from hashlib import sha256
+from hashlib import sha1, sha256
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, Generator, Optional, Tuple, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import quote, urlparse
 
 import requests
@@ -26,7 +43,14 @@ from . import __version__  # noqa: F401 # for backward compatibility
 from .constants import (
     DEFAULT_REVISION,
     HF_HUB_DISABLE_SYMLINKS_WARNING,
+    HF_HUB_DOWNLOAD_MIN_THROUGHPUT,
+    HF_HUB_DOWNLOAD_STALL_TIMEOUT,
     HF_HUB_ENABLE_HF_TRANSFER,
+    HF_HUB_ENABLE_PARALLEL_DOWNLOAD,
+    HF_HUB_ENABLE_SHARED_BLOBS,
+    HF_HUB_NO_EXIST_TTL,
+    HF_HUB_PARALLEL_DOWNLOAD_NUM_THREADS,
+    HF_HUB_REFS_TTL,
     HUGGINGFACE_CO_URL_TEMPLATE,
     HUGGINGFACE_HEADER_X_LINKED_ETAG,
     HUGGINGFACE_HEADER_X_LINKED_SIZE,
@@ -35,6 +59,7 @@ from .constants import (
     REPO_ID_SEPARATOR,
     REPO_TYPES,
     REPO_TYPES_URL_PREFIXES,
+    SHARED_BLOBS_FOLDER_NAME,
 )
 from .utils import get_fastai_version  # noqa: F401 # for backward compatibility
 from .utils import get_fastcore_version  # noqa: F401 # for backward compatibility
@@ -66,6 +91,12 @@ from .utils._runtime import _PY_VERSION  # noqa: F401 # for backward compatibili
 from .utils._typing import HTTP_METHOD_T
 
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+
 logger = logging.get_logger(__name__)
 
 
@@ -458,6 +489,77 @@ def _request_with_retry(*args, **kwargs) -> requests.Response:
     return _request_wrapper(*args, **kwargs)
 
 
+# Maximum number of times `http_get` resumes a download after the connection dropped
+# or stalled in the middle of the transfer.
+_HTTP_GET_MAX_RESUMES = 5
+
+# Etags of files stored on the Hub are content hashes: sha256 for LFS files and git
+# blob sha1 for regular files. They are used to verify downloaded files.
+_SHA256_REGEX = re.compile(r"^[0-9a-f]{64}$")
+_GIT_SHA1_REGEX = re.compile(r"^[0-9a-f]{40}$")
+
+
+def _get_etag_hasher(etag: Optional[str], size: Optional[int]) -> Optional[Any]:
+    """Return a hash object to check downloaded content against `etag`.
+
+    Returns `None` if `etag` is not a content hash (e.g. file not hosted on the Hub) or
+    if it cannot be computed (size of a regular file is unknown).
+    """
+    if etag is None:
+        return None
+    if _SHA256_REGEX.match(etag):
+        return sha256()
+    if _GIT_SHA1_REGEX.match(etag) and size is not None:
+        hasher = sha1()
+        hasher.update(b"blob %d\0" % size)
+        return hasher
+    return None
+
+
+def _verify_file_etag(path: str, etag: Optional[str], size: Optional[int]) -> None:
+    """Check the content of a downloaded file against its etag, when possible."""
+    hasher = _get_etag_hasher(etag, size)
+    if hasher is None:
+        return
+    with open(path, "rb") as f:
+        for chunk in iter(partial(f.read, 1024 * 1024), b""):
+            hasher.update(chunk)
+    if hasher.hexdigest() != etag:
+        raise OSError(
+            f"Consistency check failed: file {path} does not match its etag ({etag})."
+            " The download might have been corrupted. Please retry."
+        )
+
+
+def _iter_content_with_stall_detection(
+    response: requests.Response, chunk_size: int
+) -> Iterator[bytes]:
+    """Iterate over the content of a streamed response.
+
+    Raises `requests.exceptions.Timeout` if the average throughput stays below
+    `HF_HUB_DOWNLOAD_MIN_THROUGHPUT` bytes/s for `HF_HUB_DOWNLOAD_STALL_TIMEOUT`
+    seconds. Time spent by the caller to consume the chunks is not taken into account.
+    """
+    window_start = time.monotonic()
+    window_duration = 0.0
+    window_bytes = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        window_duration += time.monotonic() - window_start
+        window_bytes += len(chunk)
+        if window_duration >= HF_HUB_DOWNLOAD_STALL_TIMEOUT:
+            if window_bytes < HF_HUB_DOWNLOAD_MIN_THROUGHPUT * window_duration:
+                response.close()
+                raise requests.exceptions.Timeout(
+                    f"Download stalled: received {window_bytes} bytes in"
+                    f" {window_duration:.1f}s (expected at least"
+                    f" {HF_HUB_DOWNLOAD_MIN_THROUGHPUT} bytes/s)."
+                )
+            window_duration = 0.0
+            window_bytes = 0
+        yield chunk
+        window_start = time.monotonic()
+
+
 def http_get(
     url: str,
     temp_file: BinaryIO,
@@ -467,9 +569,18 @@ def http_get(
     headers: Optional[Dict[str, str]] = None,
     timeout=10.0,
     max_retries=0,
+    expected_etag: Optional[str] = None,
+    expected_size: Optional[int] = None,
 ):
     """
     Download a remote file. Do not gobble up errors, and will return errors tailored to the Hugging Face Hub.
+
+    If the connection drops or stalls in the middle of the transfer, the download is
+    resumed from the last byte written using an HTTP range request, up to 5 times.
+
+    If `expected_etag` is a content hash (sha256 or git blob sha1 as returned by the
+    Hub), the content is hashed while being written. On mismatch, the download is
+    restarted from scratch once before raising an `OSError`.
     """
     if not resume_size:
         if HF_HUB_ENABLE_HF_TRANSFER:
@@ -483,7 +594,6 @@ def http_get(
                 max_files = 100
                 chunk_size = 10 * 1024 * 1024  # 10 MB
                 download(url, temp_file.name, max_files, chunk_size)
-                return
             except ImportError:
                 raise ValueError(
                     "Fast download using 'hf_transfer' is enabled"
@@ -495,6 +605,8 @@ def http_get(
                     "An error occurred while downloading using `hf_transfer`. Consider"
                     " disabling HF_HUB_ENABLE_HF_TRANSFER for better error handling."
                 ) from e
+            _verify_file_etag(temp_file.name, expected_etag, expected_size)
+            return
 
     headers = copy.deepcopy(headers) or {}
     if resume_size > 0:
@@ -527,11 +639,310 @@ def http_get(
         desc=f"Downloading (…){displayed_name[-20:]}",
         disable=bool(logger.getEffectiveLevel() == logging.NOTSET),
     )
-    for chunk in r.iter_content(chunk_size=10 * 1024 * 1024):
-        if chunk:  # filter out keep-alive new chunks
-            progress.update(len(chunk))
-            temp_file.write(chunk)
-    progress.close()
+    hasher = _get_etag_hasher(expected_etag, expected_size)
+    if hasher is not None and resume_size > 0:
+        # Hash bytes downloaded in a previous session (if file can be read)
+        temp_file_name = getattr(temp_file, "name", None)
+        if isinstance(temp_file_name, str) and os.path.isfile(temp_file_name):
+            with open(temp_file_name, "rb") as f:
+                while f.tell() < resume_size:
+                    chunk = f.read(min(1024 * 1024, resume_size - f.tell()))
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+        else:
+            hasher = None
+
+    downloaded_size = resume_size
+
+    def _start_over() -> None:
+        nonlocal downloaded_size, hasher
+        temp_file.seek(0)
+        temp_file.truncate()
+        progress.reset(total=total)
+        downloaded_size = 0
+        hasher = _get_etag_hasher(expected_etag, expected_size)
+
+    num_resumes = 0
+    has_restarted = False
+    reconnect = False
+    try:
+        while True:
+            try:
+                if reconnect:
+                    # Resume download where the previous connection stopped
+                    if downloaded_size > 0:
+                        headers["Range"] = "bytes=%d-" % (downloaded_size,)
+                    else:
+                        headers.pop("Range", None)
+                    r = _request_wrapper(
+                        method="GET",
+                        url=url,
+                        stream=True,
+                        proxies=proxies,
+                        headers=headers,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                    )
+                    hf_raise_for_status(r)
+                    if downloaded_size > 0 and r.status_code != 206:
+                        # Range not supported by server => start over
+                        _start_over()
+                    reconnect = False
+
+                # 1MB chunks => stalls are detected even on slow connections
+                for chunk in _iter_content_with_stall_detection(r, 1024 * 1024):
+                    if chunk:  # filter out keep-alive new chunks
+                        progress.update(len(chunk))
+                        temp_file.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+                        downloaded_size += len(chunk)
+
+                if total is not None and downloaded_size < total:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"Connection closed after {downloaded_size}/{total} bytes."
+                    )
+
+                if hasher is not None and hasher.hexdigest() != expected_etag:
+                    # Corrupted download (or corrupted partial file) => retry once
+                    _start_over()
+                    if has_restarted:
+                        raise OSError(
+                            f"Consistency check failed: content downloaded from {url}"
+                            f" does not match its etag ({expected_etag}). The download"
+                            " might have been corrupted. Please retry."
+                        )
+                    logger.warning(
+                        f"Content downloaded from {url} does not match its etag"
+                        f" ({expected_etag}). Downloading it again from scratch."
+                    )
+                    has_restarted = True
+                    reconnect = True
+                    continue
+                return
+            except (requests.exceptions.SSLError, requests.exceptions.ProxyError):
+                # Actually raise for those subclasses of ConnectionError
+                raise
+            except (
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as error:
+                if num_resumes >= _HTTP_GET_MAX_RESUMES:
+                    raise
+                num_resumes += 1
+                reconnect = True
+                logger.warning(
+                    f"Error while downloading {url}: '{error}'. Resuming from byte"
+                    f" {downloaded_size} (attempt"
+                    f" {num_resumes}/{_HTTP_GET_MAX_RESUMES})."
+                )
+    finally:
+        progress.close()
+
+
+# Size of the byte ranges downloaded concurrently by `parallel_http_get`. Files smaller
+# than 2 ranges are downloaded with a single connection.
+PARALLEL_DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024  # 16 MB
+
+# Number of attempts to download a single range before failing.
+_PARALLEL_DOWNLOAD_MAX_ATTEMPTS_PER_RANGE = 5
+
+
+def _should_download_in_parallel(expected_size: Optional[int]) -> bool:
+    return (
+        HF_HUB_ENABLE_PARALLEL_DOWNLOAD
+        and not HF_HUB_ENABLE_HF_TRANSFER
+        and expected_size is not None
+        and expected_size >= 2 * PARALLEL_DOWNLOAD_CHUNK_SIZE
+    )
+
+
+def parallel_http_get(
+    url: str,
+    incomplete_path: str,
+    *,
+    expected_size: int,
+    proxies=None,
+    resume: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+    timeout=10.0,
+    max_retries=0,
+    num_threads: int = HF_HUB_PARALLEL_DOWNLOAD_NUM_THREADS,
+    chunk_size: int = PARALLEL_DOWNLOAD_CHUNK_SIZE,
+    displayed_filename: Optional[str] = None,
+    expected_etag: Optional[str] = None,
+) -> None:
+    """
+    Download a remote file by splitting it in byte ranges fetched concurrently.
+
+    The file at `incomplete_path` is preallocated to `expected_size` bytes and each
+    worker writes its range directly at the correct offset. Finished ranges are tracked
+    in a `<incomplete_path>.ranges` file so that an interrupted download can be resumed:
+    only missing ranges are downloaded again. The `.ranges` file is deleted once the
+    download is complete.
+
+    Connections are taken from the shared session (see [`get_session`]). A range that
+    fails in the middle of the transfer is retried from the last byte written. Do not
+    gobble up errors, and will return errors tailored to the Hugging Face Hub.
+
+    Args:
+        url (`str`):
+            The URL of the file to download. Must support HTTP range requests.
+        incomplete_path (`str`):
+            Path where the file is downloaded.
+        expected_size (`int`):
+            Size of the file in bytes.
+        resume (`bool`, *optional*, defaults to `True`):
+            If `True`, ranges already downloaded in `incomplete_path` are not downloaded
+            again. Otherwise, the download starts from scratch.
+        num_threads (`int`, *optional*):
+            Number of ranges downloaded concurrently. Defaults to
+            `HF_HUB_PARALLEL_DOWNLOAD_NUM_THREADS` (8).
+        chunk_size (`int`, *optional*):
+            Size of each range in bytes. Defaults to 16MB.
+        displayed_filename (`str`, *optional*):
+            Name of the file displayed in the progress bar. Defaults to the url.
+        expected_etag (`str`, *optional*):
+            Etag of the file. If it is a content hash (sha256 or git blob sha1), the
+            downloaded file is checked against it. Since ranges are not downloaded in
+            order, the file is hashed once complete. On mismatch, the file is deleted
+            and an `OSError` is raised.
+    """
+    state_path = incomplete_path + ".ranges"
+    num_ranges = max(1, -(-expected_size // chunk_size))  # ceil division
+
+    # Load finished ranges from a previous download
+    completed: Set[int] = set()
+    if resume and os.path.exists(incomplete_path) and os.path.exists(state_path):
+        try:
+            with open(state_path) as state_file:
+                state = json.load(state_file)
+            if state["size"] == expected_size and state["chunk_size"] == chunk_size:
+                completed = set(state["completed"])
+        except (OSError, ValueError, KeyError):
+            logger.info(f"Could not read download state {state_path}. Starting over.")
+
+    # Preallocate file
+    mode = "r+b" if completed else "wb"
+    with open(incomplete_path, mode) as f:
+        f.truncate(expected_size)
+
+    state_lock = threading.Lock()
+
+    def _save_state() -> None:
+        tmp_state_path = state_path + ".tmp"
+        with open(tmp_state_path, "w") as state_file:
+            json.dump(
+                {
+                    "size": expected_size,
+                    "chunk_size": chunk_size,
+                    "completed": sorted(completed),
+                },
+                state_file,
+            )
+        os.replace(tmp_state_path, state_path)
+
+    with state_lock:
+        _save_state()
+
+    range_headers = copy.deepcopy(headers) or {}
+    # Ranges are defined on the raw content => disable compression
+    range_headers["Accept-Encoding"] = "identity"
+
+    displayed_name = displayed_filename or url
+    progress = tqdm(
+        unit="B",
+        unit_scale=True,
+        total=expected_size,
+        initial=sum(
+            min(chunk_size, expected_size - idx * chunk_size) for idx in completed
+        ),
+        desc=f"Downloading (…){displayed_name[-20:]}",
+        disable=bool(logger.getEffectiveLevel() == logging.NOTSET),
+    )
+
+    def _download_range(range_idx: int) -> None:
+        start = range_idx * chunk_size
+        end = min(start + chunk_size, expected_size)  # exclusive
+        position = start
+        with open(incomplete_path, "r+b") as f:
+            for attempt in range(_PARALLEL_DOWNLOAD_MAX_ATTEMPTS_PER_RANGE):
+                try:
+                    r = _request_wrapper(
+                        method="GET",
+                        url=url,
+                        stream=True,
+                        proxies=proxies,
+                        headers={
+                            **range_headers,
+                            "Range": f"bytes={position}-{end - 1}",
+                        },
+                        timeout=timeout,
+                        max_retries=max_retries,
+                    )
+                    hf_raise_for_status(r)
+                    if r.status_code != 206:
+                        raise ValueError(
+                            f"Server does not support HTTP range requests for {url}"
+                            " (expected HTTP 206). Please disable"
+                            " HF_HUB_ENABLE_PARALLEL_DOWNLOAD."
+                        )
+                    f.seek(position)
+                    for chunk in _iter_content_with_stall_detection(r, 1024 * 1024):
+                        if chunk:  # filter out keep-alive new chunks
+                            chunk = chunk[: end - position]
+                            f.write(chunk)
+                            position += len(chunk)
+                            with state_lock:
+                                progress.update(len(chunk))
+                    if position == end:
+                        break
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"Range {start}-{end - 1} of {url} ended prematurely"
+                        f" ({position - start}/{end - start} bytes)."
+                    )
+                except (requests.exceptions.SSLError, requests.exceptions.ProxyError):
+                    # Actually raise for those subclasses of ConnectionError
+                    raise
+                except (
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                ) as error:
+                    if attempt + 1 == _PARALLEL_DOWNLOAD_MAX_ATTEMPTS_PER_RANGE:
+                        raise
+                    logger.warning(
+                        f"Error while downloading range {start}-{end - 1} of {url}:"
+                        f" '{error}'. Resuming from byte {position}."
+                    )
+
+        with state_lock:
+            completed.add(range_idx)
+            _save_state()
+
+    missing: List[int] = [idx for idx in range(num_ranges) if idx not in completed]
+    logger.debug(
+        f"Downloading {url} in {len(missing)} ranges of {chunk_size} bytes using"
+        f" {num_threads} threads."
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, num_threads)) as executor:
+            # Consume results to propagate the first exception, if any
+            for _ in executor.map(_download_range, missing):
+                pass
+    finally:
+        progress.close()
+
+    # Download complete: state is not needed anymore
+    os.remove(state_path)
+
+    try:
+        _verify_file_etag(incomplete_path, expected_etag, expected_size)
+    except OSError:
+        os.remove(incomplete_path)
+        raise
 
 
 @validate_hf_hub_args
@@ -829,10 +1240,13 @@ def _create_relative_symlink(src: str, dst: str, new_blob: bool = False) -> None
             │   └── [  76]  pytorch_model.bin -> ../../blobs/403450e234d65943a7dcf7e05a771ce3c92faa84dd07db4ac20f592037a1e4bd
 
     If symlinks cannot be created on this platform (most likely to be Windows), the
-    workaround is to avoid symlinks by having the actual file in `dst`. If it is a new
-    file (`new_blob=True`), we move it to `dst`. If it is not a new file
-    (`new_blob=False`), we don't know if the blob file is already referenced elsewhere.
-    To avoid breaking existing cache, the file is duplicated on the disk.
+    workaround is to avoid symlinks by having the actual file in `dst`. The file is
+    materialized without duplicating its content on the disk whenever possible:
+    - if it is not a new file (`new_blob=False`), we don't know if the blob file is
+      already referenced elsewhere. The blob is cloned (copy-on-write, on filesystems
+      supporting it like btrfs or XFS), then hardlinked, then copied as a last resort.
+    - if it is a new file (`new_blob=True`), the blob is hardlinked so that it can be
+      reused by other revisions. If hardlinks are not supported, we move it to `dst`.
 
     In case symlinks are not supported, a warning message is displayed to the user once
     when loading `huggingface_hub`. The warning message can be disable with the
@@ -860,9 +1274,124 @@ def _create_relative_symlink(src: str, dst: str, new_blob: bool = False) -> None
                 # blob file. Raise exception.
                 raise
     elif new_blob:
-        os.replace(src, dst)
-    else:
-        shutil.copyfile(src, dst)
+        if not _try_hardlink(src, dst):
+            os.replace(src, dst)
+    elif not _try_clone_file(src, dst) and not _try_hardlink(src, dst):
+        _copy_file(src, dst)
+
+
+# `_IOW(0x94, 9, int)` in linux/fs.h
+_FICLONE = 0x40049409
+
+
+def _try_clone_file(src: str, dst: str) -> bool:
+    """Clone `src` to `dst` with a copy-on-write reflink (`FICLONE`). Linux only.
+
+    Returns `False` if the filesystem doesn't support it.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    with open(src, "rb") as f_src, open(dst, "wb") as f_dst:
+        try:
+            fcntl.ioctl(f_dst.fileno(), _FICLONE, f_src.fileno())
+            return True
+        except OSError:
+            pass
+    os.remove(dst)
+    return False
+
+
+def _try_hardlink(src: str, dst: str) -> bool:
+    """Hardlink `src` to `dst`. Returns `False` if the filesystem doesn't support it."""
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """Copy `src` to `dst`.
+
+    `copy_file_range` is used when available: the copy is done by the kernel, which can
+    share data blocks on filesystems supporting it (e.g. NFS, XFS or btrfs).
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as f_src, open(dst, "wb") as f_dst:
+                remaining = os.fstat(f_src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        f_src.fileno(), f_dst.fileno(), remaining
+                    )
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass  # Not supported (e.g. cross-device) => fallback to a regular copy
+    shutil.copyfile(src, dst)
+
+
+def _get_shared_blob_path(storage_folder: str, etag: str) -> Optional[str]:
+    """Return the path of a blob in the folder shared by all repos of the cache.
+
+    Returns `None` if `HF_HUB_ENABLE_SHARED_BLOBS` is not set, if the file is not stored
+    with LFS (only sha256 etags are shared) or if symlinks are not supported.
+    """
+    if not HF_HUB_ENABLE_SHARED_BLOBS or _SHA256_REGEX.match(etag) is None:
+        return None
+    cache_dir = os.path.dirname(storage_folder)
+    if not are_symlinks_supported(cache_dir=cache_dir):
+        return None
+    return os.path.join(cache_dir, SHARED_BLOBS_FOLDER_NAME, etag)
+
+
+def _link_shared_blob(storage_folder: str, etag: str, blob_path: str) -> bool:
+    """Link `blob_path` to the shared blob with the same etag, if it exists.
+
+    Returns `True` if the blob has been found in the shared folder, meaning the file
+    doesn't have to be downloaded.
+    """
+    shared_blob_path = _get_shared_blob_path(storage_folder, etag)
+    if shared_blob_path is None or not os.path.exists(shared_blob_path):
+        return False
+    logger.info("linking %s to shared blob %s", blob_path, shared_blob_path)
+    _symlink_to_shared_blob(shared_blob_path, blob_path)
+    return True
+
+
+def _move_to_shared_blobs(storage_folder: str, etag: str, blob_path: str) -> None:
+    """Move a downloaded blob to the shared folder and replace it by a symlink.
+
+    Do nothing if shared blobs are not enabled for this etag.
+    """
+    shared_blob_path = _get_shared_blob_path(storage_folder, etag)
+    if shared_blob_path is None:
+        return
+    os.makedirs(os.path.dirname(shared_blob_path), exist_ok=True)
+    os.replace(blob_path, shared_blob_path)
+    _symlink_to_shared_blob(shared_blob_path, blob_path)
+
+
+def _symlink_to_shared_blob(shared_blob_path: str, blob_path: str) -> None:
+    """Replace `blob_path` by a relative symlink to `shared_blob_path`.
+
+    Symlink support has already been checked for the cache dir in `_get_shared_blob_path`
+    (`_create_relative_symlink` would check it for the parent of the cache instead).
+    """
+    try:
+        os.remove(blob_path)
+    except OSError:
+        pass
+    relative_src = os.path.relpath(shared_blob_path, start=os.path.dirname(blob_path))
+    try:
+        os.symlink(relative_src, blob_path)
+    except FileExistsError:
+        # Linked concurrently by another process
+        if os.path.realpath(blob_path) != os.path.realpath(shared_blob_path):
+            raise
 
 
 def _cache_commit_hash_for_specific_revision(
@@ -870,16 +1399,70 @@ def _cache_commit_hash_for_specific_revision(
 ) -> None:
     """Cache reference between a revision (tag, branch or truncated commit hash) and the corresponding commit hash.
 
-    Does nothing if `revision` is already a proper `commit_hash` or reference is already cached.
+    Does nothing if `revision` is already a proper `commit_hash`. If reference is already
+    cached, its modification time is updated to mark it as fresh (see `HF_HUB_REFS_TTL`).
+    If reference moved to a new commit, files cached as missing for the previous commit
+    are deleted (unless another reference still points to it).
     """
     if revision != commit_hash:
         ref_path = Path(storage_folder) / "refs" / revision
         ref_path.parent.mkdir(parents=True, exist_ok=True)
-        if not ref_path.exists() or commit_hash != ref_path.read_text():
+        previous_commit_hash = ref_path.read_text() if ref_path.exists() else None
+        if commit_hash != previous_commit_hash:
             # Update ref only if has been updated. Could cause useless error in case
             # repo is already cached and user doesn't have write access to cache folder.
             # See https://github.com/huggingface/huggingface_hub/issues/1216.
             ref_path.write_text(commit_hash)
+            if previous_commit_hash is not None:
+                _delete_no_exist_if_unreferenced(storage_folder, previous_commit_hash)
+        elif HF_HUB_REFS_TTL > 0:
+            try:
+                os.utime(ref_path)
+            except OSError:
+                pass  # read-only cache => ref will be revalidated next time
+
+
+def _delete_no_exist_if_unreferenced(storage_folder: str, commit_hash: str) -> None:
+    """Delete `.no_exist/<commit_hash>` if no ref points to `commit_hash` anymore."""
+    refs_dir = Path(storage_folder) / "refs"
+    for ref_path in refs_dir.glob("**/*"):
+        if ref_path.is_file() and ref_path.read_text() == commit_hash:
+            return
+    shutil.rmtree(Path(storage_folder) / ".no_exist" / commit_hash, ignore_errors=True)
+
+
+def _get_fresh_cached_commit_hash(storage_folder: str, revision: str) -> Optional[str]:
+    """Return the commit hash cached for a revision, if it is still fresh.
+
+    A commit hash is always fresh. A branch or tag is fresh if it has been validated
+    against the Hub less than `HF_HUB_REFS_TTL` seconds ago, following HTTP cache
+    semantics. Returns `None` otherwise.
+    """
+    if REGEX_COMMIT_HASH.match(revision):
+        return revision
+    if HF_HUB_REFS_TTL <= 0:
+        return None
+    ref_path = Path(storage_folder) / "refs" / revision
+    try:
+        if time.time() - ref_path.stat().st_mtime < HF_HUB_REFS_TTL:
+            return ref_path.read_text()
+    except OSError:
+        pass
+    return None
+
+
+def _is_fresh_no_exist(
+    storage_folder: str, commit_hash: str, relative_filename: str
+) -> bool:
+    """Whether a file has been cached as missing at `commit_hash` less than
+    `HF_HUB_NO_EXIST_TTL` seconds ago."""
+    if HF_HUB_NO_EXIST_TTL <= 0:
+        return False
+    no_exist_path = Path(storage_folder) / ".no_exist" / commit_hash / relative_filename
+    try:
+        return time.time() - no_exist_path.stat().st_mtime < HF_HUB_NO_EXIST_TTL
+    except OSError:
+        return False
 
 
 @validate_hf_hub_args
@@ -957,7 +1540,8 @@ def hf_hub_download(
             `None` or `"model"` if uploading to a model. Default is `None`.
         revision (`str`, *optional*):
             An optional Git revision id which can be a branch name, a tag, or a
-            commit hash.
+            commit hash. Branches and tags resolved less than `HF_HUB_REFS_TTL`
+            seconds ago are not revalidated with the Hub.
         library_name (`str`, *optional*):
             The name of the library to which the object corresponds.
         library_version (`str`, *optional*):
@@ -1087,6 +1671,25 @@ def hf_hub_download(
         if os.path.exists(pointer_path):
             return pointer_path
 
+    # if revision is a branch or tag that has been resolved recently and the file is
+    # already on disk, shortcut everything as well (see `HF_HUB_REFS_TTL`). Same if the
+    # file is known to be missing at this commit (see `HF_HUB_NO_EXIST_TTL`).
+    if not force_download:
+        fresh_commit_hash = _get_fresh_cached_commit_hash(storage_folder, revision)
+        if fresh_commit_hash is not None:
+            pointer_path = os.path.join(
+                storage_folder, "snapshots", fresh_commit_hash, relative_filename
+            )
+            if os.path.exists(pointer_path):
+                return pointer_path
+            if _is_fresh_no_exist(storage_folder, fresh_commit_hash, relative_filename):
+                raise EntryNotFoundError(
+                    f"Entry Not Found: {filename} does not exist in {repo_id} at"
+                    f" revision {revision} ({fresh_commit_hash}). Result cached less"
+                    f" than {HF_HUB_NO_EXIST_TTL}s ago (see HF_HUB_NO_EXIST_TTL).",
+                    response=None,
+                )
+
     url = hf_hub_url(repo_id, filename, repo_type=repo_type, revision=revision)
 
     headers = build_hf_headers(
@@ -1099,6 +1702,8 @@ def hf_hub_download(
     url_to_download = url
     etag = None
     commit_hash = None
+    expected_size = None
+    head_call_error: Optional[Exception] = None
     if not local_files_only:
         try:
             try:
@@ -1137,6 +1742,7 @@ def hf_hub_download(
 
             # Etag must exist
             etag = metadata.etag
+            expected_size = metadata.size
             # We favor a custom header indicating the etag of the linked resource, and
             # we fallback to the regular etag header.
             # If we don't have any of those, raise an error.
@@ -1161,10 +1767,11 @@ def hf_hub_download(
             requests.exceptions.ConnectionError,
             requests.exceptions.Timeout,
             OfflineModeIsEnabled,
-        ):
+        ) as error:
             # Otherwise, our Internet connection is down.
-            # etag is None
-            pass
+            # etag is None. Error is kept as the cause of the error raised below (e.g.
+            # for `AdaptiveConcurrency` to detect congestion).
+            head_call_error = error
 
     # etag is None == we don't have a connection or we passed local_files_only.
     # try to get the last downloaded one from the specified revision.
@@ -1176,19 +1783,21 @@ def hf_hub_download(
             raise ValueError(
                 "We have no connection or you passed local_files_only, so"
                 " force_download is not an accepted option."
-            )
+            ) from head_call_error
         if REGEX_COMMIT_HASH.match(revision):
             commit_hash = revision
         else:
             ref_path = os.path.join(storage_folder, "refs", revision)
-            with open(ref_path) as f:
-                commit_hash = f.read()
+            if os.path.isfile(ref_path):
+                with open(ref_path) as f:
+                    commit_hash = f.read()
 
-        pointer_path = os.path.join(
-            storage_folder, "snapshots", commit_hash, relative_filename
-        )
-        if os.path.exists(pointer_path):
-            return pointer_path
+        if commit_hash is not None:
+            pointer_path = os.path.join(
+                storage_folder, "snapshots", commit_hash, relative_filename
+            )
+            if os.path.exists(pointer_path):
+                return pointer_path
 
         # If we couldn't find an appropriate file on disk,
         # raise an error.
@@ -1206,7 +1815,7 @@ def hf_hub_download(
                 "Connection error, and we cannot find the requested files in"
                 " the disk cache. Please try again or make sure your Internet"
                 " connection is on."
-            )
+            ) from head_call_error
 
     # From now on, etag and commit_hash are not None.
     assert etag is not None, "etag must have been retrieved from server"
@@ -1226,8 +1835,10 @@ def hf_hub_download(
     if os.path.exists(pointer_path) and not force_download:
         return pointer_path
 
-    if os.path.exists(blob_path) and not force_download:
-        # we have the blob already, but not the pointer
+    if not force_download and (
+        os.path.exists(blob_path) or _link_shared_blob(storage_folder, etag, blob_path)
+    ):
+        # we have the blob already (maybe from another repo), but not the pointer
         logger.info("creating pointer to %s from %s", blob_path, pointer_path)
         _create_relative_symlink(blob_path, pointer_path, new_blob=False)
         return pointer_path
@@ -1249,8 +1860,15 @@ def hf_hub_download(
             # Even if returning early like here, the lock will be released.
             return pointer_path
 
+        download_in_parallel = _should_download_in_parallel(expected_size)
         if resume_download:
             incomplete_path = blob_path + ".incomplete"
+            if not download_in_parallel and os.path.exists(incomplete_path + ".ranges"):
+                # File has been preallocated by a parallel download: it cannot be
+                # resumed from its end => start over.
+                os.remove(incomplete_path + ".ranges")
+                if os.path.exists(incomplete_path):
+                    os.remove(incomplete_path)
 
             @contextmanager
             def _resumable_file_manager() -> Generator[io.BufferedWriter, None, None]:
@@ -1268,21 +1886,41 @@ def hf_hub_download(
             )
             resume_size = 0
 
-        # Download to temporary file, then copy to cache dir once finished.
-        # Otherwise you get corrupt cache entries if the download gets interrupted.
-        with temp_file_manager() as temp_file:
-            logger.info("downloading %s to %s", url, temp_file.name)
-
-            http_get(
+        if download_in_parallel:
+            # Download large file by ranges, in parallel. Finished ranges are tracked
+            # next to the incomplete file to be able to resume the download.
+            temp_file_path = blob_path + ".incomplete"
+            logger.info("downloading %s to %s in parallel", url, temp_file_path)
+            parallel_http_get(
                 url_to_download,
-                temp_file,
+                temp_file_path,
+                expected_size=expected_size,  # type: ignore
                 proxies=proxies,
-                resume_size=resume_size,
+                resume=resume_download,
                 headers=headers,
+                displayed_filename=filename,
+                expected_etag=etag,
             )
+        else:
+            # Download to temporary file, then copy to cache dir once finished.
+            # Otherwise you get corrupt cache entries if the download gets interrupted.
+            with temp_file_manager() as temp_file:
+                logger.info("downloading %s to %s", url, temp_file.name)
+
+                http_get(
+                    url_to_download,
+                    temp_file,
+                    proxies=proxies,
+                    resume_size=resume_size,
+                    headers=headers,
+                    expected_etag=etag,
+                    expected_size=expected_size,
+                )
+            temp_file_path = temp_file.name
 
         logger.info("storing %s in cache at %s", url, blob_path)
-        _chmod_and_replace(temp_file.name, blob_path)
+        _chmod_and_replace(temp_file_path, blob_path)
+        _move_to_shared_blobs(storage_folder, etag, blob_path)
 
         logger.info("creating pointer to %s from %s", blob_path, pointer_path)
         _create_relative_symlink(blob_path, pointer_path, new_blob=True)
@@ -1295,6 +1933,228 @@ def hf_hub_download(
     return pointer_path
 
 
+class BatchDownloadError(Exception):
+    """Raised by [`hf_hub_download_many`] if at least one file could not be downloaded.
+
+    Attributes:
+        paths (`Dict[str, str]`):
+            Mapping between filenames and local paths of the files that have been
+            downloaded successfully.
+        errors (`Dict[str, Exception]`):
+            Mapping between filenames and the error raised when downloading them.
+    """
+
+    def __init__(
+        self, repo_id: str, paths: Dict[str, str], errors: Dict[str, Exception]
+    ):
+        # All arguments are passed to `Exception` for the error to be picklable (e.g.
+        # raised in a `ProcessPoolExecutor`).
+        super().__init__(repo_id, paths, errors)
+        self.repo_id = repo_id
+        self.paths = paths
+        self.errors = errors
+
+    def __str__(self) -> str:
+        details = "\n".join(
+            f" - {filename}: {error.__class__.__name__}: {error}"
+            for filename, error in self.errors.items()
+        )
+        return (
+            f"{len(self.errors)} out of {len(self.paths) + len(self.errors)} files"
+            f" could not be downloaded from {self.repo_id}:\n{details}"
+        )
+
+
+@validate_hf_hub_args
+def hf_hub_download_many(
+    repo_id: str,
+    filenames: List[str],
+    *,
+    subfolder: Optional[str] = None,
+    repo_type: Optional[str] = None,
+    revision: Optional[str] = None,
+    library_name: Optional[str] = None,
+    library_version: Optional[str] = None,
+    cache_dir: Union[str, Path, None] = None,
+    user_agent: Union[Dict, str, None] = None,
+    force_download: bool = False,
+    proxies: Optional[Dict] = None,
+    etag_timeout: float = 10,
+    resume_download: bool = False,
+    token: Union[bool, str, None] = None,
+    local_files_only: bool = False,
+    max_workers: int = 8,
+) -> Dict[str, str]:
+    """Download several files from the same repo if they are not already in the cache.
+
+    The revision is resolved once to a commit hash, then files are downloaded
+    concurrently with [`hf_hub_download`]. All files are downloaded from the same
+    commit, even if a new commit is pushed in the meantime. Errors are collected per
+    file: a file failing to download does not stop the other downloads.
+
+    Args:
+        repo_id (`str`):
+            A user or an organization name and a repo name separated by a `/`.
+        filenames (`List[str]`):
+            The names of the files in the repo.
+        subfolder (`str`, *optional*):
+            An optional value corresponding to a folder inside the model repo.
+        repo_type (`str`, *optional*):
+            Set to `"dataset"` or `"space"` if downloading from a dataset or space,
+            `None` or `"model"` if downloading from a model. Default is `None`.
+        revision (`str`, *optional*):
+            An optional Git revision id which can be a branch name, a tag, or a
+            commit hash.
+        library_name (`str`, *optional*):
+            The name of the library to which the object corresponds.
+        library_version (`str`, *optional*):
+            The version of the library.
+        cache_dir (`str`, `Path`, *optional*):
+            Path to the folder where cached files are stored.
+        user_agent (`dict`, `str`, *optional*):
+            The user-agent info in the form of a dictionary or a string.
+        force_download (`bool`, *optional*, defaults to `False`):
+            Whether the files should be downloaded even if they already exist in
+            the local cache.
+        proxies (`dict`, *optional*):
+            Dictionary mapping protocol to the URL of the proxy passed to
+            `requests.request`.
+        etag_timeout (`float`, *optional*, defaults to `10`):
+            When fetching ETag, how many seconds to wait for the server to send
+            data before giving up which is passed to `requests.request`.
+        resume_download (`bool`, *optional*, defaults to `False`):
+            If `True`, resume previously interrupted downloads.
+        token (`str`, `bool`, *optional*):
+            A token to be used for the download.
+                - If `True`, the token is read from the HuggingFace config
+                  folder.
+                - If a string, it's used as the authentication token.
+        local_files_only (`bool`, *optional*, defaults to `False`):
+            If `True`, avoid downloading the files and return the paths to the
+            local cached files if they exist.
+        max_workers (`int`, *optional*):
+            Number of concurrent threads to download files (1 thread = 1 file download).
+            Defaults to 8.
+
+    Returns:
+        `Dict[str, str]`: Mapping between each filename and the local path of the file.
+
+    <Tip>
+
+    Raises the following errors:
+
+        - [`ValueError`](https://docs.python.org/3/library/exceptions.html#ValueError)
+          if some parameter value is invalid
+        - [`~utils.RepositoryNotFoundError`]
+          If the repository to download from cannot be found. This may be because it doesn't exist,
+          or because it is set to `private` and you do not have access.
+        - [`~utils.RevisionNotFoundError`]
+          If the revision to download from cannot be found.
+        - [`BatchDownloadError`]
+          If at least one file could not be downloaded. Errors for each file are
+          available in `error.errors` and successfully downloaded files in `error.paths`.
+
+    </Tip>
+
+    Example:
+    ```py
+    >>> from huggingface_hub import hf_hub_download_many
+    >>> hf_hub_download_many("gpt2", ["config.json", "vocab.json", "merges.txt"])
+    {'config.json': '/home/user/.cache/huggingface/hub/models--gpt2/snapshots/.../config.json', ...}
+    ```
+    """
+    if cache_dir is None:
+        cache_dir = HUGGINGFACE_HUB_CACHE
+    if revision is None:
+        revision = DEFAULT_REVISION
+    if repo_type is None:
+        repo_type = "model"
+    if repo_type not in REPO_TYPES:
+        raise ValueError(
+            f"Invalid repo type: {repo_type}. Accepted repo types are:"
+            f" {str(REPO_TYPES)}"
+        )
+    filenames = list(dict.fromkeys(filenames))  # remove duplicates, keep order
+    if len(filenames) == 0:
+        return {}
+
+    # Resolve revision once, with a single call (if not fresh in cache)
+    if not local_files_only and not REGEX_COMMIT_HASH.match(revision):
+        storage_folder = os.path.join(
+            cache_dir, repo_folder_name(repo_id=repo_id, repo_type=repo_type)
+        )
+        commit_hash = _get_fresh_cached_commit_hash(storage_folder, revision)
+        if commit_hash is None:
+            first_filename = filenames[0]
+            if subfolder is not None and subfolder != "":
+                first_filename = f"{subfolder}/{first_filename}"
+            try:
+                commit_hash = get_hf_file_metadata(
+                    url=hf_hub_url(
+                        repo_id, first_filename, repo_type=repo_type, revision=revision
+                    ),
+                    token=token,
+                    proxies=proxies,
+                    timeout=etag_timeout,
+                ).commit_hash
+            except EntryNotFoundError as http_error:
+                commit_hash = http_error.response.headers.get(
+                    HUGGINGFACE_HEADER_X_REPO_COMMIT
+                )
+            except (requests.exceptions.SSLError, requests.exceptions.ProxyError):
+                # Actually raise for those subclasses of ConnectionError
+                raise
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                OfflineModeIsEnabled,
+            ):
+                # Connection is down => each download will fallback to the cache
+                pass
+            if commit_hash is not None:
+                os.makedirs(storage_folder, exist_ok=True)
+                _cache_commit_hash_for_specific_revision(
+                    storage_folder, revision, commit_hash
+                )
+        if commit_hash is not None:
+            revision = commit_hash
+
+    # Download files concurrently, collecting errors
+    paths: Dict[str, str] = {}
+    errors: Dict[str, Exception] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            filename: executor.submit(
+                hf_hub_download,
+                repo_id,
+                filename,
+                subfolder=subfolder,
+                repo_type=repo_type,
+                revision=revision,
+                library_name=library_name,
+                library_version=library_version,
+                cache_dir=cache_dir,
+                user_agent=user_agent,
+                force_download=force_download,
+                proxies=proxies,
+                etag_timeout=etag_timeout,
+                resume_download=resume_download,
+                token=token,
+                local_files_only=local_files_only,
+            )
+            for filename in filenames
+        }
+        for filename, future in futures.items():
+            try:
+                paths[filename] = future.result()
+            except Exception as error:
+                errors[filename] = error
+
+    if len(errors) > 0:
+        raise BatchDownloadError(repo_id, paths, errors)
+    return paths
+
+
 @validate_hf_hub_args
 def try_to_load_from_cache(
     repo_id: str,
@@ -1367,6 +2227,151 @@ def try_to_load_from_cache(
     return cached_file if os.path.isfile(cached_file) else None
 
 
+class CachedFileMmap:
+    """Read-only memory map of a file from the cache, returned by [`mmap_cached_file`].
+
+    Handles on the same blob share a single memory map: the file content is read from
+    the OS page cache, also shared with other processes mapping the same file. The map
+    is closed when the last handle is closed. Handles can be used as context managers.
+
+    Attributes:
+        blob_path (`str`):
+            Path of the blob file being mapped.
+        view (`memoryview`):
+            Read-only view over the file content. Slicing it does not copy the data.
+    """
+
+    def __init__(self, blob_path: str, shared: "_SharedMmap") -> None:
+        self.blob_path = blob_path
+        self._shared = shared
+        self.view = (
+            memoryview(shared.mmap) if shared.mmap is not None else memoryview(b"")
+        )
+        self.closed = False
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def __enter__(self) -> "CachedFileMmap":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"CachedFileMmap(blob_path={self.blob_path!r}, size={len(self)},"
+            f" closed={self.closed})"
+        )
+
+    def close(self) -> None:
+        """Release the handle. The memory map is closed once all handles are released.
+
+        Views derived from `view` (e.g. slices) must not be used after closing.
+        """
+        with _shared_mmaps_lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.view.release()
+            self._shared.refcount -= 1
+            if self._shared.refcount == 0:
+                _shared_mmaps.pop(self.blob_path, None)
+                self._shared.close()
+
+
+class _SharedMmap:
+    """Memory map of a blob, shared by all the [`CachedFileMmap`] opened on it."""
+
+    def __init__(self, blob_path: str) -> None:
+        self.refcount = 0
+        self.mmap: Optional[mmap.mmap] = None
+        with open(blob_path, "rb") as f:
+            # Empty files cannot be mapped
+            if os.fstat(f.fileno()).st_size > 0:
+                self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if self.mmap is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                # Views derived from a handle are still in use. The map will be closed
+                # when garbage collected.
+                pass
+
+
+# Weak references: maps of handles that have been garbage collected without being
+# closed are released as well.
+_shared_mmaps: "weakref.WeakValueDictionary[str, _SharedMmap]" = (
+    weakref.WeakValueDictionary()
+)
+_shared_mmaps_lock = threading.Lock()
+
+
+def mmap_cached_file(
+    repo_id: str,
+    filename: str,
+    cache_dir: Union[str, Path, None] = None,
+    revision: Optional[str] = None,
+    repo_type: Optional[str] = None,
+) -> Optional[CachedFileMmap]:
+    """
+    Memory-map a file from the cache, without reading it.
+
+    Same as [`try_to_load_from_cache`] but returns a read-only memory map of the file
+    instead of its path. Contrary to `open(path).read()`, the file content is not copied
+    in the memory of the process: it is loaded lazily from the OS page cache when
+    accessed. All handles on the same file, from any thread, share the same map. Other
+    processes mapping the file share the same memory pages.
+
+    This function will not raise any exception if the file in not cached.
+
+    Args:
+        repo_id (`str`):
+            The ID of the repo on huggingface.co.
+        filename (`str`):
+            The filename to look for inside `repo_id`.
+        cache_dir (`str` or `os.PathLike`, *optional*):
+            The folder where the cached files lie.
+        revision (`str`, *optional*):
+            The specific model version to use. Will default to `"main"`.
+        repo_type (`str`, *optional*):
+            The type of the repository. Will default to `"model"`.
+
+    Returns:
+        [`CachedFileMmap`] or `None`: a handle on the mapped file, to be closed once
+        done. `None` if the file is not cached.
+
+    Example:
+    ```py
+    >>> from huggingface_hub import hf_hub_download, mmap_cached_file
+    >>> hf_hub_download("gpt2", "model.safetensors")
+    >>> with mmap_cached_file("gpt2", "model.safetensors") as cached:
+    ...     header_size = int.from_bytes(cached.view[:8], "little")
+    ```
+    """
+    cached_file = try_to_load_from_cache(
+        repo_id,
+        filename,
+        cache_dir=cache_dir,
+        revision=revision,
+        repo_type=repo_type,
+    )
+    if not isinstance(cached_file, str):
+        return None
+
+    # Resolve symlink only once: all snapshots pointing to the same blob share the map
+    blob_path = os.path.realpath(cached_file)
+    with _shared_mmaps_lock:
+        shared = _shared_mmaps.get(blob_path)
+        if shared is None:
+            shared = _SharedMmap(blob_path)
+            _shared_mmaps[blob_path] = shared
+        shared.refcount += 1
+        return CachedFileMmap(blob_path, shared)
+
+
 @validate_hf_hub_args
 def get_hf_file_metadata(
     url: str,
@@ -12,10 +12,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
 import os
 import re
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from itertools import islice
 from pathlib import Path
@@ -30,9 +30,8 @@ from ._commit_api import (
     CommitOperation,
     CommitOperationAdd,
     CommitOperationDelete,
-    fetch_upload_modes,
-    prepare_commit_payload,
-    upload_lfs_files,
+    stream_commit_payload,
+    upload_additions,
     warn_on_overwriting_operations,
 )
 from ._space_api import SpaceHardware, SpaceRuntime
@@ -52,14 +51,24 @@ from .constants import (
     REPO_TYPES,
     REPO_TYPES_MAPPING,
     REPO_TYPES_URL_PREFIXES,
+    SAFETENSORS_HEADER_PREFETCH_SIZE,
     SPACES_SDK_TYPES,
 )
+from .file_download import (
+    REGEX_COMMIT_HASH,
+    _request_wrapper,
+    hf_hub_url,
+    try_to_load_from_cache,
+)
+from .lfs import LFS_MULTIPART_NUM_THREADS
 from .utils import (  # noqa: F401 # imported for backward compatibility
+    AdaptiveConcurrency,
     HfFolder,
     HfHubHTTPError,
     build_hf_headers,
     erase_from_credential_store,
     filter_repo_objects,
+    get_session,
     hf_raise_for_status,
     logging,
     parse_datetime,
@@ -73,6 +82,13 @@ from .utils._deprecation import (
     _deprecate_method,
 )
 from .utils._pagination import paginate
+from .utils._safetensors import (
+    SafetensorsFileMetadata,
+    SafetensorsParsingError,
+    SafetensorsRepoMetadata,
+    parse_safetensors_header,
+    parse_safetensors_header_length,
+)
 from .utils._typing import Literal, TypedDict
 from .utils.endpoint_helpers import (
     AttributeDictionary,
@@ -796,7 +812,7 @@ class HfApi:
                 Hugging Face token. Will default to the locally saved token if
                 not provided.
         """
-        r = requests.get(
+        r = get_session().get(
             f"{self.endpoint}/api/whoami-v2",
             headers=self._build_hf_headers(
                 # If `token` is provided and not `None`, it will be used by default.
@@ -867,7 +883,7 @@ class HfApi:
     def get_model_tags(self) -> ModelTags:
         "Gets all valid model tags as a nested namespace object"
         path = f"{self.endpoint}/api/models-tags-by-type"
-        r = requests.get(path)
+        r = get_session().get(path)
         hf_raise_for_status(r)
         d = r.json()
         return ModelTags(d)
@@ -877,7 +893,7 @@ class HfApi:
         Gets all valid dataset tags as a nested namespace object.
         """
         path = f"{self.endpoint}/api/datasets-tags-by-type"
-        r = requests.get(path)
+        r = get_session().get(path)
         hf_raise_for_status(r)
         d = r.json()
         return DatasetTags(d)
@@ -996,7 +1012,49 @@ class HfApi:
         """
         path = f"{self.endpoint}/api/models"
         headers = self._build_hf_headers(token=token)
-        params = {}
+        params = self._list_models_params(
+            filter=filter,
+            author=author,
+            search=search,
+            sort=sort,
+            direction=direction,
+            limit=limit,
+            full=full,
+            cardData=cardData,
+            fetch_config=fetch_config,
+        )
+
+        data = paginate(path, params=params, headers=headers)
+        if limit is not None:
+            data = islice(data, limit)  # Do not iterate over all pages
+        items = [ModelInfo(**x) for x in data]
+
+        if emissions_thresholds is not None:
+            if cardData is None:
+                raise ValueError(
+                    "`emissions_thresholds` were passed without setting"
+                    " `cardData=True`."
+                )
+            else:
+                return _filter_emissions(items, *emissions_thresholds)
+
+        return items
+
+    def _list_models_params(
+        self,
+        *,
+        filter: Union[ModelFilter, str, Iterable[str], None],
+        author: Optional[str],
+        search: Optional[str],
+        sort: Optional[str],
+        direction: Optional[int],
+        limit: Optional[int],
+        full: Optional[bool],
+        cardData: bool,
+        fetch_config: bool,
+    ) -> Dict[str, Any]:
+        """Query parameters of the `/api/models` endpoint (see [`list_models`])."""
+        params: Dict[str, Any] = {}
         if filter is not None:
             if isinstance(filter, ModelFilter):
                 params = self._unpack_model_filter(filter)
@@ -1022,22 +1080,7 @@ class HfApi:
             params.update({"config": True})
         if cardData:
             params.update({"cardData": True})
-
-        data = paginate(path, params=params, headers=headers)
-        if limit is not None:
-            data = islice(data, limit)  # Do not iterate over all pages
-        items = [ModelInfo(**x) for x in data]
-
-        if emissions_thresholds is not None:
-            if cardData is None:
-                raise ValueError(
-                    "`emissions_thresholds` were passed without setting"
-                    " `cardData=True`."
-                )
-            else:
-                return _filter_emissions(items, *emissions_thresholds)
-
-        return items
+        return params
 
     def _unpack_model_filter(self, model_filter: ModelFilter):
         """
@@ -1207,7 +1250,34 @@ class HfApi:
         """
         path = f"{self.endpoint}/api/datasets"
         headers = self._build_hf_headers(token=token)
-        params = {}
+        params = self._list_datasets_params(
+            filter=filter,
+            author=author,
+            search=search,
+            sort=sort,
+            direction=direction,
+            limit=limit,
+            full=full or cardData,
+        )
+
+        data = paginate(path, params=params, headers=headers)
+        if limit is not None:
+            data = islice(data, limit)  # Do not iterate over all pages
+        return [DatasetInfo(**x) for x in data]
+
+    def _list_datasets_params(
+        self,
+        *,
+        filter: Union[DatasetFilter, str, Iterable[str], None],
+        author: Optional[str],
+        search: Optional[str],
+        sort: Optional[str],
+        direction: Optional[int],
+        limit: Optional[int],
+        full: Optional[bool],
+    ) -> Dict[str, Any]:
+        """Query parameters of the `/api/datasets` endpoint (see [`list_datasets`])."""
+        params: Dict[str, Any] = {}
         if filter is not None:
             if isinstance(filter, DatasetFilter):
                 params = self._unpack_dataset_filter(filter)
@@ -1223,13 +1293,9 @@ class HfApi:
             params.update({"direction": direction})
         if limit is not None:
             params.update({"limit": limit})
-        if full or cardData:
+        if full:
             params.update({"full": True})
-
-        data = paginate(path, params=params, headers=headers)
-        if limit is not None:
-            data = islice(data, limit)  # Do not iterate over all pages
-        return [DatasetInfo(**x) for x in data]
+        return params
 
     def _unpack_dataset_filter(self, dataset_filter: DatasetFilter):
         """
@@ -1280,7 +1346,7 @@ class HfApi:
             `List[MetricInfo]`: a list of [`MetricInfo`] objects which.
         """
         path = f"{self.endpoint}/api/metrics"
-        r = requests.get(path)
+        r = get_session().get(path)
         hf_raise_for_status(r)
         d = r.json()
         return [MetricInfo(**x) for x in d]
@@ -1345,6 +1411,39 @@ class HfApi:
         """
         path = f"{self.endpoint}/api/spaces"
         headers = self._build_hf_headers(token=token)
+        params = self._list_spaces_params(
+            filter=filter,
+            author=author,
+            search=search,
+            sort=sort,
+            direction=direction,
+            limit=limit,
+            datasets=datasets,
+            models=models,
+            linked=linked,
+            full=full,
+        )
+
+        data = paginate(path, params=params, headers=headers)
+        if limit is not None:
+            data = islice(data, limit)  # Do not iterate over all pages
+        return [SpaceInfo(**x) for x in data]
+
+    def _list_spaces_params(
+        self,
+        *,
+        filter: Union[str, Iterable[str], None],
+        author: Optional[str],
+        search: Optional[str],
+        sort: Optional[str],
+        direction: Optional[int],
+        limit: Optional[int],
+        datasets: Union[str, Iterable[str], None],
+        models: Union[str, Iterable[str], None],
+        linked: bool,
+        full: Optional[bool],
+    ) -> Dict[str, Any]:
+        """Query parameters of the `/api/spaces` endpoint (see [`list_spaces`])."""
         params: Dict[str, Any] = {}
         if filter is not None:
             params.update({"filter": filter})
@@ -1366,11 +1465,7 @@ class HfApi:
             params.update({"datasets": datasets})
         if models is not None:
             params.update({"models": models})
-
-        data = paginate(path, params=params, headers=headers)
-        if limit is not None:
-            data = islice(data, limit)  # Do not iterate over all pages
-        return [SpaceInfo(**x) for x in data]
+        return params
 
     @validate_hf_hub_args
     def like(
@@ -1414,7 +1509,7 @@ class HfApi:
         """
         if repo_type is None:
             repo_type = REPO_TYPE_MODEL
-        response = requests.post(
+        response = get_session().post(
             url=f"{self.endpoint}/api/{repo_type}s/{repo_id}/like",
             headers=self._build_hf_headers(token=token),
         )
@@ -1463,7 +1558,7 @@ class HfApi:
         if repo_type is None:
             repo_type = REPO_TYPE_MODEL
         # TODO: use requests.delete(".../like") instead when https://github.com/huggingface/moon-landing/pull/4813 is merged
-        response = requests.delete(
+        response = get_session().delete(
             url=f"{self.endpoint}/api/{repo_type}s/{repo_id}/like",
             headers=self._build_hf_headers(token=token),
         )
@@ -1622,7 +1717,7 @@ class HfApi:
             params["securityStatus"] = True
         if files_metadata:
             params["blobs"] = True
-        r = requests.get(path, headers=headers, timeout=timeout, params=params)
+        r = get_session().get(path, headers=headers, timeout=timeout, params=params)
         hf_raise_for_status(r)
         d = r.json()
         return ModelInfo(**d)
@@ -1687,7 +1782,7 @@ class HfApi:
         if files_metadata:
             params["blobs"] = True
 
-        r = requests.get(path, headers=headers, timeout=timeout, params=params)
+        r = get_session().get(path, headers=headers, timeout=timeout, params=params)
         hf_raise_for_status(r)
         d = r.json()
         return DatasetInfo(**d)
@@ -1752,7 +1847,7 @@ class HfApi:
         if files_metadata:
             params["blobs"] = True
 
-        r = requests.get(path, headers=headers, timeout=timeout, params=params)
+        r = get_session().get(path, headers=headers, timeout=timeout, params=params)
         hf_raise_for_status(r)
         d = r.json()
         return SpaceInfo(**d)
@@ -1915,17 +2010,188 @@ class HfApi:
             repo on the Hub.
         """
         repo_type = repo_type or REPO_TYPE_MODEL
-        response = requests.get(
+        response = get_session().get(
             f"{self.endpoint}/api/{repo_type}s/{repo_id}/refs",
             headers=self._build_hf_headers(token=token),
         )
         hf_raise_for_status(response)
-        data = response.json()
-        return GitRefs(
-            branches=[GitRefInfo(item) for item in data["branches"]],
-            converts=[GitRefInfo(item) for item in data["converts"]],
-            tags=[GitRefInfo(item) for item in data["tags"]],
+        return _parse_git_refs(response.json())
+
+    @validate_hf_hub_args
+    def get_safetensors_metadata(
+        self,
+        repo_id: str,
+        *,
+        repo_type: Optional[str] = None,
+        revision: Optional[str] = None,
+        allow_patterns: Optional[Union[List[str], str]] = None,
+        ignore_patterns: Optional[Union[List[str], str]] = None,
+        cache_dir: Union[str, Path, None] = None,
+        max_workers: int = 8,
+        token: Optional[Union[bool, str]] = None,
+    ) -> SafetensorsRepoMetadata:
+        """
+        Get the metadata (names, dtypes, shapes and offsets of the tensors) of all the
+        safetensors files of a repo, without downloading the weights.
+
+        Only the header of each file is fetched with HTTP range requests (usually a few
+        KB per file). Headers of all the shards are fetched concurrently. Files already
+        in the local cache are read from the disk.
+
+        Args:
+            repo_id (`str`):
+                A namespace (user or an organization) and a repo name separated
+                by a `/`.
+            repo_type (`str`, *optional*):
+                Set to `"dataset"` or `"space"` if reading from a dataset or space,
+                `None` or `"model"` if reading from a model. Default is `None`.
+            revision (`str`, *optional*):
+                The revision to read the files from. Defaults to the head of the
+                `"main"` branch.
+            allow_patterns (`List[str]` or `str`, *optional*):
+                If provided, only safetensors files matching at least one pattern are
+                read.
+            ignore_patterns (`List[str]` or `str`, *optional*):
+                If provided, safetensors files matching any of the patterns are not read.
+            cache_dir (`str`, `Path`, *optional*):
+                Path to the folder where cached files are stored.
+            max_workers (`int`, *optional*, defaults to `8`):
+                Number of headers to fetch concurrently.
+            token (`bool` or `str`, *optional*):
+                A valid authentication token (see https://huggingface.co/settings/token).
+                If `None` or `True` and machine is logged in (through `huggingface-cli login`
+                or [`~huggingface_hub.login`]), token will be retrieved from the cache.
+                If `False`, token is not sent in the request header.
+
+        Returns:
+            [`SafetensorsRepoMetadata`]: the headers of the safetensors files of the repo,
+            bound to the commit they have been read from. `files` is empty if the repo
+            contains no safetensors files.
+
+        Raises:
+            [`SafetensorsParsingError`]: if a header is not a valid safetensors header.
+
+        Example:
+        ```py
+        >>> from huggingface_hub import get_safetensors_metadata
+        >>> metadata = get_safetensors_metadata("bigscience/bloom")
+        >>> metadata.weight_map["h.0.self_attention.dense.weight"]
+        'model_00004-of-00072.safetensors'
+        >>> metadata.files[metadata.weight_map["h.0.self_attention.dense.weight"]].tensors["h.0.self_attention.dense.weight"]
+        TensorInfo(dtype='BF16', shape=(14336, 14336), data_offsets=(822018048, 1233059840))
+        >>> metadata.parameter_count
+        {'BF16': 176247271424}
+        ```
+        """
+        repo_info = self.repo_info(
+            repo_id, repo_type=repo_type, revision=revision, token=token
         )
+        commit_hash: str = repo_info.sha  # type: ignore
+        filenames = list(
+            filter_repo_objects(
+                (
+                    sibling.rfilename
+                    for sibling in repo_info.siblings
+                    if sibling.rfilename.endswith(".safetensors")
+                ),
+                allow_patterns=allow_patterns,
+                ignore_patterns=ignore_patterns,
+            )
+        )
+
+        def _parse(filename: str) -> SafetensorsFileMetadata:
+            return self.parse_safetensors_file_metadata(
+                repo_id,
+                filename,
+                repo_type=repo_type,
+                revision=commit_hash,
+                cache_dir=cache_dir,
+                token=token,
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            files = dict(zip(filenames, executor.map(_parse, filenames)))
+        return SafetensorsRepoMetadata(
+            repo_id=repo_id,
+            commit_hash=commit_hash,
+            files=files,
+            weight_map={
+                tensor: filename
+                for filename, file in files.items()
+                for tensor in file.tensors
+            },
+        )
+
+    @validate_hf_hub_args
+    def parse_safetensors_file_metadata(
+        self,
+        repo_id: str,
+        filename: str,
+        *,
+        repo_type: Optional[str] = None,
+        revision: Optional[str] = None,
+        cache_dir: Union[str, Path, None] = None,
+        token: Optional[Union[bool, str]] = None,
+    ) -> SafetensorsFileMetadata:
+        """
+        Get the metadata of a single safetensors file, reading only its header.
+
+        The header is usually fetched with a single HTTP range request. If `revision` is
+        a commit hash and the file is in the local cache, it is read from the disk.
+
+        Args:
+            repo_id (`str`):
+                A namespace (user or an organization) and a repo name separated
+                by a `/`.
+            filename (`str`):
+                Path of the safetensors file in the repo.
+            repo_type (`str`, *optional*):
+                Set to `"dataset"` or `"space"` if reading from a dataset or space,
+                `None` or `"model"` if reading from a model. Default is `None`.
+            revision (`str`, *optional*):
+                The revision to read the file from. Defaults to the head of the `"main"`
+                branch.
+            cache_dir (`str`, `Path`, *optional*):
+                Path to the folder where cached files are stored.
+            token (`bool` or `str`, *optional*):
+                A valid authentication token (see https://huggingface.co/settings/token).
+                If `None` or `True` and machine is logged in (through `huggingface-cli login`
+                or [`~huggingface_hub.login`]), token will be retrieved from the cache.
+                If `False`, token is not sent in the request header.
+
+        Returns:
+            [`SafetensorsFileMetadata`]: the header of the file.
+
+        Raises:
+            [`SafetensorsParsingError`]: if the header is not a valid safetensors header.
+        """
+        if revision is not None and REGEX_COMMIT_HASH.match(revision):
+            cached_path = try_to_load_from_cache(
+                repo_id,
+                filename,
+                cache_dir=cache_dir,
+                revision=revision,
+                repo_type=repo_type,
+            )
+            if isinstance(cached_path, str):
+                with open(cached_path, "rb") as f:
+                    header_size = parse_safetensors_header_length(f.read(8), filename)
+                    return parse_safetensors_header(f.read(header_size), filename)
+
+        url = hf_hub_url(repo_id, filename, repo_type=repo_type, revision=revision)
+        headers = self._build_hf_headers(token=token)
+
+        # Header length + most headers in 1 request, the rest of the header if bigger
+        content = _fetch_byte_range(url, headers, 0, SAFETENSORS_HEADER_PREFETCH_SIZE)
+        header_size = parse_safetensors_header_length(content, filename)
+        if SAFETENSORS_HEADER_PREFETCH_SIZE <= len(content) < 8 + header_size:
+            content += _fetch_byte_range(url, headers, len(content), 8 + header_size)
+        if len(content) < 8 + header_size:
+            raise SafetensorsParsingError(
+                f"Failed to parse safetensors header of '{filename}': file is"
+                f" truncated (expected a header of {header_size} bytes)."
+            )
+        return parse_safetensors_header(content[8 : 8 + header_size], filename)
 
     @validate_hf_hub_args
     def create_repo(
@@ -2004,7 +2270,7 @@ class HfApi:
             # See https://github.com/huggingface/huggingface_hub/pull/733/files#r820604472
             json["lfsmultipartthresh"] = self._lfsmultipartthresh  # type: ignore
         headers = self._build_hf_headers(token=token, is_write_action=True)
-        r = requests.post(path, headers=headers, json=json)
+        r = get_session().post(path, headers=headers, json=json)
 
         try:
             hf_raise_for_status(r)
@@ -2061,7 +2327,7 @@ class HfApi:
             json["type"] = repo_type
 
         headers = self._build_hf_headers(token=token, is_write_action=True)
-        r = requests.delete(path, headers=headers, json=json)
+        r = get_session().delete(path, headers=headers, json=json)
         hf_raise_for_status(r)
 
     @validate_hf_hub_args
@@ -2116,7 +2382,7 @@ class HfApi:
         if repo_type is None:
             repo_type = REPO_TYPE_MODEL  # default repo type
 
-        r = requests.put(
+        r = get_session().put(
             url=f"{self.endpoint}/api/{repo_type}s/{namespace}/{name}/settings",
             headers=self._build_hf_headers(token=token, is_write_action=True),
             json={"private": private},
@@ -2182,7 +2448,7 @@ class HfApi:
 
         path = f"{self.endpoint}/api/repos/move"
         headers = self._build_hf_headers(token=token, is_write_action=True)
-        r = requests.post(path, headers=headers, json=json)
+        r = get_session().post(path, headers=headers, json=json)
         try:
             hf_raise_for_status(r)
         except HfHubHTTPError as e:
@@ -2204,8 +2470,10 @@ class HfApi:
         repo_type: Optional[str] = None,
         revision: Optional[str] = None,
         create_pr: Optional[bool] = None,
-        num_threads: int = 5,
+        num_threads: Union[int, AdaptiveConcurrency] = 5,
         parent_commit: Optional[str] = None,
+        num_threads_per_file: int = LFS_MULTIPART_NUM_THREADS,
+        num_hash_threads: Optional[int] = None,
     ) -> CommitInfo:
         """
         Creates a commit in the given repo, deleting & uploading files as needed.
@@ -2249,6 +2517,8 @@ class HfApi:
             num_threads (`int`, *optional*):
                 Number of concurrent threads for uploading files. Defaults to 5.
                 Setting it to 2 means at most 2 files will be uploaded concurrently.
+                If an [`AdaptiveConcurrency`] controller is passed, the number of
+                concurrent uploads is adjusted to the observed throughput instead.
 
             parent_commit (`str`, *optional*):
                 The OID / SHA of the parent commit, as a hexadecimal string.
@@ -2258,6 +2528,14 @@ class HfApi:
                 ensures the repo has not changed before committing the changes, and can be especially useful
                 if the repo is updated / committed to concurrently.
 
+            num_threads_per_file (`int`, *optional*):
+                Number of parts uploaded concurrently for a single large file (multipart
+                upload). Independent from `num_threads`. Defaults to 4.
+
+            num_hash_threads (`int`, *optional*):
+                Number of files hashed concurrently before uploading them. Defaults to the
+                number of CPUs, capped to 8.
+
         Returns:
             [`CommitInfo`]:
                 Instance of [`CommitInfo`] containing information about the newly
@@ -2330,7 +2608,8 @@ class HfApi:
         warn_on_overwriting_operations(operations)
 
         try:
-            upload_modes = fetch_upload_modes(
+            # Hash files, fetch their upload mode and upload LFS files as a pipeline
+            upload_modes = upload_additions(
                 additions=additions,
                 repo_type=repo_type,
                 repo_id=repo_id,
@@ -2338,24 +2617,16 @@ class HfApi:
                 revision=revision,
                 endpoint=self.endpoint,
                 create_pr=create_pr,
+                num_threads=num_threads,
+                num_threads_per_file=num_threads_per_file,
+                num_hash_threads=num_hash_threads,
             )
         except RepositoryNotFoundError as e:
             e.append_to_message(_CREATE_COMMIT_NO_REPO_ERROR_MESSAGE)
             raise
 
-        upload_lfs_files(
-            additions=[
-                addition
-                for addition in additions
-                if upload_modes[addition.path_in_repo] == "lfs"
-            ],
-            repo_type=repo_type,
-            repo_id=repo_id,
-            token=token or self.token,
-            endpoint=self.endpoint,
-            num_threads=num_threads,
-        )
-        commit_payload = prepare_commit_payload(
+        # Regular files are read and base64-encoded by chunks while the payload is sent
+        commit_payload = stream_commit_payload(
             operations=operations,
             upload_modes=upload_modes,
             commit_message=commit_message,
@@ -2364,11 +2635,6 @@ class HfApi:
         )
         commit_url = f"{self.endpoint}/api/{repo_type}s/{repo_id}/commit/{revision}"
 
-        def _payload_as_ndjson() -> Iterable[bytes]:
-            for item in commit_payload:
-                yield json.dumps(item).encode()
-                yield b"\n"
-
         headers = {
             # See https://github.com/huggingface/huggingface_hub/issues/1085#issuecomment-1265208073
             "Content-Type": "application/x-ndjson",
@@ -2376,10 +2642,10 @@ class HfApi:
         }
 
         try:
-            commit_resp = requests.post(
+            commit_resp = get_session().post(
                 url=commit_url,
                 headers=headers,
-                data=_payload_as_ndjson(),  # type: ignore
+                data=commit_payload,
                 params={"create_pr": "1"} if create_pr else None,
             )
             hf_raise_for_status(commit_resp, endpoint_name="commit")
@@ -2570,6 +2836,8 @@ class HfApi:
         parent_commit: Optional[str] = None,
         allow_patterns: Optional[Union[List[str], str]] = None,
         ignore_patterns: Optional[Union[List[str], str]] = None,
+        num_threads_per_file: int = LFS_MULTIPART_NUM_THREADS,
+        num_hash_threads: Optional[int] = None,
     ):
         """
         Upload a local folder to the given repo. The upload is done
@@ -2627,6 +2895,12 @@ class HfApi:
                 If provided, only files matching at least one pattern are uploaded.
             ignore_patterns (`List[str]` or `str`, *optional*):
                 If provided, files matching any of the patterns are not uploaded.
+            num_threads_per_file (`int`, *optional*):
+                Number of parts uploaded concurrently for a single large file (multipart
+                upload). Defaults to 4.
+            num_hash_threads (`int`, *optional*):
+                Number of files hashed concurrently before uploading them. Defaults to the
+                number of CPUs, capped to 8.
 
         Returns:
             `str`: A URL to visualize the uploaded folder on the hub
@@ -2706,6 +2980,8 @@ class HfApi:
             revision=revision,
             create_pr=create_pr,
             parent_commit=parent_commit,
+            num_threads_per_file=num_threads_per_file,
+            num_hash_threads=num_hash_threads,
         )
 
         if commit_info.pr_url is not None:
@@ -2934,7 +3210,7 @@ class HfApi:
             payload["startingPoint"] = revision
 
         # Create branch
-        response = requests.post(url=branch_url, headers=headers, json=payload)
+        response = get_session().post(url=branch_url, headers=headers, json=payload)
         try:
             hf_raise_for_status(response)
         except HfHubHTTPError as e:
@@ -2987,7 +3263,7 @@ class HfApi:
         headers = self._build_hf_headers(token=token, is_write_action=True)
 
         # Delete branch
-        response = requests.delete(url=branch_url, headers=headers)
+        response = get_session().delete(url=branch_url, headers=headers)
         hf_raise_for_status(response)
 
     @validate_hf_hub_args
@@ -3056,7 +3332,7 @@ class HfApi:
             payload["message"] = tag_message
 
         # Tag
-        response = requests.post(url=tag_url, headers=headers, json=payload)
+        response = get_session().post(url=tag_url, headers=headers, json=payload)
         try:
             hf_raise_for_status(response)
         except HfHubHTTPError as e:
@@ -3106,7 +3382,7 @@ class HfApi:
         headers = self._build_hf_headers(token=token, is_write_action=True)
 
         # Un-tag
-        response = requests.delete(url=tag_url, headers=headers)
+        response = get_session().delete(url=tag_url, headers=headers)
         hf_raise_for_status(response)
 
     @validate_hf_hub_args
@@ -3199,7 +3475,7 @@ class HfApi:
             path = (
                 f"{self.endpoint}/api/{repo_type}s/{repo_id}/discussions?p={page_index}"
             )
-            resp = requests.get(path, headers=headers)
+            resp = get_session().get(path, headers=headers)
             hf_raise_for_status(resp)
             paginated_discussions = resp.json()
             total = paginated_discussions["count"]
@@ -3213,16 +3489,7 @@ class HfApi:
         while has_next:
             discussions, has_next = _fetch_discussion_page(page_index=page_index)
             for discussion in discussions:
-                yield Discussion(
-                    title=discussion["title"],
-                    num=discussion["num"],
-                    author=discussion.get("author", {}).get("name", "deleted"),
-                    created_at=parse_datetime(discussion["createdAt"]),
-                    status=discussion["status"],
-                    repo_id=discussion["repo"]["name"],
-                    repo_type=discussion["repo"]["type"],
-                    is_pull_request=discussion["isPullRequest"],
-                )
+                yield _parse_discussion(discussion)
             page_index = page_index + 1
 
     @validate_hf_hub_args
@@ -3276,39 +3543,10 @@ class HfApi:
             f"{self.endpoint}/api/{repo_type}s/{repo_id}/discussions/{discussion_num}"
         )
         headers = self._build_hf_headers(token=token)
-        resp = requests.get(path, params={"diff": "1"}, headers=headers)
+        resp = get_session().get(path, params={"diff": "1"}, headers=headers)
         hf_raise_for_status(resp)
 
-        discussion_details = resp.json()
-        is_pull_request = discussion_details["isPullRequest"]
-
-        target_branch = (
-            discussion_details["changes"]["base"] if is_pull_request else None
-        )
-        conflicting_files = (
-            discussion_details["filesWithConflicts"] if is_pull_request else None
-        )
-        merge_commit_oid = (
-            discussion_details["changes"].get("mergeCommitId", None)
-            if is_pull_request
-            else None
-        )
-
-        return DiscussionWithDetails(
-            title=discussion_details["title"],
-            num=discussion_details["num"],
-            author=discussion_details.get("author", {}).get("name", "deleted"),
-            created_at=parse_datetime(discussion_details["createdAt"]),
-            status=discussion_details["status"],
-            repo_id=discussion_details["repo"]["name"],
-            repo_type=discussion_details["repo"]["type"],
-            is_pull_request=discussion_details["isPullRequest"],
-            events=[deserialize_event(evt) for evt in discussion_details["events"]],
-            conflicting_files=conflicting_files,
-            target_branch=target_branch,
-            merge_commit_oid=merge_commit_oid,
-            diff=discussion_details.get("diff"),
-        )
+        return _parse_discussion_details(resp.json())
 
     @validate_hf_hub_args
     def create_discussion(
@@ -3381,7 +3619,7 @@ class HfApi:
         )
 
         headers = self._build_hf_headers(token=token, is_write_action=True)
-        resp = requests.post(
+        resp = get_session().post(
             f"{self.endpoint}/api/{repo_type}s/{repo_id}/discussions",
             json={
                 "title": title.strip(),
@@ -3479,7 +3717,7 @@ class HfApi:
         path = f"{self.endpoint}/api/{repo_id}/discussions/{discussion_num}/{resource}"
 
         headers = self._build_hf_headers(token=token, is_write_action=True)
-        resp = requests.post(path, headers=headers, json=body)
+        resp = get_session().post(path, headers=headers, json=body)
         hf_raise_for_status(resp)
         return resp
 
@@ -3892,7 +4130,7 @@ class HfApi:
             token (`str`, *optional*):
                 Hugging Face token. Will default to the locally saved token if not provided.
         """
-        r = requests.post(
+        r = get_session().post(
             f"{self.endpoint}/api/spaces/{repo_id}/secrets",
             headers=self._build_hf_headers(token=token),
             json={"key": key, "value": value},
@@ -3916,7 +4154,7 @@ class HfApi:
             token (`str`, *optional*):
                 Hugging Face token. Will default to the locally saved token if not provided.
         """
-        r = requests.delete(
+        r = get_session().delete(
             f"{self.endpoint}/api/spaces/{repo_id}/secrets",
             headers=self._build_hf_headers(token=token),
             json={"key": key},
@@ -3939,7 +4177,7 @@ class HfApi:
             `SpaceRuntime`: dataclass containing runtime information about a Space
              including Space stage and hardware.
         """
-        r = requests.get(
+        r = get_session().get(
             f"{self.endpoint}/api/spaces/{repo_id}/runtime",
             headers=self._build_hf_headers(token=token),
         )
@@ -3973,7 +4211,7 @@ class HfApi:
 
         </Tip>
         """
-        r = requests.post(
+        r = get_session().post(
             f"{self.endpoint}/api/spaces/{repo_id}/hardware",
             headers=self._build_hf_headers(token=token),
             json={"flavor": hardware},
@@ -4019,27 +4257,106 @@ def _prepare_upload_folder_commit(
     if not os.path.isdir(folder_path):
         raise ValueError(f"Provided path: '{folder_path}' is not a directory")
 
-    files_to_add: List[CommitOperationAdd] = []
+    # Paths are filtered before creating the operations: ignored files are never read
+    paths_to_add: List[Tuple[str, str]] = []  # (local path, path in repo)
     for dirpath, _, filenames in os.walk(folder_path):
         for filename in filenames:
             abs_path = os.path.join(dirpath, filename)
             rel_path = os.path.relpath(abs_path, folder_path)
-            files_to_add.append(
-                CommitOperationAdd(
-                    path_or_fileobj=abs_path,
-                    path_in_repo=os.path.normpath(
-                        os.path.join(path_in_repo, rel_path)
-                    ).replace(os.sep, "/"),
+            paths_to_add.append(
+                (
+                    abs_path,
+                    os.path.normpath(os.path.join(path_in_repo, rel_path)).replace(
+                        os.sep, "/"
+                    ),
                 )
             )
 
-    return list(
-        filter_repo_objects(
-            files_to_add,
+    return [
+        CommitOperationAdd(path_or_fileobj=local_path, path_in_repo=repo_path)
+        for local_path, repo_path in filter_repo_objects(
+            paths_to_add,
             allow_patterns=allow_patterns,
             ignore_patterns=ignore_patterns,
-            key=lambda x: x.path_in_repo,
+            key=lambda x: x[1],
         )
+    ]
+
+
+def _fetch_byte_range(url: str, headers: Dict[str, str], start: int, end: int) -> bytes:
+    """Fetch bytes `start` to `end` (excluded) of a file, or less if the file is smaller.
+
+    If the server doesn't support range requests, only the beginning of the file is
+    streamed until `end`.
+    """
+    response = _request_wrapper(
+        method="GET",
+        url=url,
+        headers={**headers, "Range": f"bytes={start}-{end - 1}"},
+        stream=True,
+    )
+    with response:
+        hf_raise_for_status(response)
+        skip = start if response.status_code != 206 else 0
+        content = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            content += chunk
+            if len(content) >= skip + end - start:
+                break
+    return bytes(content[skip : skip + end - start])
+
+
+def _parse_git_refs(data: Dict) -> GitRefs:
+    """Parse the response of the `/refs` endpoint."""
+    return GitRefs(
+        branches=[GitRefInfo(item) for item in data["branches"]],
+        converts=[GitRefInfo(item) for item in data["converts"]],
+        tags=[GitRefInfo(item) for item in data["tags"]],
+    )
+
+
+def _parse_discussion(discussion: Dict) -> Discussion:
+    """Parse a discussion from the response of the `/discussions` endpoint."""
+    return Discussion(
+        title=discussion["title"],
+        num=discussion["num"],
+        author=discussion.get("author", {}).get("name", "deleted"),
+        created_at=parse_datetime(discussion["createdAt"]),
+        status=discussion["status"],
+        repo_id=discussion["repo"]["name"],
+        repo_type=discussion["repo"]["type"],
+        is_pull_request=discussion["isPullRequest"],
+    )
+
+
+def _parse_discussion_details(discussion_details: Dict) -> DiscussionWithDetails:
+    """Parse the response of the `/discussions/{num}` endpoint."""
+    is_pull_request = discussion_details["isPullRequest"]
+
+    target_branch = discussion_details["changes"]["base"] if is_pull_request else None
+    conflicting_files = (
+        discussion_details["filesWithConflicts"] if is_pull_request else None
+    )
+    merge_commit_oid = (
+        discussion_details["changes"].get("mergeCommitId", None)
+        if is_pull_request
+        else None
+    )
+
+    return DiscussionWithDetails(
+        title=discussion_details["title"],
+        num=discussion_details["num"],
+        author=discussion_details.get("author", {}).get("name", "deleted"),
+        created_at=parse_datetime(discussion_details["createdAt"]),
+        status=discussion_details["status"],
+        repo_id=discussion_details["repo"]["name"],
+        repo_type=discussion_details["repo"]["type"],
+        is_pull_request=discussion_details["isPullRequest"],
+        events=[deserialize_event(evt) for evt in discussion_details["events"]],
+        conflicting_files=conflicting_files,
+        target_branch=target_branch,
+        merge_commit_oid=merge_commit_oid,
+        diff=discussion_details.get("diff"),
     )
 
 
@@ -4080,6 +4397,8 @@ space_info = api.space_info
 repo_info = api.repo_info
 list_repo_files = api.list_repo_files
 list_repo_refs = api.list_repo_refs
+get_safetensors_metadata = api.get_safetensors_metadata
+parse_safetensors_file_metadata = api.parse_safetensors_file_metadata
 
 list_metrics = api.list_metrics
 
@@ -1,10 +1,14 @@
 import io
 from typing import Any, Dict, List, Optional, Union
 
-import requests
-
 from .hf_api import HfApi
-from .utils import build_hf_headers, is_pillow_available, logging, validate_hf_hub_args
+from .utils import (
+    build_hf_headers,
+    get_session,
+    is_pillow_available,
+    logging,
+    validate_hf_hub_args,
+)
 
 
 logger = logging.get_logger(__name__)
@@ -183,7 +187,7 @@ class InferenceApi:
             payload["parameters"] = params
 
         # Make API call
-        response = requests.post(
+        response = get_session().post(
             self.api_url, headers=self.headers, json=payload, data=data
         )
 
@@ -14,32 +14,51 @@
 # limitations under the License.
 """Git LFS related type definitions and utilities"""
 import io
+import json
 import os
 import re
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from contextlib import AbstractContextManager
 from dataclasses import dataclass
 from math import ceil
-from os.path import getsize
-from typing import BinaryIO, Iterable, List, Optional, Tuple
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 
-import requests
 from huggingface_hub.constants import ENDPOINT, REPO_TYPES_URL_PREFIXES
 from requests.auth import HTTPBasicAuth
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
 
 from .utils import (
+    cached_assets_path,
+    get_session,
     get_token_to_send,
     hf_raise_for_status,
     http_backoff,
+    logging,
     validate_hf_hub_args,
 )
+from .utils._hash_cache import cache_file_hash, get_cached_file_hash
 from .utils._typing import TypedDict
 from .utils.sha import sha256, sha_fileobj
 
 
+logger = logging.get_logger(__name__)
+
 OID_REGEX = re.compile(r"^[0-9a-f]{40}$")
 
 LFS_MULTIPART_UPLOAD_COMMAND = "lfs-multipart-upload"
 
+# Default number of parts of a single file uploaded concurrently in a multipart upload.
+LFS_MULTIPART_NUM_THREADS = 4
+
+# Parts are uploaded directly to the storage backend (S3). Transient errors on a part are
+# retried without restarting the whole file.
+_PART_UPLOAD_RETRY_ON_EXCEPTIONS = (RequestsConnectionError, Timeout)
+_PART_UPLOAD_RETRY_ON_STATUS_CODES = (500, 502, 503, 504)
+
 LFS_HEADERS = {
     "Accept": "application/vnd.git-lfs+json",
     "Content-Type": "application/vnd.git-lfs+json",
@@ -67,11 +86,19 @@ class UploadInfo:
 
     @classmethod
     def from_path(cls, path: str):
-        size = getsize(path)
+        # Files that have not changed since they were last hashed are not read again
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        cached = get_cached_file_hash(path, stat)
+        if cached is not None:
+            sha, sample = cached
+            return cls(size=stat.st_size, sha256=sha, sample=sample)
+
         with io.open(path, "rb") as file:
             sample = file.peek(512)[:512]
             sha = sha_fileobj(file)
-        return cls(size=size, sha256=sha, sample=sample)
+        cache_file_hash(path, stat, sha, sample)
+        return cls(size=stat.st_size, sha256=sha, sample=sample)
 
     @classmethod
     def from_bytes(cls, data: bytes):
@@ -175,7 +202,7 @@ def post_lfs_batch_info(
     if repo_type in REPO_TYPES_URL_PREFIXES:
         url_prefix = REPO_TYPES_URL_PREFIXES[repo_type]
     batch_url = f"{endpoint}/{url_prefix}{repo_id}.git/info/lfs/objects/batch"
-    resp = requests.post(
+    resp = get_session().post(
         batch_url,
         headers={
             "Accept": "application/vnd.git-lfs+json",
@@ -217,6 +244,7 @@ def lfs_upload(
     upload_action: dict,
     verify_action: Optional[dict],
     token: Optional[str],
+    num_threads: int = LFS_MULTIPART_NUM_THREADS,
 ):
     """
     Uploads a file using the git lfs protocol and determines automatically whether or not
@@ -237,6 +265,9 @@ def lfs_upload(
         token (`str`, *optional*):
             A [user access token](https://hf.co/settings/tokens) to authenticate requests
             against the Hub.
+        num_threads (`int`, *optional*, defaults to `4`):
+            Maximum number of parts uploaded concurrently in case of a multi-part upload.
+            Ignored for single-part uploads.
 
     Returns:
         `requests.Response`:
@@ -268,6 +299,7 @@ def lfs_upload(
             chunk_size=chunk_size,
             header=header,
             upload_info=upload_info,
+            num_threads=num_threads,
         )
     else:
         _upload_single_part(
@@ -275,7 +307,7 @@ def lfs_upload(
             fileobj=fileobj,
         )
     if verify_action is not None:
-        verify_resp = requests.post(
+        verify_resp = get_session().post(
             verify_action["href"],
             auth=HTTPBasicAuth(
                 username="USER",
@@ -318,16 +350,133 @@ class CompletionPayloadT(TypedDict):
     parts: List[PayloadPartT]
 
 
+class _MultipartUploadJournal:
+    """
+    Local journal of the parts already accepted by the server during a multipart upload.
+
+    Each time a part is uploaded, its etag is saved to a small JSON file in the assets
+    cache (one file per LFS oid). If the upload is interrupted (process killed,
+    preempted node,...), a rerun reuses the etags of the parts already uploaded and only
+    sends the missing ones before calling the completion URL.
+
+    Etags are only valid within a given multipart upload on the storage backend. The
+    journal is therefore bound to an `upload_id` (extracted from the part URLs) and to
+    the `chunk_size`. If the server starts a new multipart upload, the journal is reset.
+
+    Errors while reading or writing the journal are logged but never raised: the journal
+    is an optimization and must not make an upload fail.
+
+    Args:
+        oid (`str`):
+            The sha256 of the file being uploaded.
+        upload_id (`str`):
+            Identifier of the multipart upload on the storage backend.
+        chunk_size (`int`):
+            Size of the parts.
+        journal_dir (`str`, `Path`, *optional*):
+            Folder in which the journal is stored. Defaults to the assets cache.
+    """
+
+    def __init__(
+        self,
+        oid: str,
+        upload_id: str,
+        chunk_size: int,
+        journal_dir: Optional[Path] = None,
+    ) -> None:
+        if journal_dir is None:
+            journal_dir = cached_assets_path(
+                library_name="huggingface_hub",
+                namespace="lfs",
+                subfolder="multipart_uploads",
+            )
+        self.path = Path(journal_dir) / f"{oid}.json"
+        self.upload_id = upload_id
+        self.chunk_size = chunk_size
+        self.etags: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+        try:
+            content = json.loads(self.path.read_text())
+            if (
+                content.get("upload_id") == upload_id
+                and content.get("chunk_size") == chunk_size
+            ):
+                self.etags = {
+                    int(part_number): etag
+                    for part_number, etag in content.get("etags", {}).items()
+                }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read multipart upload journal {self.path}: {e}")
+
+    @staticmethod
+    def upload_id_from_urls(completion_url: str, part_upload_urls: List[str]) -> str:
+        """Return the id of the multipart upload the part URLs belong to.
+
+        Presigned S3 URLs contain an `uploadId` query parameter. If not found, the
+        completion URL (without query) is used as a fallback identifier.
+        """
+        for url in part_upload_urls:
+            upload_ids = parse_qs(urlparse(url).query).get("uploadId")
+            if upload_ids:
+                return upload_ids[0]
+        return urlparse(completion_url)._replace(query="").geturl()
+
+    def record(self, part_number: int, etag: str) -> None:
+        """Save the etag of an uploaded part. Thread-safe."""
+        with self._lock:
+            self.etags[part_number] = etag
+            content = {
+                "upload_id": self.upload_id,
+                "chunk_size": self.chunk_size,
+                "etags": {str(number): tag for number, tag in self.etags.items()},
+            }
+            tmp_path = self.path.with_suffix(".json.tmp")
+            try:
+                tmp_path.write_text(json.dumps(content))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(
+                    f"Could not write multipart upload journal {self.path}: {e}"
+                )
+
+    def delete(self) -> None:
+        """Delete the journal once the upload is completed."""
+        with self._lock:
+            self.etags = {}
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(
+                    f"Could not delete multipart upload journal {self.path}: {e}"
+                )
+
+
 def _upload_multi_part(
     completion_url: str,
     fileobj: BinaryIO,
     header: dict,
     chunk_size: int,
     upload_info: UploadInfo,
+    num_threads: int = LFS_MULTIPART_NUM_THREADS,
 ):
     """
     Uploads `fileobj` using HF multipart LFS transfer protocol.
 
+    Parts are uploaded concurrently using up to `num_threads` threads. Each part is read
+    from `fileobj` (under a lock, `fileobj` being shared) and uploaded with its own retry
+    mechanism: a failing part is retried without re-uploading the other ones. Memory
+    usage is bounded by `num_threads * chunk_size`. If a part fails for good, the parts
+    not started yet are not uploaded.
+
+    Etags of the uploaded parts are saved in a local journal (see
+    `_MultipartUploadJournal`). If a previous attempt to upload the same file was
+    interrupted, parts already accepted by the server are not uploaded again.
+
     Args:
         completion_url (`str`):
             The URL to GET after completing all parts uploads.
@@ -341,6 +490,8 @@ def _upload_multi_part(
             of `chunk_size` bytes (except for the last part who can be smaller)
         upload_info (`UploadInfo`):
             `UploadInfo` for `fileobj`.
+        num_threads (`int`, *optional*, defaults to `4`):
+            Maximum number of parts uploaded concurrently.
 
     Returns: `requests.Response`: The response from requesting `completion_url`.
 
@@ -364,39 +515,89 @@ def _upload_multi_part(
     if num_parts != ceil(upload_info.size / chunk_size):
         raise ValueError("Invalid server response to upload large LFS file")
 
+    oid = upload_info.sha256.hex()
+    journal = _MultipartUploadJournal(
+        oid=oid,
+        upload_id=_MultipartUploadJournal.upload_id_from_urls(
+            completion_url, sorted_part_upload_urls
+        ),
+        chunk_size=chunk_size,
+    )
+    etags: List[Optional[str]] = [
+        journal.etags.get(part_idx + 1) for part_idx in range(num_parts)
+    ]
+    missing_parts = [idx for idx, etag in enumerate(etags) if etag is None]
+    if len(missing_parts) < num_parts:
+        logger.info(
+            f"Resuming multipart upload of {oid}:"
+            f" {num_parts - len(missing_parts)}/{num_parts} parts already uploaded."
+        )
+
+    fileobj_lock = threading.Lock()
+    initial_position = fileobj.tell()
+
+    def _upload_part(part_idx: int) -> str:
+        # `fileobj` is shared between threads: read the part in memory before uploading
+        with fileobj_lock:
+            with SliceFileObj(
+                fileobj,
+                seek_from=chunk_size * part_idx,
+                read_limit=chunk_size,
+            ) as fileobj_slice:
+                data = fileobj_slice.read()
+
+        part_upload_res = http_backoff(
+            "PUT",
+            sorted_part_upload_urls[part_idx],
+            data=data,
+            retry_on_exceptions=_PART_UPLOAD_RETRY_ON_EXCEPTIONS,
+            retry_on_status_codes=_PART_UPLOAD_RETRY_ON_STATUS_CODES,
+        )
+        hf_raise_for_status(part_upload_res)
+        etag = part_upload_res.headers.get("etag")
+        if etag is None or etag == "":
+            raise ValueError(
+                f"Invalid etag (`{etag}`) returned for part {part_idx +1} of"
+                f" {num_parts}"
+            )
+        journal.record(part_idx + 1, etag)
+        return etag
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, num_threads)) as executor:
+            futures = {
+                executor.submit(_upload_part, part_idx): part_idx
+                for part_idx in missing_parts
+            }
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            # On failure, parts not started yet are not uploaded
+            for future in not_done:
+                future.cancel()
+        for future in done:
+            future.result()  # raise the first error, if any
+        for future, part_idx in futures.items():
+            etags[part_idx] = future.result()
+    finally:
+        fileobj.seek(initial_position, io.SEEK_SET)
+
     completion_payload: CompletionPayloadT = {
-        "oid": upload_info.sha256.hex(),
+        "oid": oid,
         "parts": [
             {
                 "partNumber": idx + 1,
-                "etag": "",
+                "etag": etag,  # type: ignore # all etags are set at this point
             }
-            for idx in range(num_parts)
+            for idx, etag in enumerate(etags)
         ],
     }
 
-    for part_idx, part_upload_url in enumerate(sorted_part_upload_urls):
-        with SliceFileObj(
-            fileobj,
-            seek_from=chunk_size * part_idx,
-            read_limit=chunk_size,
-        ) as fileobj_slice:
-            part_upload_res = http_backoff("PUT", part_upload_url, data=fileobj_slice)
-            hf_raise_for_status(part_upload_res)
-            etag = part_upload_res.headers.get("etag")
-            if etag is None or etag == "":
-                raise ValueError(
-                    f"Invalid etag (`{etag}`) returned for part {part_idx +1} of"
-                    f" {num_parts}"
-                )
-            completion_payload["parts"][part_idx]["etag"] = etag
-
-    completion_res = requests.post(
+    completion_res = get_session().post(
         completion_url,
         json=completion_payload,
         headers=LFS_HEADERS,
     )
     hf_raise_for_status(completion_res)
+    journal.delete()
     return completion_res
 
 
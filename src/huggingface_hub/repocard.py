@@ -18,7 +18,12 @@ from huggingface_hub.repocard_data import (
 from huggingface_hub.utils import is_jinja_available, yaml_dump
 
 from .constants import REPOCARD_NAME
-from .utils import EntryNotFoundError, SoftTemporaryDirectory, validate_hf_hub_args
+from .utils import (
+    EntryNotFoundError,
+    SoftTemporaryDirectory,
+    get_session,
+    validate_hf_hub_args,
+)
 from .utils._typing import Literal
 from .utils.logging import get_logger
 
@@ -215,7 +220,7 @@ class RepoCard:
         headers = {"Accept": "text/plain"}
 
         try:
-            r = requests.post(
+            r = get_session().post(
                 "https://huggingface.co/api/validate-yaml", body, headers=headers
             )
             r.raise_for_status()
@@ -28,6 +28,7 @@ from ._cache_manager import (
     scan_cache_dir,
 )
 from ._chunk_utils import chunk_iterable
+from ._concurrency import AdaptiveConcurrency
 from ._datetime import parse_datetime
 from ._errors import (
     BadRequestError,
@@ -37,6 +38,7 @@ from ._errors import (
     LocalEntryNotFoundError,
     RepositoryNotFoundError,
     RevisionNotFoundError,
+    ahf_raise_for_status,
     hf_raise_for_status,
 )
 from ._fixes import SoftTemporaryDirectory, yaml_dump
@@ -50,10 +52,11 @@ from ._git_credential import (
 )
 from ._headers import build_hf_headers, get_token_to_send
 from ._hf_folder import HfFolder
-from ._http import http_backoff
+from ._http import configure_http_backend, get_session, http_backoff
 from ._paths import filter_repo_objects
 from ._runtime import (
     dump_environment_info,
+    get_aiohttp_version,
     get_fastai_version,
     get_fastcore_version,
     get_graphviz_version,
@@ -65,6 +68,7 @@ from ._runtime import (
     get_python_version,
     get_tf_version,
     get_torch_version,
+    is_aiohttp_available,
     is_fastai_available,
     is_fastcore_available,
     is_google_colab,
@@ -77,6 +81,12 @@ from ._runtime import (
     is_tf_available,
     is_torch_available,
 )
+from ._safetensors import (
+    SafetensorsFileMetadata,
+    SafetensorsParsingError,
+    SafetensorsRepoMetadata,
+    TensorInfo,
+)
 from ._subprocess import run_interactive_subprocess, run_subprocess
 from ._validators import (
     HFValidationError,
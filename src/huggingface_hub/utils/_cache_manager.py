@@ -19,9 +19,9 @@ import time
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, FrozenSet, List, Optional, Set, Union
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
-from ..constants import HUGGINGFACE_HUB_CACHE
+from ..constants import HUGGINGFACE_HUB_CACHE, SHARED_BLOBS_FOLDER_NAME
 from . import logging
 from ._typing import Literal
 
@@ -370,8 +370,9 @@ class HFCacheInfo:
 
     <Tip warning={true}>
 
-    Here `size_on_disk` is equal to the sum of all repo sizes (only blobs). However if
-    some cached repos are corrupted, their sizes are not taken into account.
+    Here `size_on_disk` is equal to the sum of all repo sizes (only blobs). Blobs shared
+    by several repos (see `HF_HUB_ENABLE_SHARED_BLOBS`) are counted once. However if some
+    cached repos are corrupted, their sizes are not taken into account.
 
     </Tip>
     """
@@ -452,18 +453,53 @@ class HFCacheInfo:
         delete_strategy_snapshots: Set[Path] = set()
         delete_strategy_expected_freed_size = 0
 
+        # Blob files still linked once the strategy is executed, from any repo. Blobs
+        # outside of a repo folder are shared by several repos (see
+        # `HF_HUB_ENABLE_SHARED_BLOBS`) and must be kept until no repo uses them.
+        remaining_blobs: Set[Path] = {
+            file.blob_path
+            for repo in self.repos
+            for revision in repo.revisions
+            if revision not in repos_with_revisions.get(repo, set())
+            for file in revision.files
+        }
+
         for affected_repo, revisions_to_delete in repos_with_revisions.items():
             other_revisions = affected_repo.revisions - revisions_to_delete
+            repo_blobs_path = affected_repo.repo_path / "blobs"
 
             # If no other revisions, it means all revisions are deleted
             # -> delete the entire cached repo
             if len(other_revisions) == 0:
                 delete_strategy_repos.add(affected_repo.repo_path)
                 delete_strategy_expected_freed_size += affected_repo.size_on_disk
+
+                # Shared blobs are not deleted with the repo folder
+                repo_files = {
+                    file.blob_path: file
+                    for revision in revisions_to_delete
+                    for file in revision.files
+                }
+                for blob_path, file in repo_files.items():
+                    if blob_path.parent == repo_blobs_path:
+                        continue
+                    if (
+                        blob_path in remaining_blobs
+                        or blob_path in delete_strategy_blobs
+                    ):
+                        # Still used or already counted with another repo
+                        delete_strategy_expected_freed_size -= file.size_on_disk
+                    else:
+                        delete_strategy_blobs.add(blob_path)
                 continue
 
             # Some revisions of the repo will be deleted but not all. We need to filter
             # which blob files will not be linked anymore.
+            repo_remaining_blobs = {
+                file.blob_path
+                for revision in other_revisions
+                for file in revision.files
+            }
             for revision_to_delete in revisions_to_delete:
                 # Snapshot dir
                 delete_strategy_snapshots.add(revision_to_delete.snapshot_path)
@@ -474,20 +510,20 @@ class HFCacheInfo:
 
                 # Blobs dir
                 for file in revision_to_delete.files:
-                    if file.blob_path not in delete_strategy_blobs:
-                        is_file_alone = True
-                        for revision in other_revisions:
-                            for rev_file in revision.files:
-                                if file.blob_path == rev_file.blob_path:
-                                    is_file_alone = False
-                                    break
-                            if not is_file_alone:
-                                break
-
-                        # Blob file not referenced by remaining revisions -> delete
-                        if is_file_alone:
-                            delete_strategy_blobs.add(file.blob_path)
-                            delete_strategy_expected_freed_size += file.size_on_disk
+                    if file.blob_path in repo_remaining_blobs:
+                        continue
+
+                    # Symlink from the repo `blobs/` folder to a shared blob
+                    if file.blob_path.parent != repo_blobs_path:
+                        delete_strategy_blobs.add(repo_blobs_path / file.blob_path.name)
+
+                    # Blob file not referenced by remaining revisions -> delete
+                    if (
+                        file.blob_path not in remaining_blobs
+                        and file.blob_path not in delete_strategy_blobs
+                    ):
+                        delete_strategy_blobs.add(file.blob_path)
+                        delete_strategy_expected_freed_size += file.size_on_disk
 
         # Return the strategy instead of executing it.
         return DeleteCacheStrategy(
@@ -606,14 +642,23 @@ def scan_cache_dir(cache_dir: Optional[Union[str, Path]] = None) -> HFCacheInfo:
     repos: Set[CachedRepoInfo] = set()
     warnings: List[CorruptedCacheException] = []
     for repo_path in cache_dir.iterdir():
+        if repo_path.name == SHARED_BLOBS_FOLDER_NAME and repo_path.is_dir():
+            continue  # Blobs shared across repos (see `HF_HUB_ENABLE_SHARED_BLOBS`)
         try:
             repos.add(_scan_cached_repo(repo_path))
         except CorruptedCacheException as e:
             warnings.append(e)
 
+    # Blobs shared by several repos are counted once
+    blob_sizes = {
+        file.blob_path: file.size_on_disk
+        for repo in repos
+        for revision in repo.revisions
+        for file in revision.files
+    }
     return HFCacheInfo(
         repos=frozenset(repos),
-        size_on_disk=sum(repo.size_on_disk for repo in repos),
+        size_on_disk=sum(blob_sizes.values()),
         warnings=warnings,
     )
 
@@ -680,6 +725,7 @@ def _scan_cached_repo(repo_path: Path) -> CachedRepoInfo:
 
     # Scan snapshots directory
     cached_revisions: Set[CachedRevisionInfo] = set()
+    blobs_by_inode: Optional[Dict[Tuple[int, int], Path]] = None  # lazily built
     for revision_path in snapshots_path.iterdir():
         if revision_path.is_file():
             raise CorruptedCacheException(
@@ -698,6 +744,17 @@ def _scan_cached_repo(repo_path: Path) -> CachedRepoInfo:
                     f"Blob missing (broken symlink): {blob_path}"
                 )
 
+            if not file_path.is_symlink():
+                # Without symlinks, file can be a hardlink to a file of the `blobs`
+                # folder (see `_create_relative_symlink`) => count it once.
+                file_stat = file_path.stat()
+                if file_stat.st_nlink > 1:
+                    if blobs_by_inode is None:
+                        blobs_by_inode = _index_blobs_by_inode(repo_path / "blobs")
+                    blob_path = blobs_by_inode.get(
+                        (file_stat.st_dev, file_stat.st_ino), blob_path
+                    )
+
             if blob_path not in blob_stats:
                 blob_stats[blob_path] = blob_path.stat()
 
@@ -765,6 +822,18 @@ def _scan_cached_repo(repo_path: Path) -> CachedRepoInfo:
     )
 
 
+def _index_blobs_by_inode(blobs_path: Path) -> Dict[Tuple[int, int], Path]:
+    """Map `(device, inode)` of the files in a `blobs` folder to their path."""
+    blobs_by_inode: Dict[Tuple[int, int], Path] = {}
+    if blobs_path.is_dir():
+        for blob_path in blobs_path.iterdir():
+            if blob_path.is_symlink() or not blob_path.is_file():
+                continue
+            blob_stat = blob_path.stat()
+            blobs_by_inode[(blob_stat.st_dev, blob_stat.st_ino)] = blob_path.resolve()
+    return blobs_by_inode
+
+
 def _format_size(num: int) -> str:
     """Format size in bytes into a human-readable string.
 
@@ -818,7 +887,7 @@ def _try_delete_path(path: Path, path_type: str) -> None:
     """
     logger.info(f"Delete {path_type}: {path}")
     try:
-        if path.is_file():
+        if path.is_file() or path.is_symlink():
             os.remove(path)
         else:
             shutil.rmtree(path)
@@ -0,0 +1,336 @@
+# coding=utf-8
+# Copyright 2023-present, the HuggingFace Inc. team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Contains an adaptive concurrency controller for downloads and uploads."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Sequence, TypeVar
+
+import requests
+
+from . import logging
+from .tqdm import tqdm as hf_tqdm
+
+
+logger = logging.get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# HTTP status codes sent by the Hub (or the CDN) when it is overloaded.
+_CONGESTION_STATUS_CODES = (429, 503)
+
+# Throughput must improve by at least 5% for concurrency to keep increasing.
+_INCREASE_THRESHOLD = 0.05
+
+# Concurrency is decreased if the speed of each stream drops by more than 20% without
+# any gain in aggregate throughput.
+_SLOWDOWN_THRESHOLD = 0.2
+
+# Number of times a task failing because of congestion is retried.
+_MAX_CONGESTION_RETRIES = 3
+
+# Delay before retrying a task failing because of congestion (doubled at each retry).
+_CONGESTION_RETRY_DELAY = 1.0
+
+# Interval between two attempts to acquire a slot from an event loop.
+_ASYNC_POLL_INTERVAL = 0.01
+
+
+def is_congestion_error(error: BaseException) -> bool:
+    """Return `True` if `error` means that the server or the network is overloaded.
+
+    Timeouts, connections reset by the server and HTTP 429/503 responses are considered
+    as congestion, including when they are the cause of another error. Other connection
+    errors (e.g. name resolution failure, connection refused or offline mode) are not:
+    retrying them would only delay the error.
+    """
+    to_check: List[BaseException] = [error]
+    seen = set()
+    while len(to_check) > 0:
+        current = to_check.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(
+            current, (requests.Timeout, asyncio.TimeoutError, ConnectionResetError)
+        ):
+            return True
+        response = getattr(current, "response", None)
+        if getattr(response, "status_code", None) in _CONGESTION_STATUS_CODES:
+            return True
+        # `requests` and `urllib3` wrap the underlying error in `args` or `reason`
+        # instead of chaining it.
+        for wrapped in (
+            current.__cause__,
+            current.__context__,
+            getattr(current, "reason", None),
+            *current.args,
+        ):
+            if isinstance(wrapped, BaseException):
+                to_check.append(wrapped)
+    return False
+
+
+class AdaptiveConcurrency:
+    """
+    Controller adjusting the number of concurrent transfers to the observed throughput.
+
+    Can be passed to [`snapshot_download`] (`max_workers`) and [`HfApi.create_commit`]
+    (`num_threads`) in place of a fixed number of workers. Concurrency follows the
+    AIMD ("additive increase, multiplicative decrease") scheme of TCP:
+
+    - transfers are measured over time windows. If the aggregate throughput of a window
+      improves over the previous one, concurrency is increased by 1.
+    - if the speed of each transfer drops while the aggregate throughput does not
+      improve, the link is saturated and concurrency is decreased by 1.
+    - on congestion (HTTP 429/503, timeouts or connection resets), concurrency is
+      halved. The failed transfer is retried once a slot is available.
+
+    Args:
+        initial (`int`, *optional*, defaults to 4):
+            Number of concurrent transfers to start with.
+        min_concurrency (`int`, *optional*, defaults to 1):
+            Concurrency never goes below this value.
+        max_concurrency (`int`, *optional*, defaults to 32):
+            Concurrency never goes above this value. This is also the number of threads
+            started to run the transfers.
+        window (`float`, *optional*, defaults to 2.0):
+            Duration in seconds of a measurement window. At most one decrease happens per
+            window.
+
+    Example:
+    ```py
+    >>> from huggingface_hub import AdaptiveConcurrency, snapshot_download
+    >>> snapshot_download("bigscience/bloom-560m", max_workers=AdaptiveConcurrency(max_concurrency=64))
+    ```
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+        window: float = 2.0,
+    ) -> None:
+        if not 1 <= min_concurrency <= initial <= max_concurrency:
+            raise ValueError(
+                "Concurrency must satisfy 1 <= min_concurrency <= initial <="
+                f" max_concurrency. Got min_concurrency={min_concurrency},"
+                f" initial={initial} and max_concurrency={max_concurrency}."
+            )
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.window = window
+
+        self._limit = initial
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+        # Measurements of the current window
+        self._window_start = time.monotonic()
+        self._window_units = 0.0
+        self._window_busy_time = 0.0
+        self._last_decrease = float("-inf")
+
+        # Measurements of the previous window
+        self._previous_throughput: Optional[float] = None
+        self._previous_stream_speed: Optional[float] = None
+
+    @property
+    def limit(self) -> int:
+        """Current number of transfers allowed to run concurrently."""
+        return self._limit
+
+    def acquire(self) -> None:
+        """Block until a transfer can start."""
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Start a transfer if possible, without blocking. Returns `True` on success."""
+        with self._condition:
+            if self._in_flight >= self._limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    async def acquire_async(self) -> None:
+        """Wait until a transfer can start, without blocking the event loop."""
+        while not self.try_acquire():
+            await asyncio.sleep(_ASYNC_POLL_INTERVAL)
+
+    def release(self) -> None:
+        """Release the slot of a finished transfer (successful or not)."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record_success(self, units: float, duration: float) -> None:
+        """Record a successful transfer.
+
+        Args:
+            units (`float`):
+                Amount of data transferred, usually in bytes.
+            duration (`float`):
+                Duration of the transfer in seconds.
+        """
+        with self._condition:
+            self._window_units += units
+            self._window_busy_time += duration
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._end_window(now)
+
+    def record_congestion(self) -> None:
+        """Record a congestion signal. Halves concurrency (at most once per window)."""
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease < self.window:
+                # Concurrent transfers failing because of the same congestion event
+                return
+            self._set_limit(self._limit // 2, reason="congestion")
+            self._last_decrease = now
+            self._reset_window(now)
+            # Throughput measured before congestion is not relevant anymore
+            self._previous_throughput = None
+            self._previous_stream_speed = None
+
+    def run(self, fn: Callable[[T], R], item: T, *, size: float = 1) -> R:
+        """Apply `fn` to a single item once a slot is available, in the current thread.
+
+        The transfer is measured to adjust concurrency. It is retried if it fails
+        because of congestion.
+
+        Args:
+            fn (`Callable`):
+                Function transferring a single item.
+            item (`Any`):
+                Item to transfer.
+            size (`float`, *optional*, defaults to 1):
+                Size of the item, usually in bytes.
+
+        Returns:
+            The result of `fn(item)`.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            start = time.monotonic()
+            try:
+                result = fn(item)
+            except Exception as error:
+                if attempt >= _MAX_CONGESTION_RETRIES or not is_congestion_error(error):
+                    raise
+                self.record_congestion()
+                logger.info(f"Congestion detected ({error}). Retrying.")
+            else:
+                self.record_success(size, time.monotonic() - start)
+                return result
+            finally:
+                self.release()
+            time.sleep(_CONGESTION_RETRY_DELAY * 2**attempt)
+            attempt += 1
+
+    def map(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        *,
+        sizes: Optional[Sequence[float]] = None,
+        desc: Optional[str] = None,
+        tqdm_class: Optional[Any] = None,
+    ) -> List[R]:
+        """Apply `fn` to each item in a thread pool, with adaptive concurrency.
+
+        Args:
+            fn (`Callable`):
+                Function transferring a single item.
+            items (`Iterable`):
+                Items to transfer.
+            sizes (`Sequence[float]`, *optional*):
+                Size of each item, usually in bytes. If not provided, throughput is
+                measured in items per second.
+            desc (`str`, *optional*):
+                Description of the progress bar.
+            tqdm_class (`tqdm`, *optional*):
+                Progress bar class. Defaults to the custom HF progress bar.
+
+        Returns:
+            `List`: the results of `fn`, in the same order as `items`.
+
+        Raises the first error encountered. Pending items are not transferred.
+        """
+        items_list = list(items)
+
+        def _run(index: int) -> R:
+            return self.run(
+                fn, items_list[index], size=sizes[index] if sizes is not None else 1
+            )
+
+        progress_class: Any = tqdm_class or hf_tqdm
+        with progress_class(total=len(items_list), desc=desc) as progress:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                futures = [
+                    executor.submit(_run, index) for index in range(len(items_list))
+                ]
+                results = []
+                try:
+                    for future in futures:
+                        results.append(future.result())
+                        progress.update(1)
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        return results
+
+    def _end_window(self, now: float) -> None:
+        throughput = self._window_units / (now - self._window_start)
+        stream_speed = (
+            self._window_units / self._window_busy_time
+            if self._window_busy_time > 0
+            else None
+        )
+        if (
+            self._previous_throughput is None
+            or throughput > self._previous_throughput * (1 + _INCREASE_THRESHOLD)
+        ):
+            self._set_limit(self._limit + 1, reason="throughput improved")
+        elif (
+            stream_speed is not None
+            and self._previous_stream_speed is not None
+            and stream_speed < self._previous_stream_speed * (1 - _SLOWDOWN_THRESHOLD)
+        ):
+            self._set_limit(self._limit - 1, reason="transfers slowed down")
+            self._last_decrease = now
+        self._previous_throughput = throughput
+        self._previous_stream_speed = stream_speed
+        self._reset_window(now)
+
+    def _reset_window(self, now: float) -> None:
+        self._window_start = now
+        self._window_units = 0.0
+        self._window_busy_time = 0.0
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        limit = max(self.min_concurrency, min(self.max_concurrency, limit))
+        if limit != self._limit:
+            logger.debug(f"Concurrency: {self._limit} -> {limit} ({reason}).")
+            self._limit = limit
+            self._condition.notify_all()
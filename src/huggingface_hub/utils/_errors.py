@@ -1,11 +1,16 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from requests import HTTPError, Response
+from requests.structures import CaseInsensitiveDict
 
 from ._deprecation import _deprecate_method
 from ._fixes import JSONDecodeError
 
 
+if TYPE_CHECKING:
+    import aiohttp
+
+
 class HfHubHTTPError(HTTPError):
     """
     HTTPError to inherit from for any custom HTTP Error raised in HF Hub.
@@ -318,6 +323,25 @@ def hf_raise_for_status(
         raise HfHubHTTPError(str(e), response=response) from e
 
 
+async def ahf_raise_for_status(
+    response: "aiohttp.ClientResponse", endpoint_name: Optional[str] = None
+) -> None:
+    """Async equivalent of [`~utils.hf_raise_for_status`] for `aiohttp` responses.
+
+    The response is converted to a `requests.Response` so that errors are exactly the
+    same as in the synchronous code path.
+    """
+    if response.status < 400:
+        return
+    converted = Response()
+    converted.status_code = response.status
+    converted.reason = response.reason or ""
+    converted.url = str(response.url)
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted._content = await response.read()
+    hf_raise_for_status(converted, endpoint_name=endpoint_name)
+
+
 @_deprecate_method(version="0.13", message="Use `hf_raise_for_status` instead.")
 def _raise_for_status(response):
     """Keep alias for now."""
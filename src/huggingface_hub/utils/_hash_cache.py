@@ -0,0 +1,174 @@
+"""Contains a persistent cache of the sha256 of local files, to avoid hashing files again
+each time they are uploaded.
+
+Each entry is a small JSON file in the assets cache, named after the hash of the absolute
+path of the file. An entry is valid only if the file still has the same device, inode,
+size, modification time and change time as when it has been hashed. The change time
+cannot be set by users: a file rewritten with its modification time restored (e.g.
+`cp -p`) is hashed again.
+
+Entries are pruned once per process, the first time an entry is written.
+"""
+import base64
+import json
+import os
+import tempfile
+import threading
+import time
+from hashlib import sha256
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .. import constants
+from . import logging
+from ._cache_assets import cached_assets_path
+
+
+logger = logging.get_logger(__name__)
+
+# Small files are cheap to hash: not worth a cache entry.
+HASH_CACHE_MIN_FILE_SIZE = 1024 * 1024
+
+# Entries not used for this number of seconds are deleted.
+HASH_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Only the most recently used entries are kept.
+HASH_CACHE_MAX_ENTRIES = 10_000
+
+_pruned = False
+_prune_lock = threading.Lock()
+
+
+def get_cached_file_hash(
+    path: str, stat: os.stat_result
+) -> Optional[Tuple[bytes, bytes]]:
+    """Return the `(sha256, sample)` of a file if it has not changed since it was hashed.
+
+    Args:
+        path (`str`):
+            Absolute path of the file.
+        stat (`os.stat_result`):
+            Current stats of the file.
+
+    Returns:
+        `Tuple[bytes, bytes]`: the sha256 digest of the file and its first 512 bytes, or
+        `None` if the file is not in the cache or has been modified.
+    """
+    entry_path = _entry_path(path, stat)
+    if entry_path is None or not entry_path.is_file():
+        return None
+    try:
+        entry = json.loads(entry_path.read_text())
+        if entry["path"] != path or entry["identity"] != _identity(stat):
+            return None
+        result = bytes.fromhex(entry["sha256"]), base64.b64decode(entry["sample"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug(f"Ignoring invalid hash cache entry {entry_path}: {e}")
+        return None
+    try:
+        os.utime(entry_path)  # mark as recently used
+    except OSError:
+        pass
+    return result
+
+
+def cache_file_hash(path: str, stat: os.stat_result, sha: bytes, sample: bytes) -> None:
+    """Store the `(sha256, sample)` of a file, for the stats it had before being hashed.
+
+    Nothing is stored if the file has been modified in the meantime. Failing to write the
+    entry (e.g. read-only cache) is not an error: the file will simply be hashed again
+    next time.
+    """
+    entry_path = _entry_path(path, stat)
+    if entry_path is None:
+        return
+    try:
+        if _identity(os.stat(path)) != _identity(stat):
+            return
+    except OSError:
+        return
+    entry = {
+        "path": path,
+        "identity": _identity(stat),
+        "sha256": sha.hex(),
+        "sample": base64.b64encode(sample).decode("ascii"),
+    }
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=entry_path.parent, suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+    except OSError as e:
+        logger.debug(f"Could not write hash cache entry for {path}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    _prune_once(entry_path.parent)
+
+
+def _prune_once(folder: Path) -> None:
+    global _pruned
+    with _prune_lock:
+        if _pruned:
+            return
+        _pruned = True
+    _prune(folder)
+
+
+def _prune(folder: Path) -> None:
+    """Delete the entries of files that don't exist anymore and unused entries.
+
+    Only the `HASH_CACHE_MAX_ENTRIES` most recently used entries are kept.
+    """
+    now = time.time()
+    entries = []
+    for entry_path in folder.glob("*.json"):
+        try:
+            last_used = entry_path.stat().st_mtime
+            path = json.loads(entry_path.read_text())["path"]
+        except FileNotFoundError:
+            continue  # deleted concurrently
+        except (OSError, ValueError, KeyError, TypeError):
+            _remove(entry_path)
+            continue
+        if now - last_used > HASH_CACHE_MAX_AGE or not os.path.exists(path):
+            _remove(entry_path)
+        else:
+            entries.append((last_used, entry_path))
+
+    entries.sort(reverse=True)
+    for _, entry_path in entries[HASH_CACHE_MAX_ENTRIES:]:
+        _remove(entry_path)
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError as e:
+        logger.debug(f"Could not delete hash cache entry {path}: {e}")
+
+
+def _entry_path(path: str, stat: os.stat_result) -> Optional[Path]:
+    if constants.HF_HUB_DISABLE_HASH_CACHE or stat.st_size < HASH_CACHE_MIN_FILE_SIZE:
+        return None
+    try:
+        folder = cached_assets_path(
+            library_name="huggingface_hub", namespace="upload", subfolder="file_hashes"
+        )
+    except OSError:
+        return None
+    key = sha256(path.encode("utf-8", errors="surrogateescape")).hexdigest()
+    return folder / f"{key}.json"
+
+
+def _identity(stat: os.stat_result) -> list:
+    return [
+        stat.st_dev,
+        stat.st_ino,
+        stat.st_size,
+        stat.st_mtime_ns,
+        stat.st_ctime_ns,
+    ]
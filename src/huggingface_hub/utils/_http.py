@@ -14,14 +14,18 @@
 # limitations under the License.
 """Contains utilities to handle HTTP requests in Huggingface Hub."""
 import io
+import os
+import threading
 import time
 from http import HTTPStatus
-from typing import Tuple, Type, Union
+from typing import Callable, Optional, Tuple, Type, Union
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectTimeout, ProxyError
 
+from .. import constants
 from . import logging
 from ._typing import HTTP_METHOD_T
 
@@ -29,6 +33,111 @@ from ._typing import HTTP_METHOD_T
 logger = logging.get_logger(__name__)
 
 
+BACKEND_FACTORY_T = Callable[[], requests.Session]
+
+
+def _default_backend_factory() -> requests.Session:
+    """Build the default `requests.Session` shared by all calls to the Hub.
+
+    The same adapter is mounted for HTTP and HTTPS. It keeps up to
+    `HF_HUB_HTTP_POOL_MAXSIZE` connections alive per host so that consecutive calls
+    (HEAD, GET, PUT,...) reuse an existing TCP+TLS connection instead of opening a new
+    one.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=constants.HF_HUB_HTTP_POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_GLOBAL_BACKEND_FACTORY: BACKEND_FACTORY_T = _default_backend_factory
+_GLOBAL_SESSION: Optional[requests.Session] = None
+_GLOBAL_SESSION_PID: Optional[int] = None
+_GLOBAL_SESSION_LOCK = threading.Lock()
+
+
+def configure_http_backend(
+    backend_factory: BACKEND_FACTORY_T = _default_backend_factory,
+) -> None:
+    """
+    Configure the HTTP backend by providing a `backend_factory`. Any HTTP calls made by
+    `huggingface_hub` will use a Session object instantiated by this factory. This can
+    be useful if you are running your scripts in a specific environment requiring
+    custom configuration (e.g. custom proxy, certifications, connection pool size).
+
+    The session is shared by all threads of a process. It is re-created (using the
+    factory) the first time it is used after a fork. Calling this method closes the
+    current session.
+
+    Args:
+        backend_factory (`Callable[[], requests.Session]`, *optional*):
+            Factory returning a `requests.Session`. Defaults to a session keeping up to
+            `HF_HUB_HTTP_POOL_MAXSIZE` connections alive per host.
+
+    Example:
+    ```py
+    import requests
+    from requests.adapters import HTTPAdapter
+    from huggingface_hub import configure_http_backend, get_session
+
+    # Create a factory function that returns a Session with configured proxies
+    def backend_factory() -> requests.Session:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=128))
+        session.proxies = {"http": "http://10.10.1.10:3128", "https": "https://10.10.1.11:1080"}
+        return session
+
+    # Set it as the default session factory
+    configure_http_backend(backend_factory=backend_factory)
+
+    # In practice, this is mostly done internally in `huggingface_hub`
+    session = get_session()
+    ```
+    """
+    global _GLOBAL_BACKEND_FACTORY, _GLOBAL_SESSION, _GLOBAL_SESSION_PID
+    with _GLOBAL_SESSION_LOCK:
+        _GLOBAL_BACKEND_FACTORY = backend_factory
+        if _GLOBAL_SESSION is not None and _GLOBAL_SESSION_PID == os.getpid():
+            _GLOBAL_SESSION.close()
+        _GLOBAL_SESSION = None
+        _GLOBAL_SESSION_PID = None
+
+
+def get_session() -> requests.Session:
+    """
+    Get a `requests.Session` object, using the session factory from the user.
+
+    Use [`configure_http_backend`] to customize your session. Otherwise, a default
+    Session is created with a pool of keep-alive connections per host.
+
+    The session is created once per process and shared across threads. Connection pools
+    from `urllib3` are thread-safe, meaning concurrent downloads or uploads reuse the
+    same pool of connections instead of opening a new TCP+TLS connection for each call.
+
+    Example:
+    ```py
+    import requests
+    from huggingface_hub import configure_http_backend, get_session
+
+    # In practice, this is mostly done internally in `huggingface_hub`
+    session = get_session()
+    ```
+    """
+    global _GLOBAL_SESSION, _GLOBAL_SESSION_PID
+    pid = os.getpid()
+    session = _GLOBAL_SESSION
+    if session is not None and _GLOBAL_SESSION_PID == pid:
+        return session
+
+    with _GLOBAL_SESSION_LOCK:
+        # Connections must not be shared with a parent process => new session if forked.
+        if _GLOBAL_SESSION is None or _GLOBAL_SESSION_PID != pid:
+            _GLOBAL_SESSION = _GLOBAL_BACKEND_FACTORY()
+            _GLOBAL_SESSION_PID = pid
+        return _GLOBAL_SESSION
+
+
 def http_backoff(
     method: HTTP_METHOD_T,
     url: str,
@@ -74,7 +183,8 @@ def http_backoff(
             Define on which status codes the request must be retried. By default, only
             HTTP 503 Service Unavailable is retried.
         **kwargs (`dict`, *optional*):
-            kwargs to pass to `requests.request`.
+            kwargs to pass to `requests.request`. Request is made with the session
+            returned by [`get_session`].
 
     Example:
     ```
@@ -126,7 +236,7 @@ def http_backoff(
                 kwargs["data"].seek(io_obj_initial_pos)
 
             # Perform request and return if status_code is not in the retry list.
-            response = requests.request(method=method, url=url, **kwargs)
+            response = get_session().request(method=method, url=url, **kwargs)
             if response.status_code not in retry_on_status_codes:
                 return response
 
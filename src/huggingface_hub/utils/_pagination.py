@@ -13,11 +13,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Contains utilities to handle pagination on Huggingface Hub."""
-from typing import Dict, Iterable, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 import requests
 
-from . import hf_raise_for_status, logging
+from . import ahf_raise_for_status, get_session, hf_raise_for_status, logging
+
+
+if TYPE_CHECKING:
+    import aiohttp
 
 
 logger = logging.get_logger(__name__)
@@ -31,7 +44,7 @@ def paginate(path: str, params: Dict, headers: Dict) -> Iterable:
     - https://requests.readthedocs.io/en/latest/api/#requests.Response.links
     - https://docs.github.com/en/rest/guides/traversing-with-pagination#link-header
     """
-    r = requests.get(path, params=params, headers=headers)
+    r = get_session().get(path, params=params, headers=headers)
     hf_raise_for_status(r)
     yield from r.json()
 
@@ -40,7 +53,7 @@ def paginate(path: str, params: Dict, headers: Dict) -> Iterable:
     next_page = _get_next_page(r)
     while next_page is not None:
         logger.debug(f"Pagination detected. Requesting next page: {next_page}")
-        r = requests.get(next_page, headers=headers)
+        r = get_session().get(next_page, headers=headers)
         hf_raise_for_status(r)
         yield from r.json()
         next_page = _get_next_page(r)
@@ -48,3 +61,41 @@ def paginate(path: str, params: Dict, headers: Dict) -> Iterable:
 
 def _get_next_page(response: requests.Response) -> Optional[str]:
     return response.links.get("next", {}).get("url")
+
+
+async def apaginate(
+    session: "aiohttp.ClientSession", path: str, params: Dict, headers: Dict
+) -> AsyncIterator[Any]:
+    """Async equivalent of [`paginate`], using an `aiohttp` session.
+
+    Pages are fetched one after the other, following the "Link" header.
+    """
+    next_page: Optional[str] = path
+    query: Optional[List[Tuple[str, str]]] = encode_query_params(params)
+    while next_page is not None:
+        async with session.get(next_page, params=query, headers=headers) as r:
+            await ahf_raise_for_status(r)
+            items = await r.json(content_type=None)
+            next_link = r.links.get("next")
+            next_page = str(next_link["url"]) if next_link is not None else None
+        for item in items:
+            yield item
+        if next_page is not None:
+            logger.debug(f"Pagination detected. Requesting next page: {next_page}")
+        # Next link already contains query params
+        query = None
+
+
+def encode_query_params(params: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Encode query parameters the same way `requests` does, for `aiohttp`.
+
+    `aiohttp` only accepts strings and numbers: booleans are converted to `"True"` or
+    `"False"`, lists and tuples are sent as repeated keys and `None` values are dropped.
+    """
+    query = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None:
+                query.append((key, str(item)))
+    return query
@@ -33,6 +33,7 @@ else:
 _package_versions = {}
 
 _CANDIDATES = {
+    "aiohttp": {"aiohttp"},
     "torch": {"torch"},
     "pydot": {"pydot"},
     "graphviz": {"graphviz"},
@@ -111,6 +112,15 @@ def get_graphviz_version() -> str:
     return _get_version("graphviz")
 
 
+# aiohttp
+def is_aiohttp_available() -> bool:
+    return _is_available("aiohttp")
+
+
+def get_aiohttp_version() -> str:
+    return _get_version("aiohttp")
+
+
 # hf_transfer
 def is_hf_transfer_available() -> bool:
     return _is_available("hf_transfer")
@@ -254,6 +264,7 @@ def dump_environment_info() -> Dict[str, Any]:
     info["Pydot"] = get_pydot_version()
     info["Pillow"] = get_pillow_version()
     info["hf_transfer"] = get_hf_transfer_version()
+    info["aiohttp"] = get_aiohttp_version()
 
     # Environment variables
     info["ENDPOINT"] = constants.ENDPOINT
@@ -265,6 +276,9 @@ def dump_environment_info() -> Dict[str, Any]:
     info["HF_HUB_DISABLE_SYMLINKS_WARNING"] = constants.HF_HUB_DISABLE_SYMLINKS_WARNING
     info["HF_HUB_DISABLE_IMPLICIT_TOKEN"] = constants.HF_HUB_DISABLE_IMPLICIT_TOKEN
     info["HF_HUB_ENABLE_HF_TRANSFER"] = constants.HF_HUB_ENABLE_HF_TRANSFER
+    info["HF_HUB_ENABLE_PARALLEL_DOWNLOAD"] = constants.HF_HUB_ENABLE_PARALLEL_DOWNLOAD
+    info["HF_HUB_ENABLE_ASYNC_DOWNLOAD"] = constants.HF_HUB_ENABLE_ASYNC_DOWNLOAD
+    info["HF_HUB_HTTP_POOL_MAXSIZE"] = constants.HF_HUB_HTTP_POOL_MAXSIZE
 
     print("\nCopy-and-paste the text below in your GitHub issue.\n")
     print("\n".join([f"- {prop}: {val}" for prop, val in info.items()]) + "\n")
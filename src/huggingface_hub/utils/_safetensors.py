@@ -0,0 +1,176 @@
+"""Contains data structures to parse the header of safetensors files."""
+import json
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, Tuple
+
+from ..constants import SAFETENSORS_MAX_HEADER_LENGTH
+
+
+class SafetensorsParsingError(Exception):
+    """Raised when the header of a safetensors file cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class TensorInfo:
+    """Frozen data structure holding information about a tensor of a safetensors file.
+
+    Args:
+        dtype (`str`):
+            Type of the tensor elements. Example: `"F16"`.
+        shape (`Tuple[int, ...]`):
+            Shape of the tensor.
+        data_offsets (`Tuple[int, int]`):
+            Start and end offsets of the tensor data, relative to the end of the header
+            (see [`SafetensorsFileMetadata.data_start`]).
+    """
+
+    dtype: str
+    shape: Tuple[int, ...]
+    data_offsets: Tuple[int, int]
+
+    @property
+    def parameter_count(self) -> int:
+        """(property) Number of elements in the tensor."""
+        count = 1
+        for dim in self.shape:
+            count *= dim
+        return count
+
+    @property
+    def nbytes(self) -> int:
+        """(property) Size of the tensor data in bytes."""
+        return self.data_offsets[1] - self.data_offsets[0]
+
+
+@dataclass(frozen=True)
+class SafetensorsFileMetadata:
+    """Frozen data structure holding the header of a safetensors file.
+
+    Args:
+        filename (`str`):
+            Path of the file in the repo.
+        header_size (`int`):
+            Size of the JSON header in bytes.
+        metadata (`Dict[str, str]`):
+            Free-form metadata stored in the header (`"__metadata__"` entry).
+        tensors (`Dict[str, TensorInfo]`):
+            Information about each tensor of the file, by name.
+    """
+
+    filename: str
+    header_size: int
+    metadata: Dict[str, str]
+    tensors: Dict[str, TensorInfo]
+
+    @property
+    def data_start(self) -> int:
+        """(property) Offset of the tensors data in the file."""
+        return 8 + self.header_size
+
+    @property
+    def parameter_count(self) -> Dict[str, int]:
+        """(property) Number of parameters in the file, by dtype."""
+        return _count_parameters(self.tensors.values())
+
+    @property
+    def nbytes(self) -> int:
+        """(property) Size of the tensors data in bytes."""
+        return sum(tensor.nbytes for tensor in self.tensors.values())
+
+
+@dataclass(frozen=True)
+class SafetensorsRepoMetadata:
+    """Frozen data structure holding the headers of all safetensors files of a repo.
+
+    The metadata is bound to `commit_hash`: it never changes for a given commit and can
+    be safely cached using `(repo_id, commit_hash)` as key.
+
+    Args:
+        repo_id (`str`):
+            Repo the files belong to.
+        commit_hash (`str`):
+            Commit the headers have been read from.
+        files (`Dict[str, SafetensorsFileMetadata]`):
+            Header of each safetensors file, by path in the repo.
+        weight_map (`Dict[str, str]`):
+            Path of the file containing each tensor, by tensor name.
+    """
+
+    repo_id: str
+    commit_hash: str
+    files: Dict[str, SafetensorsFileMetadata]
+    weight_map: Dict[str, str]
+
+    @property
+    def sharded(self) -> bool:
+        """(property) Whether the tensors are split across several files."""
+        return len(self.files) > 1
+
+    @property
+    def parameter_count(self) -> Dict[str, int]:
+        """(property) Number of parameters in the repo, by dtype."""
+        return _count_parameters(
+            tensor for file in self.files.values() for tensor in file.tensors.values()
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """(property) Size of the tensors data of all files in bytes."""
+        return sum(file.nbytes for file in self.files.values())
+
+
+def parse_safetensors_header_length(prefix: bytes, filename: str) -> int:
+    """Return the size of the JSON header from the first 8 bytes of a safetensors file.
+
+    Raises:
+        [`SafetensorsParsingError`]: if the length is invalid.
+    """
+    if len(prefix) < 8:
+        raise SafetensorsParsingError(
+            f"Failed to parse safetensors header of '{filename}': file is too small"
+            f" ({len(prefix)} bytes)."
+        )
+    (header_size,) = struct.unpack("<Q", prefix[:8])
+    if header_size > SAFETENSORS_MAX_HEADER_LENGTH:
+        raise SafetensorsParsingError(
+            f"Failed to parse safetensors header of '{filename}': header is too big"
+            f" ({header_size} > {SAFETENSORS_MAX_HEADER_LENGTH} bytes)."
+        )
+    return header_size
+
+
+def parse_safetensors_header(header: bytes, filename: str) -> SafetensorsFileMetadata:
+    """Parse the JSON header of a safetensors file (without the 8-bytes length prefix).
+
+    Raises:
+        [`SafetensorsParsingError`]: if the header is not a valid safetensors header.
+    """
+    try:
+        data = json.loads(header.decode("utf-8"))
+        metadata = data.pop("__metadata__", None) or {}
+        tensors = {
+            name: TensorInfo(
+                dtype=info["dtype"],
+                shape=tuple(info["shape"]),
+                data_offsets=tuple(info["data_offsets"]),  # type: ignore
+            )
+            for name, info in data.items()
+        }
+    except (ValueError, AttributeError, KeyError, TypeError) as e:
+        raise SafetensorsParsingError(
+            f"Failed to parse safetensors header of '{filename}': {e}"
+        ) from e
+    return SafetensorsFileMetadata(
+        filename=filename,
+        header_size=len(header),
+        metadata=metadata,
+        tensors=tensors,
+    )
+
+
+def _count_parameters(tensors: Iterable[TensorInfo]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for tensor in tensors:
+        counts[tensor.dtype] = counts.get(tensor.dtype, 0) + tensor.parameter_count
+    return counts
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import unittest
+from typing import Any, List
+from unittest.mock import Mock, patch
+
+import aiohttp
+from huggingface_hub import AsyncHfApi
+from huggingface_hub.community import Discussion
+from huggingface_hub.hf_api import DatasetInfo, GitRefs, ModelInfo
+from huggingface_hub.utils import RepositoryNotFoundError
+
+from .testing_utils import start_local_hub
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+MODEL_INFO = {
+    "modelId": "user/model",
+    "sha": "a" * 40,
+    "siblings": [{"rfilename": "config.json"}, {"rfilename": "model.bin"}],
+}
+
+REFS = {
+    "branches": [{"name": "main", "ref": "refs/heads/main", "targetCommit": "a" * 40}],
+    "converts": [],
+    "tags": [{"name": "v1", "ref": "refs/tags/v1", "targetCommit": "b" * 40}],
+}
+
+
+def _discussion(num: int) -> dict:
+    return {
+        "title": f"Discussion {num}",
+        "num": num,
+        "author": {"name": "user"},
+        "createdAt": "2022-01-01T00:00:00.000Z",
+        "status": "open",
+        "repo": {"name": "user/model", "type": "model"},
+        "isPullRequest": False,
+    }
+
+
+class AsyncHfApiTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.api = AsyncHfApi(endpoint=self.server.url, token="hf_token")
+
+    def _add_json(self, path: str, data: Any, **headers: str) -> None:
+        self.server.add_file(
+            path, json.dumps(data).encode(), headers={**JSON_HEADERS, **headers}
+        )
+
+    def _run(self, coroutine) -> Any:
+        async def _main():
+            async with self.api:
+                return await coroutine
+
+        return asyncio.run(_main())
+
+    def _collect(self, iterator) -> List[Any]:
+        async def _main():
+            async with self.api:
+                return [item async for item in iterator]
+
+        return asyncio.run(_main())
+
+    def test_model_info(self) -> None:
+        self._add_json("/api/models/user/model", MODEL_INFO)
+        info = self._run(self.api.model_info("user/model", files_metadata=True))
+
+        self.assertIsInstance(info, ModelInfo)
+        self.assertEqual(info.sha, "a" * 40)
+        self.assertEqual(info.siblings[1].rfilename, "model.bin")
+
+        request = self.server.requests[0]
+        self.assertEqual(request.query, "blobs=True")
+        self.assertEqual(request.headers["authorization"], "Bearer hf_token")
+
+    def test_model_info_revision(self) -> None:
+        self._add_json("/api/models/user/model/revision/refs%2Fpr%2F1", MODEL_INFO)
+        info = self._run(self.api.model_info("user/model", revision="refs/pr/1"))
+        self.assertEqual(info.modelId, "user/model")
+
+    def test_repo_info_dataset(self) -> None:
+        self._add_json("/api/datasets/user/data", {"id": "user/data"})
+        info = self._run(self.api.repo_info("user/data", repo_type="dataset"))
+        self.assertIsInstance(info, DatasetInfo)
+        self.assertEqual(info.id, "user/data")
+
+    def test_list_repo_files(self) -> None:
+        self._add_json("/api/models/user/model", MODEL_INFO)
+        files = self._run(self.api.list_repo_files("user/model"))
+        self.assertEqual(files, ["config.json", "model.bin"])
+
+    def test_list_repo_refs(self) -> None:
+        self._add_json("/api/models/user/model/refs", REFS)
+        refs = self._run(self.api.list_repo_refs("user/model"))
+        self.assertIsInstance(refs, GitRefs)
+        self.assertEqual(refs.branches[0].target_commit, "a" * 40)
+        self.assertEqual(refs.tags[0].name, "v1")
+
+    def test_repository_not_found(self) -> None:
+        self.server.not_found_headers = {"X-Error-Code": "RepoNotFound"}
+        with self.assertRaises(RepositoryNotFoundError):
+            self._run(self.api.model_info("user/missing"))
+
+    def test_get_repo_discussions(self) -> None:
+        self._add_json(
+            "/api/models/user/model/discussions",
+            {"count": 2, "start": 0, "discussions": [_discussion(1), _discussion(2)]},
+        )
+        discussions = self._collect(self.api.get_repo_discussions("user/model"))
+
+        self.assertEqual(len(discussions), 2)
+        self.assertIsInstance(discussions[0], Discussion)
+        self.assertEqual(discussions[0].title, "Discussion 1")
+        self.assertEqual(self.server.requests[0].query, "p=0")
+
+    def test_list_models_follows_link_header(self) -> None:
+        page_2 = self.server.url + "/api/models-page-2?cursor=abc"
+        self._add_json(
+            "/api/models",
+            [{"modelId": "user/model-1"}, {"modelId": "user/model-2"}],
+            Link=f'<{page_2}>; rel="next"',
+        )
+        self._add_json("/api/models-page-2", [{"modelId": "user/model-3"}])
+
+        models = self._collect(self.api.list_models(author="user", full=True))
+
+        self.assertEqual(
+            [model.modelId for model in models],
+            ["user/model-1", "user/model-2", "user/model-3"],
+        )
+        self.assertEqual(self.server.requests[0].query, "author=user&full=True")
+        # Next link already contains the query params
+        self.assertEqual(self.server.requests[1].query, "cursor=abc")
+
+    def test_list_models_limit_stops_pagination(self) -> None:
+        page_2 = self.server.url + "/api/models-page-2"
+        self._add_json(
+            "/api/models",
+            [{"modelId": "user/model-1"}, {"modelId": "user/model-2"}],
+            Link=f'<{page_2}>; rel="next"',
+        )
+
+        models = self._collect(self.api.list_models(limit=2))
+
+        self.assertEqual(len(models), 2)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_list_models_filter_as_repeated_keys(self) -> None:
+        self._add_json("/api/models", [])
+        self._collect(self.api.list_models(filter=["text-classification", "pytorch"]))
+        self.assertEqual(
+            self.server.requests[0].query,
+            "filter=text-classification&filter=pytorch&full=True",
+        )
+
+    def test_concurrent_calls_share_session(self) -> None:
+        self._add_json("/api/models/user/model/refs", REFS)
+
+        async def _main():
+            async with self.api:
+                results = await asyncio.gather(
+                    *(self.api.list_repo_refs("user/model") for _ in range(20))
+                )
+                self.assertIsNotNone(self.api._session)
+                return results
+
+        with patch("aiohttp.ClientSession", wraps=aiohttp.ClientSession) as mock:
+            results = asyncio.run(_main())
+        self.assertEqual(len(results), 20)
+        mock.assert_called_once()
+        self.assertIsNone(self.api._session)  # closed
+
+    @patch("huggingface_hub._async_hf_api.is_aiohttp_available", return_value=False)
+    def test_aiohttp_not_installed(self, mock: Mock) -> None:
+        with self.assertRaises(ValueError):
+            self._run(self.api.model_info("user/model"))
@@ -1,3 +1,4 @@
+import os
 import unittest
 import warnings
 from pathlib import Path
@@ -10,7 +11,7 @@ from huggingface_hub.constants import CONFIG_NAME, HUGGINGFACE_HUB_CACHE
 from huggingface_hub.file_download import are_symlinks_supported
 
 from .testing_constants import TOKEN
-from .testing_utils import DUMMY_MODEL_ID, with_production_testing
+from .testing_utils import DUMMY_MODEL_ID, start_local_hub, with_production_testing
 
 
 @with_production_testing
@@ -48,6 +49,7 @@ class TestCacheLayoutIfSymlinksNotSupported(unittest.TestCase):
             # Try with another directory: symlinks are supported, no warnings
             self.assertTrue(are_symlinks_supported())  # True
 
+    @patch("huggingface_hub.file_download._try_hardlink", Mock(return_value=False))
     @patch("huggingface_hub.file_download.are_symlinks_supported")
     def test_download_no_symlink_new_file(
         self, mock_are_symlinks_supported: Mock
@@ -69,6 +71,7 @@ class TestCacheLayoutIfSymlinksNotSupported(unittest.TestCase):
         # Blobs directory is empty
         self.assertEqual(len(list((Path(filepath).parents[2] / "blobs").glob("*"))), 0)
 
+    @patch("huggingface_hub.file_download._try_hardlink", Mock(return_value=False))
     @patch("huggingface_hub.file_download.are_symlinks_supported")
     def test_download_no_symlink_existing_file(
         self, mock_are_symlinks_supported: Mock
@@ -109,6 +112,7 @@ class TestCacheLayoutIfSymlinksNotSupported(unittest.TestCase):
         # => duplicate file on disk
         self.assertTrue(blob_path.is_file())
 
+    @patch("huggingface_hub.file_download._try_hardlink", Mock(return_value=False))
     @patch("huggingface_hub.file_download.are_symlinks_supported")
     def test_scan_and_delete_cache_no_symlinks(
         self, mock_are_symlinks_supported: Mock
@@ -215,3 +219,79 @@ class TestCacheLayoutIfSymlinksNotSupported(unittest.TestCase):
         self.assertEqual(len(strategy_delete_revision.refs), 0)
         self.assertEqual(len(strategy_delete_revision.repos), 0)
         strategy_delete_revision.execute()  # Execute without error
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class TestCacheLayoutWithHardlinks(unittest.TestCase):
+    """Symlinks not supported but hardlinks are: blobs are not duplicated on disk."""
+
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.etag = self.server.add_repo_file(
+            "user/repo", "model.bin", b"weights", revisions=()
+        )
+        self.server.add_repo_file(
+            "user/repo", "model.bin", b"weights", commit_hash="b" * 40
+        )
+        self.server.add_repo_file(
+            "user/repo", "config.json", b"{}", commit_hash="b" * 40
+        )
+        self.blob_path = self.cache_dir / "models--user--repo" / "blobs" / self.etag
+
+        symlinks_patcher = patch(
+            "huggingface_hub.file_download.are_symlinks_supported", return_value=False
+        )
+        symlinks_patcher.start()
+        self.addCleanup(symlinks_patcher.stop)
+
+    def _download(self, filename: str, revision: str) -> Path:
+        return Path(
+            hf_hub_download(
+                "user/repo", filename, revision=revision, cache_dir=self.cache_dir
+            )
+        )
+
+    def test_new_file_is_hardlinked(self) -> None:
+        path = self._download("model.bin", "a" * 40)
+        self.assertFalse(path.is_symlink())
+        self.assertTrue(os.path.samefile(path, self.blob_path))
+
+    def test_existing_blob_is_not_downloaded_again(self) -> None:
+        self._download("model.bin", "a" * 40)
+        path = self._download("model.bin", "b" * 40)
+
+        self.assertEqual(path.read_bytes(), b"weights")
+        self.assertEqual(
+            len(
+                [request for request in self.server.requests if request.method == "GET"]
+            ),
+            1,
+        )
+
+    @patch("huggingface_hub.file_download._try_clone_file", return_value=False)
+    def test_scan_and_delete_cache_with_hardlinks(self, mock: Mock) -> None:
+        self._download("model.bin", "a" * 40)
+        self._download("model.bin", "b" * 40)
+        self._download("config.json", "b" * 40)
+
+        report = scan_cache_dir(self.cache_dir)
+        self.assertEqual(report.warnings, [])
+        repo = list(report.repos)[0]
+
+        # Hardlinked files are counted once
+        self.assertEqual(repo.nb_files, 2)
+        self.assertEqual(repo.size_on_disk, len(b"weights") + len(b"{}"))
+        for revision in repo.revisions:
+            for file in revision.files:
+                self.assertEqual(file.blob_path.parent.name, "blobs")
+
+        # Blob is still used by the other revision
+        strategy = report.delete_revisions("a" * 40)
+        self.assertEqual(strategy.expected_freed_size, 0)
+        self.assertEqual(strategy.blobs, frozenset())
+        strategy.execute()
+
+        self.assertEqual(self._download("model.bin", "b" * 40).read_bytes(), b"weights")
+        self.assertTrue(self.blob_path.is_file())
@@ -0,0 +1,230 @@
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import requests
+from huggingface_hub import hf_hub_download
+from huggingface_hub._cache_server import CacheServer
+from huggingface_hub.file_download import http_get
+from huggingface_hub.utils import EntryNotFoundError
+
+from .testing_utils import LocalHttpServer, patch_hub_url
+
+
+CONTENT = b"0123456789" * 100
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class CacheServerTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.upstream = LocalHttpServer().__enter__()
+        self.addCleanup(self.upstream.__exit__)
+        self.etag = self.upstream.add_repo_file("user/repo", "model.bin", CONTENT)
+        self.upstream.add_file("/api/models/user/repo", b"{}")
+
+        self.server_cache_dir = self.cache_dir / "server"
+        self.client_cache_dir = self.cache_dir / "client"
+        self.server = CacheServer(
+            ("127.0.0.1", 0),
+            cache_dir=str(self.server_cache_dir),
+            upstream=self.upstream.url,
+        )
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        # Clients download from the cache server
+        url_template_patcher = patch_hub_url(self.server.url)
+        url_template_patcher.start()
+        self.addCleanup(url_template_patcher.stop)
+
+    def _download(self, filename: str = "model.bin", **kwargs) -> str:
+        return hf_hub_download(
+            "user/repo", filename, cache_dir=self.client_cache_dir, **kwargs
+        )
+
+    def _upstream_gets(self) -> int:
+        return sum(1 for request in self.upstream.requests if request.method == "GET")
+
+    def test_download_through_server(self) -> None:
+        path = self._download()
+        self.assertEqual(Path(path).read_bytes(), CONTENT)
+
+        # File is cached by the server as well
+        blob_path = self.server_cache_dir / "models--user--repo" / "blobs" / self.etag
+        self.assertEqual(blob_path.read_bytes(), CONTENT)
+        snapshot_path = (
+            self.server_cache_dir
+            / "models--user--repo"
+            / "snapshots"
+            / ("a" * 40)
+            / "model.bin"
+        )
+        self.assertTrue(snapshot_path.is_symlink())
+        self.assertEqual(self._upstream_gets(), 1)
+
+        # Another client downloads from the server cache
+        self._download(force_download=True)
+        self.assertEqual(self._upstream_gets(), 1)
+
+    def test_commit_hash_served_from_cache_without_upstream(self) -> None:
+        self._download()
+        self.upstream.requests.clear()
+
+        path = self._download(revision="a" * 40, force_download=True)
+        self.assertEqual(Path(path).read_bytes(), CONTENT)
+        self.assertEqual(self.upstream.requests, [])
+
+    def test_served_from_cache_when_upstream_is_down(self) -> None:
+        self._download()
+        self.server.upstream = "http://127.0.0.1:1"  # nothing listens there
+
+        path = self._download(force_download=True)
+        self.assertEqual(Path(path).read_bytes(), CONTENT)
+
+    def test_upstream_down_and_not_cached(self) -> None:
+        self.server.upstream = "http://127.0.0.1:1"
+        response = requests.get(self.server.url + "/user/repo/resolve/main/model.bin")
+        self.assertEqual(response.status_code, 504)
+
+    def test_entry_not_found_is_forwarded(self) -> None:
+        self.upstream.not_found_headers = {"X-Error-Code": "EntryNotFound"}
+        with self.assertRaises(EntryNotFoundError):
+            self._download("missing.bin")
+
+    def test_range_request(self) -> None:
+        self._download()
+        response = requests.get(
+            self.server.url + "/user/repo/resolve/main/model.bin",
+            headers={"Range": "bytes=10-19"},
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, CONTENT[10:20])
+        self.assertEqual(
+            response.headers["Content-Range"], f"bytes 10-19/{len(CONTENT)}"
+        )
+
+    def test_token_is_forwarded(self) -> None:
+        self._download(token="hf_client_token")
+        for request in self.upstream.requests:
+            self.assertEqual(request.headers["authorization"], "Bearer hf_client_token")
+
+    def test_path_traversal_is_rejected(self) -> None:
+        self._download()
+        (self.cache_dir / "secret.txt").write_text("TOP-SECRET-CONTENT")
+
+        for filename in (
+            "..%2F..%2F..%2F..%2Fsecret.txt",
+            "..%2Fsecret.txt",
+            "%2Ftmp%2Fsecret.txt",
+            "sub%2F.%2Fmodel.bin",
+            "sub//model.bin",
+        ):
+            with self.subTest(filename=filename):
+                response = requests.get(
+                    self.server.url + f"/user/repo/resolve/{'a' * 40}/{filename}"
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertNotIn(b"TOP-SECRET-CONTENT", response.content)
+
+        response = requests.get(
+            self.server.url + "/user/repo/resolve/..%2F..%2F..%2Fsecret.txt/model.bin"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_private_file_not_served_from_cache_without_token(self) -> None:
+        self.upstream.token = "hf_client_a"
+        self._download(token="hf_client_a")
+
+        # Client B has no token: cached file is not served, even for a commit hash
+        url = self.server.url + f"/user/repo/resolve/{'a' * 40}/model.bin"
+        response = requests.get(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.content, b"")
+
+        # Nor when the Hub cannot be reached to check the token
+        self.server.upstream = "http://127.0.0.1:1"
+        response = requests.get(url)
+        self.assertEqual(response.status_code, 504)
+
+    def test_private_file_served_to_authorized_client(self) -> None:
+        self.upstream.token = "hf_client_a"
+        self._download(token="hf_client_a")
+
+        # Token is checked on the Hub but the file is served from the cache
+        path = self._download(token="hf_client_a", force_download=True)
+        self.assertEqual(Path(path).read_bytes(), CONTENT)
+        self.assertEqual(self._upstream_gets(), 1)
+
+    def test_other_requests_are_forwarded(self) -> None:
+        response = requests.get(self.server.url + "/api/models/user/repo")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"{}")
+        self.assertEqual(self.upstream.requests[-1].path, "/api/models/user/repo")
+
+    def test_stream_while_fetching(self) -> None:
+        first_bytes_served = threading.Event()
+
+        def _gated_http_get(url: str, temp_file, **kwargs) -> None:
+            # Write half of the file, then wait for the client to receive it
+            original_write = temp_file.write
+            calls = {"count": 0}
+
+            def _write(data: bytes) -> int:
+                calls["count"] += 1
+                if calls["count"] == 1:
+                    original_write(data[:500])
+                    if not first_bytes_served.wait(timeout=10):
+                        raise OSError("Client did not receive the first bytes.")
+                    return original_write(data[500:])
+                return original_write(data)
+
+            temp_file.write = _write
+            http_get(url, temp_file, **kwargs)
+
+        results = {}
+
+        def _client(name: str, check_first_bytes: bool) -> None:
+            response = requests.get(
+                self.server.url + "/user/repo/resolve/main/model.bin", stream=True
+            )
+            content = b""
+            if check_first_bytes:
+                # Served while the rest of the file is not fetched yet
+                content += response.raw.read(500)
+                first_bytes_served.set()
+            results[name] = content + response.raw.read()
+
+        with patch("huggingface_hub._cache_server.http_get", _gated_http_get):
+            clients = [
+                threading.Thread(target=_client, args=("first", True)),
+                threading.Thread(target=_client, args=("second", False)),
+            ]
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join(timeout=20)
+
+        self.assertTrue(first_bytes_served.is_set())
+        self.assertEqual(results["first"], CONTENT)
+        self.assertEqual(results["second"], CONTENT)
+        # Blob fetched only once from upstream
+        self.assertEqual(self._upstream_gets(), 1)
+
+    def test_resume_incomplete_fetch(self) -> None:
+        blob_dir = self.server_cache_dir / "models--user--repo" / "blobs"
+        blob_dir.mkdir(parents=True)
+        (blob_dir / (self.etag + ".incomplete")).write_bytes(CONTENT[:300])
+
+        path = self._download()
+        self.assertEqual(Path(path).read_bytes(), CONTENT)
+        get_request = next(
+            request for request in self.upstream.requests if request.method == "GET"
+        )
+        self.assertEqual(get_request.headers["Range"], "bytes=300-")
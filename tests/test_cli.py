@@ -3,6 +3,7 @@ from argparse import ArgumentParser
 
 from huggingface_hub.commands.delete_cache import DeleteCacheCommand
 from huggingface_hub.commands.scan_cache import ScanCacheCommand
+from huggingface_hub.commands.serve_cache import ServeCacheCommand
 
 
 class TestCLI(unittest.TestCase):
@@ -18,6 +19,7 @@ class TestCLI(unittest.TestCase):
         commands_parser = self.parser.add_subparsers()
         ScanCacheCommand.register_subcommand(commands_parser)
         DeleteCacheCommand.register_subcommand(commands_parser)
+        ServeCacheCommand.register_subcommand(commands_parser)
 
     def test_scan_cache_basic(self) -> None:
         """Test `huggingface-cli scan-cache`."""
@@ -52,3 +54,32 @@ class TestCLI(unittest.TestCase):
         args = self.parser.parse_args(["delete-cache", "--dir", "something"])
         self.assertEqual(args.dir, "something")
         self.assertEqual(args.func, DeleteCacheCommand)
+
+    def test_serve_cache_basic(self) -> None:
+        """Test `huggingface-cli serve-cache`."""
+        args = self.parser.parse_args(["serve-cache"])
+        self.assertEqual(args.dir, None)
+        self.assertEqual(args.host, "127.0.0.1")
+        self.assertEqual(args.port, 8080)
+        self.assertEqual(args.upstream, None)
+        self.assertEqual(args.func, ServeCacheCommand)
+
+    def test_serve_cache_with_args(self) -> None:
+        """Test `huggingface-cli serve-cache --host 0.0.0.0 --port 9000 ...`."""
+        args = self.parser.parse_args(
+            [
+                "serve-cache",
+                "--dir",
+                "something",
+                "--host",
+                "0.0.0.0",
+                "--port",
+                "9000",
+                "--upstream",
+                "https://hub.example.com",
+            ]
+        )
+        self.assertEqual(args.dir, "something")
+        self.assertEqual(args.host, "0.0.0.0")
+        self.assertEqual(args.port, 9000)
+        self.assertEqual(args.upstream, "https://hub.example.com")
@@ -1,10 +1,28 @@
+import base64
+import io
+import json
+import threading
+import time
 import unittest
+from hashlib import sha256
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
 
 from huggingface_hub._commit_api import (
     CommitOperationAdd,
     CommitOperationDelete,
+    compute_upload_infos,
+    fetch_upload_modes,
+    prepare_commit_payload,
+    stream_commit_payload,
+    upload_additions,
     warn_on_overwriting_operations,
 )
+from huggingface_hub.lfs import UploadInfo
+from huggingface_hub.utils import AdaptiveConcurrency
 
 
 class TestCommitOperationDelete(unittest.TestCase):
@@ -96,3 +114,342 @@ class TestWarnOnOverwritingOperations(unittest.TestCase):
         warn_on_overwriting_operations(
             [self.delete_folder_a, self.add_file_ab, self.add_file_abc]
         )
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class TestComputeUploadInfos(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.paths = []
+        for index in range(6):
+            path = self.cache_dir / f"file_{index}.bin"
+            path.write_bytes(b"content %d" % index)
+            self.paths.append(path)
+
+    def test_upload_info_computed_on_first_access(self) -> None:
+        with patch.object(UploadInfo, "from_path", wraps=UploadInfo.from_path) as mock:
+            operation = CommitOperationAdd("file.bin", self.paths[0])
+            mock.assert_not_called()
+
+            self.assertEqual(operation.upload_info.size, 9)
+            self.assertEqual(
+                operation.upload_info.sha256, sha256(b"content 0").digest()
+            )
+            self.assertEqual(operation.upload_info.sample, b"content 0")
+            mock.assert_called_once()
+
+    def test_hash_files_concurrently(self) -> None:
+        operations = [
+            CommitOperationAdd(f"file_{index}.bin", path)
+            for index, path in enumerate(self.paths)
+        ]
+        threads = set()
+        from_path = UploadInfo.from_path
+
+        def _from_path(path: str) -> UploadInfo:
+            threads.add(threading.get_ident())
+            return from_path(path)
+
+        with patch.object(UploadInfo, "from_path", side_effect=_from_path) as mock:
+            compute_upload_infos(operations, num_threads=3)
+            self.assertEqual(mock.call_count, 6)
+            self.assertNotIn(threading.get_ident(), threads)
+
+            # Already computed => not hashed again
+            compute_upload_infos(operations, num_threads=3)
+            self.assertEqual(mock.call_count, 6)
+
+        for index, operation in enumerate(operations):
+            self.assertEqual(
+                operation.upload_info.sha256, sha256(b"content %d" % index).digest()
+            )
+
+    def test_file_objects_hashed_sequentially(self) -> None:
+        fileobj = BytesIO(b"shared content")
+        operations = [
+            CommitOperationAdd("a.bin", fileobj),
+            CommitOperationAdd("b.bin", fileobj),
+            CommitOperationAdd("c.bin", b"bytes content"),
+        ]
+        compute_upload_infos(operations, num_threads=4)
+        for operation in operations[:2]:
+            self.assertEqual(
+                operation.upload_info.sha256, sha256(b"shared content").digest()
+            )
+        self.assertEqual(fileobj.tell(), 0)
+        self.assertEqual(
+            operations[2].upload_info.sha256, sha256(b"bytes content").digest()
+        )
+
+
+class TestFetchUploadModesHashing(unittest.TestCase):
+    def test_files_hashed_chunk_by_chunk(self) -> None:
+        additions = [
+            CommitOperationAdd(f"file_{index}.txt", b"content %d" % index)
+            for index in range(300)
+        ]
+        hashed_before_request = []
+
+        def _post(url, json, **kwargs) -> Mock:
+            hashed_before_request.append(
+                sum(1 for op in additions if op._cached_upload_info is not None)
+            )
+            response = Mock(status_code=200)
+            response.json.return_value = {
+                "files": [
+                    {"path": file["path"], "uploadMode": "regular"}
+                    for file in json["files"]
+                ]
+            }
+            return response
+
+        with patch("huggingface_hub._commit_api.get_session") as mock_session:
+            mock_session.return_value.post.side_effect = _post
+            upload_modes = fetch_upload_modes(
+                additions,
+                repo_type="model",
+                repo_id="user/repo",
+                token=None,
+                revision="main",
+            )
+
+        self.assertEqual(len(upload_modes), 300)
+        # Only the first chunk is hashed before the first request
+        self.assertEqual(hashed_before_request, [256, 300])
+
+
+class TestUploadAdditions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.preuploaded = []
+        self.batched = []
+        self.uploaded = []
+        self.first_upload_started = threading.Event()
+
+        def _fetch_upload_modes(additions, **kwargs):
+            self.preuploaded.append([op.path_in_repo for op in additions])
+            return {op.path_in_repo: "lfs" for op in additions}
+
+        def _post_lfs_batch_info(upload_infos, **kwargs):
+            oids = [info.sha256.hex() for info in upload_infos]
+            self.batched.append(oids)
+            return [{"oid": oid, "actions": {"upload": {}}} for oid in oids], []
+
+        def _upload_lfs_object(operation, lfs_batch_action, **kwargs):
+            self.uploaded.append(operation.path_in_repo)
+            self.first_upload_started.set()
+
+        for name, side_effect in (
+            ("fetch_upload_modes", _fetch_upload_modes),
+            ("post_lfs_batch_info", _post_lfs_batch_info),
+            ("_upload_lfs_object", _upload_lfs_object),
+        ):
+            patcher = patch(
+                f"huggingface_hub._commit_api.{name}", side_effect=side_effect
+            )
+            setattr(self, f"mock_{name}", patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def _upload_additions(self, additions, **kwargs):
+        return upload_additions(
+            additions=additions,
+            repo_type="model",
+            repo_id="user/repo",
+            token=None,
+            revision="main",
+            **kwargs,
+        )
+
+    def test_upload_starts_before_all_files_are_hashed(self) -> None:
+        from_bytes = UploadInfo.from_bytes
+
+        def _slow_from_bytes(data: bytes) -> UploadInfo:
+            if data == b"slow":
+                # Blocks until the other file is being uploaded
+                self.assertTrue(self.first_upload_started.wait(timeout=5))
+            return from_bytes(data)
+
+        additions = [
+            CommitOperationAdd("slow.bin", b"slow"),
+            CommitOperationAdd("fast.bin", b"fast"),
+        ]
+        with patch.object(UploadInfo, "from_bytes", side_effect=_slow_from_bytes):
+            upload_modes = self._upload_additions(additions, num_hash_threads=2)
+
+        self.assertEqual(upload_modes, {"slow.bin": "lfs", "fast.bin": "lfs"})
+        self.assertEqual(self.uploaded, ["fast.bin", "slow.bin"])
+        # One preupload call per file, as they are not ready at the same time
+        self.assertEqual(self.preuploaded, [["fast.bin"], ["slow.bin"]])
+
+    def test_files_with_same_content_uploaded_once(self) -> None:
+        additions = [
+            CommitOperationAdd("a.bin", b"same"),
+            CommitOperationAdd("b.bin", b"same"),
+            CommitOperationAdd("c.bin", b"other"),
+        ]
+        upload_modes = self._upload_additions(additions)
+
+        self.assertEqual(len(upload_modes), 3)
+        self.assertEqual(sum(len(oids) for oids in self.batched), 2)
+        self.assertEqual(len(self.uploaded), 2)
+
+    def test_calls_are_chunked(self) -> None:
+        additions = [
+            CommitOperationAdd(f"file_{index}.bin", b"content %d" % index)
+            for index in range(300)
+        ]
+        for op in additions:
+            op.upload_info  # already hashed: all ready at once
+        self._upload_additions(additions)
+
+        self.assertEqual([len(chunk) for chunk in self.preuploaded], [256, 44])
+        self.assertTrue(all(len(oids) <= 256 for oids in self.batched))
+        self.assertEqual(len(self.uploaded), 300)
+
+    def test_already_uploaded_files_are_skipped(self) -> None:
+        self.mock_post_lfs_batch_info.side_effect = lambda upload_infos, **kwargs: (
+            [{"oid": info.sha256.hex()} for info in upload_infos],
+            [],
+        )
+        upload_modes = self._upload_additions([CommitOperationAdd("a.bin", b"a")])
+
+        self.assertEqual(upload_modes, {"a.bin": "lfs"})
+        self.assertEqual(self.uploaded, [])
+
+    def test_regular_files_are_not_uploaded(self) -> None:
+        self.mock_fetch_upload_modes.side_effect = lambda additions, **kwargs: {
+            op.path_in_repo: "regular" for op in additions
+        }
+        upload_modes = self._upload_additions([CommitOperationAdd("a.txt", b"a")])
+
+        self.assertEqual(upload_modes, {"a.txt": "regular"})
+        self.mock_post_lfs_batch_info.assert_not_called()
+
+    def test_batch_errors_are_raised(self) -> None:
+        self.mock_post_lfs_batch_info.side_effect = lambda upload_infos, **kwargs: (
+            [],
+            [{"oid": "123", "error": {"message": "Too big"}}],
+        )
+        with self.assertRaisesRegex(ValueError, "Too big"):
+            self._upload_additions([CommitOperationAdd("a.bin", b"a")])
+
+    def test_upload_errors_are_raised(self) -> None:
+        self.mock__upload_lfs_object.side_effect = ValueError("boom")
+        with self.assertRaisesRegex(RuntimeError, "Error while uploading 'a.bin'"):
+            self._upload_additions([CommitOperationAdd("a.bin", b"a")])
+
+    def test_error_does_not_wait_for_running_hashes(self) -> None:
+        self.mock_fetch_upload_modes.side_effect = ValueError("401 Unauthorized")
+        from_bytes = UploadInfo.from_bytes
+        release_slow_hash = threading.Event()
+        self.addCleanup(release_slow_hash.set)
+
+        def _slow_from_bytes(data: bytes) -> UploadInfo:
+            if data == b"slow":
+                # Still hashing when the preupload call fails
+                release_slow_hash.wait(timeout=5)
+            return from_bytes(data)
+
+        additions = [
+            CommitOperationAdd("slow.bin", b"slow"),
+            CommitOperationAdd("fast.bin", b"fast"),
+        ]
+        start = time.monotonic()
+        with patch.object(UploadInfo, "from_bytes", side_effect=_slow_from_bytes):
+            with self.assertRaisesRegex(ValueError, "401 Unauthorized"):
+                self._upload_additions(additions, num_hash_threads=2)
+        self.assertLess(time.monotonic() - start, 4)
+
+    def test_adaptive_concurrency(self) -> None:
+        controller = AdaptiveConcurrency(initial=1, max_concurrency=2)
+        additions = [
+            CommitOperationAdd("a.bin", b"a"),
+            CommitOperationAdd("b.bin", b"b"),
+        ]
+        self._upload_additions(additions, num_threads=controller)
+
+        self.assertEqual(sorted(self.uploaded), ["a.bin", "b.bin"])
+        self.assertEqual(controller._in_flight, 0)
+
+    def test_no_additions(self) -> None:
+        self.assertEqual(self._upload_additions([]), {})
+        self.mock_fetch_upload_modes.assert_not_called()
+
+
+class _ShortReadsFile(io.BufferedIOBase):
+    """File object returning at most 5 bytes per sized `read` call."""
+
+    def __init__(self, content: bytes) -> None:
+        self._buffer = io.BytesIO(content)
+
+    def read(self, size=-1) -> bytes:
+        return self._buffer.read(size if size is None or size < 0 else min(size, 5))
+
+    def tell(self) -> int:
+        return self._buffer.tell()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._buffer.seek(offset, whence)
+
+
+class TestStreamCommitPayload(unittest.TestCase):
+    def setUp(self) -> None:
+        self.operations = [
+            CommitOperationAdd("regular.txt", b"regular content"),
+            CommitOperationAdd('sub/dir/\u00e9t\u00e9 "quoted".txt', b"x" * 1000),
+            CommitOperationAdd("short_reads.txt", _ShortReadsFile(b"0123456789" * 7)),
+            CommitOperationAdd("empty.txt", b""),
+            CommitOperationAdd("model.bin", b"lfs content"),
+            CommitOperationDelete("old.txt"),
+            CommitOperationDelete("old_folder/"),
+        ]
+        self.upload_modes = {op.path_in_repo: "regular" for op in self.operations[:4]}
+        self.upload_modes["model.bin"] = "lfs"
+
+    def _stream(self) -> list:
+        return list(
+            stream_commit_payload(
+                operations=self.operations,
+                upload_modes=self.upload_modes,
+                commit_message="Commit",
+                commit_description="Description",
+                parent_commit="a" * 40,
+            )
+        )
+
+    def test_same_payload_as_prepare_commit_payload(self) -> None:
+        for chunk_size in (3, 30, 3 * 1024):
+            with self.subTest(chunk_size=chunk_size), patch(
+                "huggingface_hub._commit_api.B64_ENCODE_CHUNK_SIZE", chunk_size
+            ):
+                lines = b"".join(self._stream()).decode().splitlines()
+                expected = prepare_commit_payload(
+                    operations=self.operations,
+                    upload_modes=self.upload_modes,
+                    commit_message="Commit",
+                    commit_description="Description",
+                    parent_commit="a" * 40,
+                )
+                self.assertEqual([json.loads(line) for line in lines], list(expected))
+
+    def test_content_is_encoded_by_chunks(self) -> None:
+        self.operations = [CommitOperationAdd("file.txt", b"x" * 1000)]
+        self.upload_modes = {"file.txt": "regular"}
+        with patch("huggingface_hub._commit_api.B64_ENCODE_CHUNK_SIZE", 30):
+            chunks = self._stream()
+
+        # 30 bytes of content are encoded as 40 base64 characters
+        self.assertLessEqual(max(len(chunk) for chunk in chunks[3:-1]), 40)
+        content = json.loads(b"".join(chunks[2:]).decode())["value"]["content"]
+        self.assertEqual(base64.b64decode(content), b"x" * 1000)
+
+    def test_file_object_position_is_restored(self) -> None:
+        fileobj = BytesIO(b"header" + b"content")
+        fileobj.seek(6)
+        self.operations = [CommitOperationAdd("file.txt", fileobj)]
+        self.upload_modes = {"file.txt": "regular"}
+        lines = b"".join(self._stream()).decode().splitlines()
+
+        content = json.loads(lines[1])["value"]["content"]
+        self.assertEqual(base64.b64decode(content), b"content")
+        self.assertEqual(fileobj.tell(), 6)
@@ -11,11 +11,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
+import hashlib
+import io
 import os
+import pickle
 import re
 import stat
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 from unittest.mock import Mock, patch
 
 import pytest
@@ -29,15 +36,23 @@ from huggingface_hub.constants import (
 )
 from huggingface_hub.file_download import (
     _CACHED_NO_EXIST,
+    BatchDownloadError,
     _create_relative_symlink,
+    _get_etag_hasher,
+    _try_clone_file,
     cached_download,
     filename_to_url,
     get_hf_file_metadata,
     hf_hub_download,
+    hf_hub_download_many,
     hf_hub_url,
+    http_get,
+    mmap_cached_file,
+    parallel_http_get,
     try_to_load_from_cache,
 )
 from huggingface_hub.utils import (
+    AdaptiveConcurrency,
     EntryNotFoundError,
     GatedRepoError,
     LocalEntryNotFoundError,
@@ -60,6 +75,7 @@ from .testing_utils import (
     OfflineSimulationMode,
     offline,
     repo_name,
+    start_local_hub,
     with_production_testing,
     xfail_on_windows,
 )
@@ -563,6 +579,683 @@ class CreateSymlinkTest(unittest.TestCase):
                 _create_relative_symlink(src, dst)
 
 
+@pytest.mark.usefixtures("fx_cache_dir")
+class MaterializeBlobWithoutSymlinksTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.src = str(self.cache_dir / "blob")
+        self.dst = str(self.cache_dir / "snapshot_file")
+        with open(self.src, "wb") as f:
+            f.write(b"content")
+
+        patcher = patch(
+            "huggingface_hub.file_download.are_symlinks_supported", return_value=False
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_new_blob_is_hardlinked(self) -> None:
+        _create_relative_symlink(self.src, self.dst, new_blob=True)
+        self.assertFalse(os.path.islink(self.dst))
+        self.assertTrue(os.path.samefile(self.src, self.dst))
+
+    @patch("huggingface_hub.file_download.os.link", side_effect=OSError)
+    def test_new_blob_is_moved_if_no_hardlinks(self, mock: Mock) -> None:
+        _create_relative_symlink(self.src, self.dst, new_blob=True)
+        self.assertFalse(os.path.exists(self.src))
+        with open(self.dst, "rb") as f:
+            self.assertEqual(f.read(), b"content")
+
+    @patch("huggingface_hub.file_download._try_clone_file", return_value=True)
+    def test_existing_blob_is_cloned_first(self, mock_clone: Mock) -> None:
+        with patch("huggingface_hub.file_download.os.link") as mock_link:
+            _create_relative_symlink(self.src, self.dst, new_blob=False)
+        mock_clone.assert_called_once_with(self.src, self.dst)
+        mock_link.assert_not_called()
+
+    @patch("huggingface_hub.file_download._try_clone_file", return_value=False)
+    def test_existing_blob_is_hardlinked_if_no_clone(self, mock: Mock) -> None:
+        _create_relative_symlink(self.src, self.dst, new_blob=False)
+        self.assertTrue(os.path.samefile(self.src, self.dst))
+
+    @patch("huggingface_hub.file_download._try_clone_file", return_value=False)
+    @patch("huggingface_hub.file_download.os.link", side_effect=OSError)
+    def test_existing_blob_is_copied_as_last_resort(self, *mocks: Mock) -> None:
+        _create_relative_symlink(self.src, self.dst, new_blob=False)
+        self.assertFalse(os.path.samefile(self.src, self.dst))
+        with open(self.dst, "rb") as f:
+            self.assertEqual(f.read(), b"content")
+
+    def test_clone_not_supported(self) -> None:
+        mock_fcntl = Mock()
+        mock_fcntl.ioctl.side_effect = OSError("Operation not supported")
+        with patch("huggingface_hub.file_download.fcntl", mock_fcntl), patch(
+            "huggingface_hub.file_download.sys.platform", "linux"
+        ):
+            self.assertFalse(_try_clone_file(self.src, self.dst))
+        self.assertFalse(os.path.exists(self.dst))  # no leftover
+
+
+class HttpGetResumeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Content is streamed by chunks of 1MB: incomplete chunks are dropped on error
+        self.content = os.urandom(3 * 1024 * 1024)
+        self.server = start_local_hub(self)
+        self.url = self.server.add_file("/file.bin", self.content)
+
+    def _get_requests(self) -> list:
+        return [request for request in self.server.requests if request.method == "GET"]
+
+    def test_resume_after_connection_dropped(self) -> None:
+        self.server.interrupt_after = [1024 * 1024 + 10, 1024 * 1024 + 20]
+        temp_file = io.BytesIO()
+        http_get(self.url, temp_file)
+
+        self.assertEqual(temp_file.getvalue(), self.content)
+        self.assertEqual(
+            [request.headers.get("Range") for request in self._get_requests()],
+            [None, "bytes=1048576-", "bytes=2097152-"],
+        )
+
+    def test_resume_with_initial_resume_size(self) -> None:
+        self.server.interrupt_after = [1024 * 1024 + 10]
+        temp_file = io.BytesIO(self.content[:100])
+        temp_file.seek(100)
+        http_get(self.url, temp_file, resume_size=100)
+
+        self.assertEqual(temp_file.getvalue(), self.content)
+        self.assertEqual(
+            [request.headers.get("Range") for request in self._get_requests()],
+            ["bytes=100-", "bytes=1048676-"],
+        )
+
+    def test_restart_if_range_not_supported(self) -> None:
+        self.server.support_ranges = False
+        self.server.interrupt_after = [1024 * 1024 + 10]
+        temp_file = io.BytesIO()
+        http_get(self.url, temp_file)
+
+        self.assertEqual(temp_file.getvalue(), self.content)
+        self.assertEqual(len(self._get_requests()), 2)
+
+    def test_resume_budget_exhausted(self) -> None:
+        self.server.interrupt_after = [100] * 10
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            http_get(self.url, io.BytesIO())
+        self.assertEqual(len(self._get_requests()), 6)  # 1 + 5 resumes
+
+    @patch("huggingface_hub.file_download.HF_HUB_DOWNLOAD_STALL_TIMEOUT", 0)
+    @patch("huggingface_hub.file_download.HF_HUB_DOWNLOAD_MIN_THROUGHPUT", 10**12)
+    def test_stalled_download(self) -> None:
+        # Throughput never reaches 1TB/s => download considered as stalled
+        with self.assertRaises(requests.exceptions.Timeout):
+            http_get(self.url, io.BytesIO())
+        self.assertEqual(len(self._get_requests()), 6)  # 1 + 5 resumes
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class HttpGetIntegrityTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.content = os.urandom(1000)
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+        self.git_sha1 = hashlib.sha1(b"blob 1000\0" + self.content).hexdigest()
+        self.server = start_local_hub(self)
+        self.url = self.server.add_file("/file.bin", self.content)
+
+    def _num_get_requests(self) -> int:
+        return len([req for req in self.server.requests if req.method == "GET"])
+
+    def test_valid_sha256(self) -> None:
+        temp_file = io.BytesIO()
+        http_get(self.url, temp_file, expected_etag=self.sha256)
+        self.assertEqual(temp_file.getvalue(), self.content)
+
+    def test_valid_git_sha1(self) -> None:
+        temp_file = io.BytesIO()
+        http_get(self.url, temp_file, expected_etag=self.git_sha1, expected_size=1000)
+        self.assertEqual(temp_file.getvalue(), self.content)
+
+    def test_etag_not_a_hash(self) -> None:
+        # Not a content hash => no verification
+        temp_file = io.BytesIO()
+        http_get(self.url, temp_file, expected_etag="not-a-hash")
+        self.assertEqual(temp_file.getvalue(), self.content)
+
+    def test_corrupted_download(self) -> None:
+        temp_file = io.BytesIO()
+        with self.assertRaises(OSError):
+            http_get(self.url, temp_file, expected_etag="0" * 64)
+
+        # Retried once from scratch. Corrupted content is not kept.
+        self.assertEqual(self._num_get_requests(), 2)
+        self.assertEqual(temp_file.getvalue(), b"")
+
+    def test_corrupted_partial_file_is_downloaded_again(self) -> None:
+        incomplete_path = self.cache_dir / "file.bin.incomplete"
+        incomplete_path.write_bytes(b"0" * 100)  # corrupted data from previous run
+
+        with open(incomplete_path, "ab") as temp_file:
+            http_get(self.url, temp_file, resume_size=100, expected_etag=self.sha256)
+
+        self.assertEqual(incomplete_path.read_bytes(), self.content)
+        self.assertEqual(
+            [
+                req.headers.get("Range")
+                for req in self.server.requests
+                if req.method == "GET"
+            ],
+            ["bytes=100-", None],
+        )
+
+    def test_parallel_http_get_corrupted(self) -> None:
+        incomplete_path = str(self.cache_dir / "file.bin.incomplete")
+        with self.assertRaises(OSError):
+            parallel_http_get(
+                self.url,
+                incomplete_path,
+                expected_size=1000,
+                chunk_size=128,
+                expected_etag="0" * 64,
+            )
+        self.assertFalse(os.path.exists(incomplete_path))
+
+    @patch("huggingface_hub.file_download._get_etag_hasher", wraps=_get_etag_hasher)
+    def test_hf_hub_download_regular_file_verified(self, mock: Mock) -> None:
+        self.server.add_repo_file("user/repo", "config.json", self.content)
+
+        path = hf_hub_download("user/repo", "config.json", cache_dir=self.cache_dir)
+
+        self.assertEqual(Path(path).read_bytes(), self.content)
+        mock.assert_called_once_with(self.git_sha1, 1000)
+
+    def test_hf_hub_download_corrupted_file_not_cached(self) -> None:
+        self.server.add_repo_file("user/repo", "config.json", self.content)
+        for path in self.server.files:
+            self.server.files[path] = os.urandom(1000)  # served content is corrupted
+
+        with self.assertRaises(OSError):
+            hf_hub_download("user/repo", "config.json", cache_dir=self.cache_dir)
+
+        blob_path = self.cache_dir / "models--user--repo" / "blobs" / self.git_sha1
+        self.assertFalse(blob_path.exists())
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class RefsTTLTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.server.add_repo_file("user/repo", "config.json", b"{}")
+        self.ref_path = self.cache_dir / "models--user--repo" / "refs" / "main"
+
+        # First download populates the cache
+        self.path = self._download()
+        self.server.requests.clear()
+
+    def _download(self, **kwargs) -> str:
+        return hf_hub_download(
+            "user/repo", "config.json", cache_dir=self.cache_dir, **kwargs
+        )
+
+    def test_no_ttl_always_revalidate(self) -> None:
+        self.assertEqual(self._download(), self.path)
+        self.assertEqual(len(self.server.requests), 1)  # HEAD
+
+    @patch("huggingface_hub.file_download.HF_HUB_REFS_TTL", 3600)
+    def test_fresh_ref_no_network(self) -> None:
+        self.assertEqual(self._download(), self.path)
+        self.assertEqual(len(self.server.requests), 0)
+
+    @patch("huggingface_hub.file_download.HF_HUB_REFS_TTL", 3600)
+    def test_expired_ref_is_revalidated(self) -> None:
+        os.utime(self.ref_path, (time.time() - 7200, time.time() - 7200))
+
+        self.assertEqual(self._download(), self.path)
+        self.assertEqual(len(self.server.requests), 1)  # HEAD
+
+        # Ref is fresh again
+        self.assertGreater(self.ref_path.stat().st_mtime, time.time() - 60)
+        self._download()
+        self.assertEqual(len(self.server.requests), 1)
+
+    @patch("huggingface_hub.file_download.HF_HUB_REFS_TTL", 3600)
+    def test_fresh_ref_but_file_not_cached(self) -> None:
+        self.server.add_repo_file("user/repo", "other.json", b"[]")
+        hf_hub_download("user/repo", "other.json", cache_dir=self.cache_dir)
+        self.assertEqual(len(self.server.requests), 2)  # HEAD + GET
+
+    @patch("huggingface_hub.file_download.HF_HUB_REFS_TTL", 3600)
+    def test_fresh_ref_force_download(self) -> None:
+        self._download(force_download=True)
+        self.assertEqual(len(self.server.requests), 2)  # HEAD + GET
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+@patch("huggingface_hub.file_download.HF_HUB_REFS_TTL", 3600)
+@patch("huggingface_hub.file_download.HF_HUB_NO_EXIST_TTL", 3600)
+class NoExistCacheTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.server.add_repo_file("user/repo", "config.json", b"{}")
+        self.repo_path = self.cache_dir / "models--user--repo"
+        self.no_exist_path = self.repo_path / ".no_exist" / ("a" * 40) / "missing.json"
+
+    def _download_missing(self, revision: Optional[str] = None) -> None:
+        with self.assertRaises(EntryNotFoundError):
+            hf_hub_download(
+                "user/repo", "missing.json", cache_dir=self.cache_dir, revision=revision
+            )
+
+    def test_missing_file_cached(self) -> None:
+        self._download_missing()
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertTrue(self.no_exist_path.is_file())
+
+        # No network calls on second call
+        self._download_missing()
+        self._download_missing(revision="a" * 40)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_missing_file_expired(self) -> None:
+        self._download_missing()
+        os.utime(self.no_exist_path, (time.time() - 7200, time.time() - 7200))
+
+        self._download_missing()
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_no_exist_deleted_when_ref_moves(self) -> None:
+        self._download_missing()
+        self.assertTrue(self.no_exist_path.is_file())
+
+        # New commit on main
+        self.server.add_repo_file(
+            "user/repo", "config.json", b"{}", commit_hash="b" * 40
+        )
+        os.utime(self.repo_path / "refs" / "main", (0, 0))  # expire ref
+        hf_hub_download("user/repo", "config.json", cache_dir=self.cache_dir)
+
+        self.assertEqual((self.repo_path / "refs" / "main").read_text(), "b" * 40)
+        self.assertFalse(self.no_exist_path.parent.exists())
+
+    def test_no_exist_kept_if_still_referenced(self) -> None:
+        self._download_missing()
+        (self.repo_path / "refs" / "v1.0").write_text("a" * 40)
+
+        self.server.add_repo_file(
+            "user/repo", "config.json", b"{}", commit_hash="b" * 40
+        )
+        os.utime(self.repo_path / "refs" / "main", (0, 0))  # expire ref
+        hf_hub_download("user/repo", "config.json", cache_dir=self.cache_dir)
+
+        self.assertTrue(self.no_exist_path.is_file())
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class HfHubDownloadManyTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.filenames = ["config.json", "tokenizer.json", "model.bin"]
+        for filename in self.filenames:
+            self.server.add_repo_file("user/repo", filename, filename.encode())
+
+    def test_download_many(self) -> None:
+        paths = hf_hub_download_many(
+            "user/repo", self.filenames, cache_dir=self.cache_dir
+        )
+
+        self.assertEqual(list(paths.keys()), self.filenames)
+        for filename, path in paths.items():
+            self.assertEqual(Path(path).read_bytes(), filename.encode())
+            self.assertIn("a" * 40, path)  # all from same snapshot
+
+        # Revision resolved once. All files then requested at the resolved commit.
+        requested_paths = [request.path for request in self.server.requests]
+        self.assertEqual(len([p for p in requested_paths if "/main/" in p]), 1)
+        self.assertEqual(len(requested_paths), 1 + 2 * 3)  # 1 HEAD + (HEAD+GET) x 3
+        ref_path = self.cache_dir / "models--user--repo" / "refs" / "main"
+        self.assertEqual(ref_path.read_text(), "a" * 40)
+
+    def test_download_many_collect_errors(self) -> None:
+        with self.assertRaises(BatchDownloadError) as cm:
+            hf_hub_download_many(
+                "user/repo",
+                ["missing.json", *self.filenames, "other_missing.json"],
+                cache_dir=self.cache_dir,
+            )
+
+        # All existing files have been downloaded
+        self.assertEqual(list(cm.exception.paths.keys()), self.filenames)
+        self.assertEqual(
+            list(cm.exception.errors.keys()), ["missing.json", "other_missing.json"]
+        )
+        for error in cm.exception.errors.values():
+            self.assertIsInstance(error, EntryNotFoundError)
+        self.assertIn("2 out of 5 files", str(cm.exception))
+
+    def test_batch_download_error_is_picklable(self) -> None:
+        error = BatchDownloadError(
+            "user/repo", {"a.json": "/path/to/a.json"}, {"b.json": ValueError("boom")}
+        )
+        unpickled = pickle.loads(pickle.dumps(error))
+        self.assertEqual(unpickled.paths, error.paths)
+        self.assertEqual(list(unpickled.errors.keys()), ["b.json"])
+        self.assertEqual(str(unpickled), str(error))
+        self.assertIn("1 out of 2 files", str(unpickled))
+        self.assertEqual(str(copy.copy(error)), str(error))
+
+    def test_download_many_from_cache(self) -> None:
+        hf_hub_download_many("user/repo", self.filenames, cache_dir=self.cache_dir)
+        self.server.requests.clear()
+
+        paths = hf_hub_download_many(
+            "user/repo", self.filenames, cache_dir=self.cache_dir, revision="a" * 40
+        )
+        self.assertEqual(len(paths), 3)
+        self.assertEqual(len(self.server.requests), 0)
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class HeadCallCongestionTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.server.add_repo_file("user/repo", "model.bin", b"weights")
+
+    def test_timeout_is_the_cause_of_the_error(self) -> None:
+        timeout = requests.exceptions.ReadTimeout("HEAD timed out")
+        with patch(
+            "huggingface_hub.file_download.get_hf_file_metadata", side_effect=timeout
+        ):
+            with self.assertRaises(LocalEntryNotFoundError) as context:
+                hf_hub_download("user/repo", "model.bin", cache_dir=self.cache_dir)
+        self.assertIs(context.exception.__cause__, timeout)
+
+    def test_adaptive_concurrency_retries_head_timeout(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, max_concurrency=2)
+        with patch(
+            "huggingface_hub.file_download.get_hf_file_metadata",
+            side_effect=_timeout_once(get_hf_file_metadata),
+        ) as mock_metadata, patch(
+            "huggingface_hub.utils._concurrency._CONGESTION_RETRY_DELAY", 0
+        ):
+            path = controller.run(
+                lambda filename: hf_hub_download(
+                    "user/repo", filename, cache_dir=self.cache_dir
+                ),
+                "model.bin",
+            )
+        self.assertEqual(Path(path).read_bytes(), b"weights")
+        self.assertEqual(mock_metadata.call_count, 2)
+        self.assertEqual(controller.limit, 1)  # congestion recorded
+
+
+def _timeout_once(fn):
+    calls = []
+
+    def _inner(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise requests.exceptions.ReadTimeout("HEAD timed out")
+        return fn(*args, **kwargs)
+
+    return _inner
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class SharedBlobsTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.etag = self.server.add_repo_file(
+            "user/base", "model.bin", b"weights", lfs=True
+        )
+        self.server.add_repo_file(
+            "user/finetuned", "model.bin", b"weights", commit_hash="b" * 40, lfs=True
+        )
+        self.shared_blob_path = self.cache_dir / "blobs" / self.etag
+
+        shared_blobs_patcher = patch(
+            "huggingface_hub.file_download.HF_HUB_ENABLE_SHARED_BLOBS", True
+        )
+        shared_blobs_patcher.start()
+        self.addCleanup(shared_blobs_patcher.stop)
+
+    def _gets(self) -> int:
+        return sum(1 for request in self.server.requests if request.method == "GET")
+
+    def test_shared_blob_downloaded_once(self) -> None:
+        base_path = hf_hub_download("user/base", "model.bin", cache_dir=self.cache_dir)
+        self.assertEqual(self._gets(), 1)
+        self.assertTrue(self.shared_blob_path.is_file())
+
+        finetuned_path = hf_hub_download(
+            "user/finetuned", "model.bin", cache_dir=self.cache_dir
+        )
+        self.assertEqual(self._gets(), 1)  # not downloaded again
+
+        for repo_folder, path in [
+            ("models--user--base", base_path),
+            ("models--user--finetuned", finetuned_path),
+        ]:
+            repo_blob_path = self.cache_dir / repo_folder / "blobs" / self.etag
+            self.assertTrue(repo_blob_path.is_symlink())
+            self.assertEqual(Path(path).resolve(), self.shared_blob_path.resolve())
+            self.assertEqual(Path(path).read_bytes(), b"weights")
+
+    def test_symlink_support_only_checked_in_cache_dir(self) -> None:
+        # Parent of the cache may not be writable: nothing must be created there
+        checked_dirs = []
+
+        def _are_symlinks_supported(cache_dir=None) -> bool:
+            checked_dirs.append(str(cache_dir))
+            return True
+
+        with patch(
+            "huggingface_hub.file_download.are_symlinks_supported",
+            side_effect=_are_symlinks_supported,
+        ):
+            hf_hub_download("user/base", "model.bin", cache_dir=self.cache_dir)
+            hf_hub_download("user/finetuned", "model.bin", cache_dir=self.cache_dir)
+
+        self.assertEqual(set(checked_dirs), {str(self.cache_dir)})
+        self.assertEqual(self._gets(), 1)
+
+    def test_non_lfs_files_not_shared(self) -> None:
+        self.server.add_repo_file("user/base", "config.json", b"{}")
+        path = hf_hub_download("user/base", "config.json", cache_dir=self.cache_dir)
+        self.assertEqual(
+            Path(path).resolve().parent,
+            (self.cache_dir / "models--user--base" / "blobs").resolve(),
+        )
+        self.assertFalse((self.cache_dir / "blobs").exists())
+
+    def test_disabled(self) -> None:
+        with patch("huggingface_hub.file_download.HF_HUB_ENABLE_SHARED_BLOBS", False):
+            hf_hub_download("user/base", "model.bin", cache_dir=self.cache_dir)
+            hf_hub_download("user/finetuned", "model.bin", cache_dir=self.cache_dir)
+        self.assertEqual(self._gets(), 2)
+        self.assertFalse((self.cache_dir / "blobs").exists())
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class MmapCachedFileTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.content = os.urandom(10_000)
+        self.server.add_repo_file("user/repo", "model.bin", self.content)
+        self.server.add_repo_file("user/repo", "empty.txt", b"")
+
+        for filename in ("model.bin", "empty.txt"):
+            hf_hub_download("user/repo", filename, cache_dir=self.cache_dir)
+
+    def _mmap(self, filename: str = "model.bin", **kwargs):
+        return mmap_cached_file(
+            "user/repo", filename, cache_dir=self.cache_dir, **kwargs
+        )
+
+    def test_read_content(self) -> None:
+        with self._mmap() as cached:
+            self.assertEqual(len(cached), len(self.content))
+            self.assertEqual(bytes(cached.view[100:200]), self.content[100:200])
+            self.assertTrue(cached.view.readonly)
+            self.assertFalse(os.path.islink(cached.blob_path))
+        self.assertTrue(cached.closed)
+
+    def test_not_cached(self) -> None:
+        self.assertIsNone(self._mmap("missing.bin"))
+        self.assertIsNone(self._mmap(revision="b" * 40))
+
+    def test_empty_file(self) -> None:
+        with self._mmap("empty.txt") as cached:
+            self.assertEqual(len(cached), 0)
+            self.assertEqual(bytes(cached.view), b"")
+
+    def test_handles_share_map(self) -> None:
+        first = self._mmap()
+        second = self._mmap(revision="a" * 40)
+        self.assertIs(first._shared, second._shared)
+        shared_map = first._shared.mmap
+        assert shared_map is not None
+
+        first.close()
+        first.close()  # closing twice is a no-op
+        self.assertFalse(shared_map.closed)
+        self.assertEqual(bytes(second.view[:10]), self.content[:10])
+
+        second.close()
+        self.assertTrue(shared_map.closed)
+
+        # New handle => new map
+        with self._mmap() as third:
+            self.assertIsNot(third._shared.mmap, shared_map)
+
+    def test_derived_views_keep_map_open(self) -> None:
+        cached = self._mmap()
+        header = cached.view[:8]
+        cached.close()  # no error
+        self.assertEqual(bytes(header), self.content[:8])
+
+    def test_concurrent_handles(self) -> None:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            handles = list(executor.map(lambda _: self._mmap(), range(32)))
+        self.assertEqual(len({id(handle._shared) for handle in handles}), 1)
+        self.assertEqual(handles[0]._shared.refcount, 32)
+        for handle in handles:
+            handle.close()
+        self.assertTrue(handles[0]._shared.mmap.closed)
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class ParallelHttpGetTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.content = os.urandom(1000)
+        self.server = start_local_hub(self)
+        self.url = self.server.add_file("/file.bin", self.content)
+        self.incomplete_path = str(self.cache_dir / "file.bin.incomplete")
+
+    def _range_requests(self) -> list:
+        return sorted(
+            request.headers["Range"]
+            for request in self.server.requests
+            if request.method == "GET"
+        )
+
+    def test_parallel_http_get(self) -> None:
+        parallel_http_get(
+            self.url,
+            self.incomplete_path,
+            expected_size=len(self.content),
+            chunk_size=128,
+            num_threads=4,
+        )
+        self.assertEqual(Path(self.incomplete_path).read_bytes(), self.content)
+
+        # 8 ranges requested (7 of 128 bytes and last one of 104 bytes)
+        self.assertEqual(len(self._range_requests()), 8)
+        self.assertIn("bytes=896-999", self._range_requests())
+
+        # Ranges state is deleted once download is complete
+        self.assertFalse(os.path.exists(self.incomplete_path + ".ranges"))
+
+    def test_parallel_http_get_resume(self) -> None:
+        # Simulate an interrupted download: only ranges 0 and 2 have been downloaded
+        with open(self.incomplete_path, "wb") as f:
+            f.write(self.content[:256] + b"0" * 744)
+        with open(self.incomplete_path + ".ranges", "w") as f:
+            f.write('{"size": 1000, "chunk_size": 128, "completed": [0, 1]}')
+
+        parallel_http_get(
+            self.url,
+            self.incomplete_path,
+            expected_size=len(self.content),
+            chunk_size=128,
+            resume=True,
+        )
+        self.assertEqual(Path(self.incomplete_path).read_bytes(), self.content)
+        self.assertEqual(len(self._range_requests()), 6)  # 2 ranges already there
+        self.assertNotIn("bytes=0-127", self._range_requests())
+
+    def test_parallel_http_get_no_resume(self) -> None:
+        with open(self.incomplete_path + ".ranges", "w") as f:
+            f.write('{"size": 1000, "chunk_size": 128, "completed": [0, 1]}')
+        with open(self.incomplete_path, "wb") as f:
+            f.write(b"0" * 1000)
+
+        parallel_http_get(
+            self.url,
+            self.incomplete_path,
+            expected_size=len(self.content),
+            chunk_size=128,
+            resume=False,
+        )
+        self.assertEqual(Path(self.incomplete_path).read_bytes(), self.content)
+        self.assertEqual(len(self._range_requests()), 8)
+
+    def test_parallel_http_get_range_not_supported(self) -> None:
+        self.server.support_ranges = False
+        with self.assertRaises(ValueError):
+            parallel_http_get(
+                self.url,
+                self.incomplete_path,
+                expected_size=len(self.content),
+                chunk_size=128,
+            )
+
+    def test_hf_hub_download_in_parallel(self) -> None:
+        etag = self.server.add_repo_file(
+            "user/repo", "model.bin", self.content, lfs=True
+        )
+
+        with patch(
+            "huggingface_hub.file_download.HF_HUB_ENABLE_PARALLEL_DOWNLOAD", True
+        ), patch(
+            "huggingface_hub.file_download.PARALLEL_DOWNLOAD_CHUNK_SIZE", 128
+        ), patch(
+            "huggingface_hub.file_download.parallel_http_get", wraps=parallel_http_get
+        ) as mock_parallel_http_get:
+            path = hf_hub_download("user/repo", "model.bin", cache_dir=self.cache_dir)
+
+        mock_parallel_http_get.assert_called_once()
+        self.assertEqual(Path(path).read_bytes(), self.content)
+        self.assertTrue(
+            (self.cache_dir / "models--user--repo" / "blobs" / etag).is_file()
+        )
+
+
 def _recursive_chmod(path: str, mode: int) -> None:
     # Taken from https://stackoverflow.com/a/2853934
     for root, dirs, files in os.walk(path):
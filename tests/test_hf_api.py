@@ -11,9 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 import os
 import re
 import shutil
+import struct
 import subprocess
 import tempfile
 import time
@@ -23,7 +25,7 @@ import warnings
 from functools import partial
 from io import BytesIO
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from unittest.mock import Mock, patch
 from urllib.parse import quote
 
@@ -57,6 +59,7 @@ from huggingface_hub.hf_api import (
     RepoFile,
     RepoUrl,
     SpaceInfo,
+    _prepare_upload_folder_commit,
     erase_from_credential_store,
     read_from_credential_store,
     repo_type_and_id_from_hf_id,
@@ -68,7 +71,9 @@ from huggingface_hub.utils import (
     HfHubHTTPError,
     RepositoryNotFoundError,
     RevisionNotFoundError,
+    SafetensorsParsingError,
     SoftTemporaryDirectory,
+    TensorInfo,
     logging,
 )
 from huggingface_hub.utils.endpoint_helpers import (
@@ -97,6 +102,7 @@ from .testing_utils import (
     require_git_lfs,
     retry_endpoint,
     rmtree_with_retry,
+    start_local_hub,
     use_tmp_repo,
     with_production_testing,
 )
@@ -2494,8 +2500,9 @@ class TestSpaceAPIMocked(unittest.TestCase):
         self.repo_id = "fake_repo_id"
         return super().setUp()
 
-    @patch("huggingface_hub.hf_api.requests.post")
-    def test_create_space_with_hardware(self, post_mock: Mock) -> None:
+    @patch("huggingface_hub.hf_api.get_session")
+    def test_create_space_with_hardware(self, get_session_mock: Mock) -> None:
+        post_mock = get_session_mock().post
         self.api.create_repo(
             self.repo_id,
             repo_type="space",
@@ -2515,8 +2522,9 @@ class TestSpaceAPIMocked(unittest.TestCase):
             },
         )
 
-    @patch("huggingface_hub.hf_api.requests.post")
-    def test_request_space_hardware(self, post_mock: Mock) -> None:
+    @patch("huggingface_hub.hf_api.get_session")
+    def test_request_space_hardware(self, get_session_mock: Mock) -> None:
+        post_mock = get_session_mock().post
         self.api.request_space_hardware(self.repo_id, SpaceHardware.T4_MEDIUM)
         post_mock.assert_called_once_with(
             f"{self.api.endpoint}/api/spaces/{self.repo_id}/hardware",
@@ -2676,3 +2684,198 @@ class RepoUrlTest(unittest.TestCase):
         self.assertEqual(url.url, "https://huggingface.co/gpt2")
         self.assertIsInstance(url, RepoUrl)
         self.assertNotIsInstance(url.url, RepoUrl)
+
+
+def _build_safetensors(
+    tensors: Dict[str, Tuple[str, Tuple[int, ...], int]],
+    metadata: Optional[Dict[str, str]] = None,
+    padding: int = 0,
+) -> bytes:
+    """Build a safetensors file from `{name: (dtype, shape, nbytes)}`."""
+    header: Dict = {"__metadata__": metadata} if metadata is not None else {}
+    offset = 0
+    for name, (dtype, shape, nbytes) in tensors.items():
+        header[name] = {
+            "dtype": dtype,
+            "shape": list(shape),
+            "data_offsets": [offset, offset + nbytes],
+        }
+        offset += nbytes
+    header_bytes = json.dumps(header).encode() + b" " * padding
+    return struct.pack("<Q", len(header_bytes)) + header_bytes + b"\0" * offset
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class SafetensorsMetadataTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.api = HfApi(endpoint=self.server.url)
+
+        self.shard_1 = _build_safetensors(
+            {"embed.weight": ("F16", (100, 32), 6400)}, metadata={"format": "pt"}
+        )
+        self.shard_2 = _build_safetensors(
+            {"lm_head.weight": ("F16", (100, 32), 6400), "step": ("I64", (), 8)}
+        )
+        self.server.add_repo_file(
+            "user/repo", "model-00001-of-00002.safetensors", self.shard_1
+        )
+        self.server.add_repo_file(
+            "user/repo", "model-00002-of-00002.safetensors", self.shard_2
+        )
+        siblings = [
+            "config.json",
+            "model-00001-of-00002.safetensors",
+            "model-00002-of-00002.safetensors",
+        ]
+        self.server.add_file(
+            "/api/models/user/repo",
+            json.dumps(
+                {
+                    "id": "user/repo",
+                    "sha": "a" * 40,
+                    "siblings": [{"rfilename": name} for name in siblings],
+                }
+            ).encode(),
+        )
+
+    def test_get_safetensors_metadata(self) -> None:
+        metadata = self.api.get_safetensors_metadata(
+            "user/repo", cache_dir=self.cache_dir
+        )
+        self.assertEqual(metadata.commit_hash, "a" * 40)
+        self.assertTrue(metadata.sharded)
+        self.assertEqual(
+            metadata.weight_map,
+            {
+                "embed.weight": "model-00001-of-00002.safetensors",
+                "lm_head.weight": "model-00002-of-00002.safetensors",
+                "step": "model-00002-of-00002.safetensors",
+            },
+        )
+        self.assertEqual(metadata.parameter_count, {"F16": 6400, "I64": 1})
+        self.assertEqual(metadata.nbytes, 12808)
+
+        shard_1 = metadata.files["model-00001-of-00002.safetensors"]
+        self.assertEqual(shard_1.metadata, {"format": "pt"})
+        self.assertEqual(
+            shard_1.tensors["embed.weight"],
+            TensorInfo(dtype="F16", shape=(100, 32), data_offsets=(0, 6400)),
+        )
+        self.assertEqual(shard_1.data_start, len(self.shard_1) - 6400)
+
+        # Headers are read from the commit, only the first bytes of each file
+        for request in self.server.requests:
+            if request.method == "GET" and "Range" in request.headers:
+                self.assertIn(f"/resolve/{'a' * 40}/", request.path)
+                self.assertEqual(request.headers["Range"], "bytes=0-99999")
+
+    def test_get_safetensors_metadata_filter_patterns(self) -> None:
+        metadata = self.api.get_safetensors_metadata(
+            "user/repo", ignore_patterns="model-00002-*", cache_dir=self.cache_dir
+        )
+        self.assertEqual(list(metadata.files), ["model-00001-of-00002.safetensors"])
+        self.assertFalse(metadata.sharded)
+
+    def test_large_header_fetched_in_2_requests(self) -> None:
+        content = _build_safetensors({"a": ("F32", (2,), 8)}, padding=150_000)
+        self.server.add_repo_file("user/repo", "big.safetensors", content)
+
+        metadata = self.api.parse_safetensors_file_metadata(
+            "user/repo", "big.safetensors"
+        )
+        self.assertEqual(metadata.tensors["a"].shape, (2,))
+        ranges = [r.headers["Range"] for r in self.server.requests if r.method == "GET"]
+        header_end = len(content) - 8
+        self.assertEqual(ranges, ["bytes=0-99999", f"bytes=100000-{header_end - 1}"])
+
+    def test_server_without_range_support(self) -> None:
+        self.server.support_ranges = False
+        metadata = self.api.parse_safetensors_file_metadata(
+            "user/repo", "model-00002-of-00002.safetensors"
+        )
+        self.assertEqual(set(metadata.tensors), {"lm_head.weight", "step"})
+
+    def test_read_from_local_cache(self) -> None:
+        hf_hub_download(
+            "user/repo", "model-00001-of-00002.safetensors", cache_dir=self.cache_dir
+        )
+        self.server.requests.clear()
+
+        metadata = self.api.parse_safetensors_file_metadata(
+            "user/repo",
+            "model-00001-of-00002.safetensors",
+            revision="a" * 40,
+            cache_dir=self.cache_dir,
+        )
+        self.assertEqual(set(metadata.tensors), {"embed.weight"})
+        self.assertEqual(self.server.requests, [])
+
+    def test_invalid_header(self) -> None:
+        self.server.add_repo_file(
+            "user/repo", "invalid.safetensors", struct.pack("<Q", 5) + b"{not json"
+        )
+        with self.assertRaises(SafetensorsParsingError):
+            self.api.parse_safetensors_file_metadata("user/repo", "invalid.safetensors")
+
+    def test_truncated_header(self) -> None:
+        self.server.add_repo_file(
+            "user/repo", "truncated.safetensors", struct.pack("<Q", 500) + b"{}"
+        )
+        with self.assertRaises(SafetensorsParsingError):
+            self.api.parse_safetensors_file_metadata(
+                "user/repo", "truncated.safetensors"
+            )
+
+    def test_header_too_big(self) -> None:
+        self.server.add_repo_file(
+            "user/repo", "huge.safetensors", struct.pack("<Q", 2**40) + b"{}"
+        )
+        with self.assertRaises(SafetensorsParsingError):
+            self.api.parse_safetensors_file_metadata("user/repo", "huge.safetensors")
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class PrepareUploadFolderCommitTest(unittest.TestCase):
+    cache_dir: Path
+
+    def test_filter_before_creating_operations(self) -> None:
+        (self.cache_dir / "logs").mkdir()
+        (self.cache_dir / "logs" / "train.log").write_text("log")
+        (self.cache_dir / "optimizer.pt").write_bytes(b"optimizer")
+        (self.cache_dir / "model.bin").write_bytes(b"model")
+
+        with patch(
+            "huggingface_hub.hf_api.CommitOperationAdd", wraps=CommitOperationAdd
+        ) as mock_operation:
+            operations = _prepare_upload_folder_commit(
+                self.cache_dir,
+                path_in_repo="checkpoint",
+                ignore_patterns=["*.pt", "checkpoint/logs/*"],
+            )
+        # Operations are created only for the files to upload
+        self.assertEqual(mock_operation.call_count, 1)
+
+        self.assertEqual(
+            [(op.path_in_repo, op.path_or_fileobj) for op in operations],
+            [("checkpoint/model.bin", str(self.cache_dir / "model.bin"))],
+        )
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class UploadFolderNumThreadsPerFileTest(unittest.TestCase):
+    cache_dir: Path
+
+    @patch("huggingface_hub.hf_api.upload_additions", side_effect=RuntimeError("stop"))
+    def test_num_threads_per_file_passed_through(self, mock: Mock) -> None:
+        (self.cache_dir / "model.bin").write_bytes(b"model")
+
+        with self.assertRaises(RuntimeError):
+            HfApi(token="fake_token").upload_folder(
+                repo_id="user/repo",
+                folder_path=self.cache_dir,
+                num_threads_per_file=16,
+            )
+        self.assertEqual(mock.call_args.kwargs["num_threads_per_file"], 16)
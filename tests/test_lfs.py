@@ -1,9 +1,16 @@
+import json
 import os
+import time
 import unittest
 from hashlib import sha256
 from io import BytesIO
+from pathlib import Path
+from typing import List
+from unittest.mock import Mock, patch
 
-from huggingface_hub.lfs import SliceFileObj, UploadInfo
+import pytest
+
+from huggingface_hub.lfs import SliceFileObj, UploadInfo, _upload_multi_part
 from huggingface_hub.utils import SoftTemporaryDirectory
 
 
@@ -40,6 +47,136 @@ class TestUploadInfo(unittest.TestCase):
         self.assertEqual(upload_info.sha256, self.sha)
 
 
+@pytest.mark.usefixtures("fx_cache_dir")
+class TestUploadInfoHashCache(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.path = self.cache_dir / "file.bin"
+        self.path.write_bytes(b"content" * 1000)
+        self.sha_fileobj = Mock(side_effect=lambda f: sha256(f.read()).digest())
+
+        for patcher in (
+            patch(
+                "huggingface_hub.utils._cache_assets.HUGGINGFACE_ASSETS_CACHE",
+                self.cache_dir / "assets",
+            ),
+            patch("huggingface_hub.utils._hash_cache.HASH_CACHE_MIN_FILE_SIZE", 0),
+            patch("huggingface_hub.utils._hash_cache._pruned", False),
+            patch("huggingface_hub.lfs.sha_fileobj", self.sha_fileobj),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _num_hashes(self) -> int:
+        return self.sha_fileobj.call_count
+
+    def test_unchanged_file_is_not_hashed_again(self) -> None:
+        first = UploadInfo.from_path(str(self.path))
+        second = UploadInfo.from_path(str(self.path))
+        self.assertEqual(first, second)
+        self.assertEqual(second.sha256, sha256(b"content" * 1000).digest())
+        self.assertEqual(second.sample, (b"content" * 1000)[:512])
+        self.assertEqual(self._num_hashes(), 1)
+
+        entries = list((self.cache_dir / "assets").glob("**/*.json"))
+        self.assertEqual(len(entries), 1)
+
+    def test_modified_file_is_hashed_again(self) -> None:
+        UploadInfo.from_path(str(self.path))
+
+        # Same size, different content and modification time
+        mtime_ns = self.path.stat().st_mtime_ns
+        self.path.write_bytes(b"CONTENT" * 1000)
+        os.utime(self.path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+        upload_info = UploadInfo.from_path(str(self.path))
+        self.assertEqual(upload_info.sha256, sha256(b"CONTENT" * 1000).digest())
+        self.assertEqual(self._num_hashes(), 2)
+
+    def test_rewritten_file_with_restored_mtime_is_hashed_again(self) -> None:
+        UploadInfo.from_path(str(self.path))
+
+        # Same size and modification time (e.g. `cp -p`): change time differs
+        stat = self.path.stat()
+        time.sleep(0.01)
+        self.path.write_bytes(b"CONTENT" * 1000)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.path.stat().st_mtime_ns, stat.st_mtime_ns)
+
+        upload_info = UploadInfo.from_path(str(self.path))
+        self.assertEqual(upload_info.sha256, sha256(b"CONTENT" * 1000).digest())
+        self.assertEqual(self._num_hashes(), 2)
+
+    def _entries(self) -> List[Path]:
+        return list((self.cache_dir / "assets").glob("**/*.json"))
+
+    def test_entries_of_deleted_files_are_pruned(self) -> None:
+        other_path = self.cache_dir / "other.bin"
+        other_path.write_bytes(b"other")
+        UploadInfo.from_path(str(other_path))
+        other_path.unlink()
+        self.assertEqual(len(self._entries()), 1)
+
+        # Pruned once per process
+        with patch("huggingface_hub.utils._hash_cache._pruned", False):
+            UploadInfo.from_path(str(self.path))
+        self.assertEqual(len(self._entries()), 1)
+        self.assertEqual(
+            json.loads(self._entries()[0].read_text())["path"], str(self.path)
+        )
+
+    def test_old_entries_are_pruned(self) -> None:
+        UploadInfo.from_path(str(self.path))
+        old = time.time() - 31 * 24 * 3600
+        os.utime(self._entries()[0], (old, old))
+
+        other_path = self.cache_dir / "other.bin"
+        other_path.write_bytes(b"other")
+        with patch("huggingface_hub.utils._hash_cache._pruned", False):
+            UploadInfo.from_path(str(other_path))
+        self.assertEqual(len(self._entries()), 1)
+
+    def test_least_recently_used_entries_are_pruned(self) -> None:
+        paths = []
+        for index in range(3):
+            path = self.cache_dir / f"file_{index}.bin"
+            path.write_bytes(b"%d" % index)
+            paths.append(path)
+        UploadInfo.from_path(str(paths[0]))
+        UploadInfo.from_path(str(paths[1]))
+        for age, entry in enumerate(sorted(self._entries(), key=os.path.getmtime)):
+            os.utime(entry, (time.time() - 100 + age, time.time() - 100 + age))
+
+        with patch("huggingface_hub.utils._hash_cache._pruned", False), patch(
+            "huggingface_hub.utils._hash_cache.HASH_CACHE_MAX_ENTRIES", 2
+        ):
+            UploadInfo.from_path(str(paths[2]))
+        kept = {json.loads(entry.read_text())["path"] for entry in self._entries()}
+        self.assertEqual(kept, {str(paths[1]), str(paths[2])})
+
+    def test_relative_and_absolute_paths_share_entry(self) -> None:
+        UploadInfo.from_path(str(self.path))
+        with patch("os.getcwd", return_value=str(self.cache_dir)):
+            UploadInfo.from_path("file.bin")
+        self.assertEqual(self._num_hashes(), 1)
+
+    def test_small_files_are_not_cached(self) -> None:
+        with patch(
+            "huggingface_hub.utils._hash_cache.HASH_CACHE_MIN_FILE_SIZE", 1024 * 1024
+        ):
+            UploadInfo.from_path(str(self.path))
+            UploadInfo.from_path(str(self.path))
+        self.assertEqual(self._num_hashes(), 2)
+
+    def test_cache_disabled(self) -> None:
+        with patch("huggingface_hub.constants.HF_HUB_DISABLE_HASH_CACHE", True):
+            UploadInfo.from_path(str(self.path))
+            UploadInfo.from_path(str(self.path))
+        self.assertEqual(self._num_hashes(), 2)
+        self.assertFalse((self.cache_dir / "assets").exists())
+
+
 class TestSliceFileObj(unittest.TestCase):
     def setUp(self) -> None:
         self.content = b"RANDOM self.content uauabciabeubahveb" * 1024
@@ -186,3 +323,200 @@ class TestSliceFileObj(unittest.TestCase):
                     fileobj_slice.seek(-200, os.SEEK_END)
                     self.assertEqual(fileobj_slice.tell(), 0)
                     self.assertEqual(fileobj_slice.fileobj.tell(), 100)
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class TestUploadMultiPart(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.content = b"0123456789" * 10  # 100 bytes => 7 parts of 16 bytes
+        self.chunk_size = 16
+        self.upload_info = UploadInfo.from_bytes(self.content)
+        self.header = {
+            str(idx + 1): f"https://part/{idx + 1}?uploadId=upload_123"
+            for idx in range(7)
+        }
+        self.uploaded = {}
+
+        # Journal of uploaded parts is saved in a temporary assets cache
+        self.patcher = patch(
+            "huggingface_hub.utils._cache_assets.HUGGINGFACE_ASSETS_CACHE",
+            self.cache_dir,
+        )
+        self.patcher.start()
+        self.journal_dir = (
+            self.cache_dir / "huggingface_hub" / "lfs" / "multipart_uploads"
+        )
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+
+    def _mocked_http_backoff(self, method: str, url: str, data: bytes, **kwargs):
+        part_number = url.split("/")[-1].split("?")[0]
+        self.uploaded[part_number] = data
+        response = Mock()
+        response.headers = {"etag": f"etag-{part_number}"}
+        return response
+
+    @patch("huggingface_hub.lfs.get_session")
+    @patch("huggingface_hub.lfs.http_backoff")
+    def test_upload_parts_concurrently(
+        self, mock_http_backoff: Mock, mock_get_session: Mock
+    ) -> None:
+        mock_http_backoff.side_effect = self._mocked_http_backoff
+        fileobj = BytesIO(self.content)
+
+        _upload_multi_part(
+            completion_url="https://completion",
+            fileobj=fileobj,
+            header=self.header,
+            chunk_size=self.chunk_size,
+            upload_info=self.upload_info,
+            num_threads=3,
+        )
+
+        # Each part is uploaded with the correct slice of data
+        self.assertEqual(len(self.uploaded), 7)
+        for idx in range(7):
+            self.assertEqual(
+                self.uploaded[str(idx + 1)], self.content[idx * 16 : (idx + 1) * 16]
+            )
+
+        # Parts are retried individually
+        for call in mock_http_backoff.call_args_list:
+            self.assertIn(503, call.kwargs["retry_on_status_codes"])
+
+        # Completion payload is ordered by part number
+        mock_get_session().post.assert_called_once()
+        payload = mock_get_session().post.call_args.kwargs["json"]
+        self.assertEqual(payload["oid"], self.upload_info.sha256.hex())
+        self.assertEqual(
+            payload["parts"],
+            [{"partNumber": idx + 1, "etag": f"etag-{idx + 1}"} for idx in range(7)],
+        )
+
+        # File object is reset to its initial position
+        self.assertEqual(fileobj.tell(), 0)
+
+        # Journal is deleted once the upload is complete
+        self.assertEqual(list(self.journal_dir.iterdir()), [])
+
+    @patch("huggingface_hub.lfs.get_session")
+    @patch("huggingface_hub.lfs.http_backoff")
+    def test_upload_part_failure_raises(
+        self, mock_http_backoff: Mock, mock_get_session: Mock
+    ) -> None:
+        def _side_effect(method: str, url: str, data: bytes, **kwargs):
+            response = self._mocked_http_backoff(method, url, data)
+            if "/5?" in url:
+                response.headers = {}  # no etag
+            return response
+
+        mock_http_backoff.side_effect = _side_effect
+
+        with self.assertRaises(ValueError):
+            _upload_multi_part(
+                completion_url="https://completion",
+                fileobj=BytesIO(self.content),
+                header=self.header,
+                chunk_size=self.chunk_size,
+                upload_info=self.upload_info,
+                num_threads=3,
+            )
+        # Completion url is never called
+        mock_get_session().post.assert_not_called()
+
+    @patch("huggingface_hub.lfs.get_session")
+    @patch("huggingface_hub.lfs.http_backoff")
+    def test_pending_parts_cancelled_on_failure(
+        self, mock_http_backoff: Mock, mock_get_session: Mock
+    ) -> None:
+        attempted = []
+
+        def _side_effect(method: str, url: str, data: bytes, **kwargs):
+            attempted.append(url)
+            if "/1?" in url:
+                raise RuntimeError("Part upload failed")
+            return self._mocked_http_backoff(method, url, data)
+
+        mock_http_backoff.side_effect = _side_effect
+        with self.assertRaisesRegex(RuntimeError, "Part upload failed"):
+            _upload_multi_part(
+                completion_url="https://completion",
+                fileobj=BytesIO(self.content),
+                header=self.header,
+                chunk_size=self.chunk_size,
+                upload_info=self.upload_info,
+                num_threads=1,
+            )
+        # Part 2 may have started before the failure is handled, not the others
+        self.assertLessEqual(len(attempted), 2)
+        mock_get_session().post.assert_not_called()
+
+    @patch("huggingface_hub.lfs.get_session")
+    @patch("huggingface_hub.lfs.http_backoff")
+    def test_resume_upload_after_failure(
+        self, mock_http_backoff: Mock, mock_get_session: Mock
+    ) -> None:
+        def _failing_side_effect(method: str, url: str, data: bytes, **kwargs):
+            if "/5?" in url:
+                raise RuntimeError("Process killed")
+            return self._mocked_http_backoff(method, url, data)
+
+        upload_kwargs = dict(
+            completion_url="https://completion",
+            header=self.header,
+            chunk_size=self.chunk_size,
+            upload_info=self.upload_info,
+            num_threads=3,
+        )
+
+        # First attempt fails on part 5
+        mock_http_backoff.side_effect = _failing_side_effect
+        with self.assertRaises(RuntimeError):
+            _upload_multi_part(fileobj=BytesIO(self.content), **upload_kwargs)
+        first_attempt = set(self.uploaded)
+        self.assertTrue({"1", "2", "3", "4"} <= first_attempt)
+        self.assertNotIn("5", first_attempt)
+
+        # Second attempt only uploads the missing parts
+        self.uploaded.clear()
+        mock_http_backoff.side_effect = self._mocked_http_backoff
+        _upload_multi_part(fileobj=BytesIO(self.content), **upload_kwargs)
+        self.assertEqual(
+            set(self.uploaded), {str(idx + 1) for idx in range(7)} - first_attempt
+        )
+        self.assertEqual(self.uploaded["5"], self.content[64:80])
+
+        # Completion payload contains all the parts
+        payload = mock_get_session().post.call_args.kwargs["json"]
+        self.assertEqual(
+            payload["parts"],
+            [{"partNumber": idx + 1, "etag": f"etag-{idx + 1}"} for idx in range(7)],
+        )
+
+    @patch("huggingface_hub.lfs.get_session")
+    @patch("huggingface_hub.lfs.http_backoff")
+    def test_journal_reset_on_new_upload_id(
+        self, mock_http_backoff: Mock, mock_get_session: Mock
+    ) -> None:
+        # Journal from a previous multipart upload (different upload id)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        (self.journal_dir / f"{self.upload_info.sha256.hex()}.json").write_text(
+            '{"upload_id": "old_upload", "chunk_size": 16, "etags": {"1": "old"}}'
+        )
+
+        mock_http_backoff.side_effect = self._mocked_http_backoff
+        _upload_multi_part(
+            completion_url="https://completion",
+            fileobj=BytesIO(self.content),
+            header=self.header,
+            chunk_size=self.chunk_size,
+            upload_info=self.upload_info,
+        )
+
+        # All parts have been uploaded again
+        self.assertEqual(len(self.uploaded), 7)
+        payload = mock_get_session().post.call_args.kwargs["json"]
+        self.assertEqual(payload["parts"][0], {"partNumber": 1, "etag": "etag-1"})
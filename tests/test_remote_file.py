@@ -0,0 +1,169 @@
+import io
+import os
+import unittest
+import zipfile
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from huggingface_hub import HfRemoteFile, hf_hub_download, hf_hub_open
+
+from .testing_utils import start_local_hub
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class HfRemoteFileTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.content = os.urandom(10_000)
+        self.server = start_local_hub(self)
+        self.server.add_repo_file("user/repo", "data.bin", self.content)
+
+    def _open(self, filename: str = "data.bin", **kwargs) -> HfRemoteFile:
+        kwargs.setdefault("block_size", 1000)
+        return hf_hub_open("user/repo", filename, cache_dir=self.cache_dir, **kwargs)
+
+    def _ranges(self) -> List[str]:
+        return [
+            request.headers["Range"]
+            for request in self.server.requests
+            if request.method == "GET"
+        ]
+
+    def test_read_header_and_footer(self) -> None:
+        with self._open() as f:
+            self.assertEqual(f.size, 10_000)
+            self.assertEqual(f.commit_hash, "a" * 40)
+            self.assertEqual(f.read(8), self.content[:8])
+
+            f.seek(-100, os.SEEK_END)
+            self.assertEqual(f.read(), self.content[-100:])
+            self.assertEqual(f.tell(), 10_000)
+            self.assertEqual(f.read(), b"")
+
+        # Only 2 blocks fetched, from the commit resolved when opening the file
+        self.assertEqual(self._ranges(), ["bytes=0-999", "bytes=9000-9999"])
+        get_paths = [r.path for r in self.server.requests if r.method == "GET"]
+        self.assertTrue(all(f"/resolve/{'a' * 40}/" in path for path in get_paths))
+
+    def test_read_across_blocks(self) -> None:
+        with self._open() as f:
+            f.seek(950)
+            self.assertEqual(f.read(2100), self.content[950:3050])
+        self.assertEqual(self._ranges(), ["bytes=0-3999"])
+
+    def test_blocks_are_cached(self) -> None:
+        with self._open() as f:
+            f.seek(5000)
+            f.read(10)
+            f.seek(5500)
+            f.read(10)
+        self.assertEqual(self._ranges(), ["bytes=5000-5999"])
+
+    def test_lru_eviction(self) -> None:
+        with self._open(max_cached_blocks=2, readahead=0) as f:
+            for offset in (0, 5000, 9000, 0):
+                f.seek(offset)
+                self.assertEqual(f.read(10), self.content[offset : offset + 10])
+        # Block 0 evicted by blocks 5 and 9 => fetched twice
+        self.assertEqual(
+            self._ranges(),
+            ["bytes=0-999", "bytes=5000-5999", "bytes=9000-9999", "bytes=0-999"],
+        )
+
+    def test_readahead_on_sequential_reads(self) -> None:
+        with self._open(readahead=3) as f:
+            content = b""
+            while True:
+                chunk = f.read(1000)
+                if not chunk:
+                    break
+                content += chunk
+        self.assertEqual(content, self.content)
+        self.assertEqual(
+            self._ranges(),
+            ["bytes=0-999", "bytes=1000-4999", "bytes=5000-8999", "bytes=9000-9999"],
+        )
+
+    def test_readinto_and_buffered_reader(self) -> None:
+        with io.BufferedReader(self._open(), buffer_size=64) as f:
+            f.seek(3000)
+            self.assertEqual(f.read(5), self.content[3000:3005])
+            buffer = bytearray(10)
+            self.assertEqual(f.readinto(buffer), 10)
+            self.assertEqual(bytes(buffer), self.content[3005:3015])
+
+    def test_zipfile(self) -> None:
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("small.txt", "hello")
+            zf.writestr("large.bin", os.urandom(50_000))
+        self.server.add_repo_file("user/repo", "archive.zip", archive.getvalue())
+
+        with self._open("archive.zip") as f:
+            with zipfile.ZipFile(f) as zf:
+                self.assertEqual(zf.read("small.txt"), b"hello")
+
+        # Central directory + first file only
+        fetched = sum(
+            int(r.split("-")[1]) - int(r.split("=")[1].split("-")[0]) + 1
+            for r in self._ranges()
+        )
+        self.assertLess(fetched, 10_000)
+
+    def test_invalid_seek(self) -> None:
+        with self._open() as f:
+            with self.assertRaises(ValueError):
+                f.seek(-1)
+            with self.assertRaises(ValueError):
+                f.seek(0, 3)
+
+    def test_closed(self) -> None:
+        f = self._open()
+        f.close()
+        with self.assertRaises(ValueError):
+            f.read(1)
+
+    def test_read_from_local_cache(self) -> None:
+        path = hf_hub_download("user/repo", "data.bin", cache_dir=self.cache_dir)
+        self.server.requests.clear()
+
+        with self._open() as f:
+            self.assertEqual(f.local_path, path)
+            f.seek(5000)
+            self.assertEqual(f.read(10), self.content[5000:5010])
+        self.assertEqual(self._ranges(), [])  # only HEAD
+
+    def test_fill_cache_threshold(self) -> None:
+        with self._open(fill_cache_threshold=0.3, readahead=0) as f:
+            f.seek(0)
+            f.read(10)
+            f.seek(5000)
+            f.read(10)
+            self.assertIsNone(f.local_path)
+
+            f.seek(9000)
+            self.assertEqual(f.read(10), self.content[9000:9010])  # 3000 bytes fetched
+            self.assertIsNotNone(f.local_path)
+
+            # Next reads from disk
+            self.server.requests.clear()
+            f.seek(2000)
+            self.assertEqual(f.read(10), self.content[2000:2010])
+            self.assertEqual(self.server.requests, [])
+
+        self.assertEqual(Path(f.local_path).read_bytes(), self.content)  # type: ignore
+
+    def test_server_without_range_support(self) -> None:
+        self.server.support_ranges = False
+        with self._open() as f:
+            f.seek(4000)
+            self.assertEqual(f.read(10), self.content[4000:4010])
+
+    def test_invalid_parameters(self) -> None:
+        with self.assertRaises(ValueError):
+            self._open(block_size=0)
+        with self.assertRaises(ValueError):
+            self._open(fill_cache_threshold=2)
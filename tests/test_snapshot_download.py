@@ -1,8 +1,23 @@
+import asyncio
+import json
 import os
 import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
 
 import requests
-from huggingface_hub import HfApi, Repository, snapshot_download
+from huggingface_hub import (
+    AdaptiveConcurrency,
+    HfApi,
+    Repository,
+    SnapshotDownloadPlan,
+    hf_hub_download,
+    snapshot_download,
+)
+from huggingface_hub._async_download import download_snapshot_files
+from huggingface_hub.hf_api import RepoFile
 from huggingface_hub.utils import (
     HfFolder,
     RepositoryNotFoundError,
@@ -16,6 +31,7 @@ from .testing_utils import (
     repo_name,
     retry_endpoint,
     rmtree_with_retry,
+    start_local_hub,
 )
 
 
@@ -359,3 +375,215 @@ class SnapshotDownloadTests(unittest.TestCase):
 
     def test_download_model_with_ignore_pattern_list(self):
         self.check_download_model_with_pattern(["*.git*", "*.pt"], allow=False)
+
+
+@pytest.mark.usefixtures("fx_cache_dir")
+class SnapshotManifestTest(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        self.server = start_local_hub(self)
+        self.files = {
+            "config.json": b"{}",
+            "model.bin": b"weights",
+            "model.safetensors": b"other weights",
+        }
+        siblings = []
+        for filename, content in self.files.items():
+            etag = self.server.add_repo_file("user/repo", filename, content)
+            siblings.append(
+                RepoFile(rfilename=filename, size=len(content), blobId=etag)
+            )
+
+        api_patcher = patch("huggingface_hub._snapshot_download.HfApi")
+        self.mock_repo_info = api_patcher.start().return_value.repo_info
+        self.mock_repo_info.return_value = Mock(sha="a" * 40, siblings=siblings)
+        self.addCleanup(api_patcher.stop)
+
+        self.snapshot_path = str(
+            self.cache_dir / "models--user--repo" / "snapshots" / ("a" * 40)
+        )
+
+    def _snapshot_download(self, **kwargs) -> str:
+        return snapshot_download("user/repo", cache_dir=self.cache_dir, **kwargs)
+
+    def test_manifest_written(self) -> None:
+        self.assertEqual(self._snapshot_download(), self.snapshot_path)
+
+        manifest_path = (
+            self.cache_dir / "models--user--repo" / ".manifests" / f"{'a' * 40}.json"
+        )
+        manifest = json.loads(manifest_path.read_text())
+        self.assertEqual(manifest["commit_hash"], "a" * 40)
+        self.assertEqual(set(manifest["files"].keys()), set(self.files.keys()))
+        self.assertEqual(manifest["files"]["model.bin"]["size"], 7)
+
+    def test_complete_snapshot_no_network(self) -> None:
+        self._snapshot_download()
+        self.server.requests.clear()
+
+        self.assertEqual(self._snapshot_download(revision="a" * 40), self.snapshot_path)
+        self.mock_repo_info.assert_called_once()  # only first call
+        self.assertEqual(len(self.server.requests), 0)
+
+    def test_ref_not_fresh_calls_api(self) -> None:
+        self._snapshot_download()
+        self._snapshot_download(revision="main")
+        self.assertEqual(self.mock_repo_info.call_count, 2)
+
+    @patch("huggingface_hub.file_download.HF_HUB_REFS_TTL", 3600)
+    def test_fresh_ref_no_network(self) -> None:
+        self._snapshot_download()
+        self.server.requests.clear()
+
+        self.assertEqual(self._snapshot_download(revision="main"), self.snapshot_path)
+        self.mock_repo_info.assert_called_once()
+        self.assertEqual(len(self.server.requests), 0)
+
+    def test_incomplete_snapshot_downloads_missing_files_only(self) -> None:
+        self._snapshot_download(allow_patterns="*.json")
+        self.server.requests.clear()
+
+        # Files listed from manifest: no need to call the api
+        self._snapshot_download(revision="a" * 40)
+        self.mock_repo_info.assert_called_once()
+        self.assertEqual(
+            sorted({request.path.split("/")[-1] for request in self.server.requests}),
+            ["model.bin", "model.safetensors"],
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.snapshot_path, "model.bin")))
+
+    def test_adaptive_concurrency(self) -> None:
+        controller = AdaptiveConcurrency(initial=1, max_concurrency=2)
+        self.assertEqual(
+            self._snapshot_download(max_workers=controller), self.snapshot_path
+        )
+        for filename, content in self.files.items():
+            self.assertEqual(Path(self.snapshot_path, filename).read_bytes(), content)
+
+    def test_dry_run(self) -> None:
+        plan = self._snapshot_download(dry_run=True)
+
+        self.assertIsInstance(plan, SnapshotDownloadPlan)
+        self.assertEqual(plan.commit_hash, "a" * 40)
+        self.assertEqual(plan.snapshot_folder, self.snapshot_path)
+        # Largest files first
+        self.assertEqual(
+            [file.filename for file in plan.files],
+            ["model.safetensors", "model.bin", "config.json"],
+        )
+        self.assertEqual(plan.download_size, 13 + 7 + 2)
+        self.assertGreater(plan.free_disk_space, 0)
+
+        # Nothing downloaded
+        self.assertEqual(
+            [
+                request.method
+                for request in self.server.requests
+                if request.method == "GET"
+            ],
+            [],
+        )
+        # Cache not modified (no ref written)
+        self.assertFalse(os.path.exists(self.cache_dir / "models--user--repo"))
+
+    def test_dry_run_cache_dir_does_not_exist(self) -> None:
+        cache_dir = self.cache_dir / "does" / "not" / "exist"
+        plan = snapshot_download("user/repo", cache_dir=cache_dir, dry_run=True)
+        self.assertGreater(plan.free_disk_space, 0)
+        self.assertFalse(os.path.exists(cache_dir))
+
+    def test_dry_run_partially_cached(self) -> None:
+        self._snapshot_download(allow_patterns="*.json")
+        plan = self._snapshot_download(dry_run=True)
+
+        self.assertEqual(
+            {file.filename: file.is_cached for file in plan.files},
+            {"model.safetensors": False, "model.bin": False, "config.json": True},
+        )
+        self.assertEqual(plan.download_size, 13 + 7)
+
+    def test_largest_files_scheduled_first(self) -> None:
+        with patch(
+            "huggingface_hub._snapshot_download.hf_hub_download", wraps=hf_hub_download
+        ) as mock:
+            self._snapshot_download(max_workers=1)
+        self.assertEqual(
+            [call.kwargs["filename"] for call in mock.call_args_list],
+            ["model.safetensors", "model.bin", "config.json"],
+        )
+
+    @patch("huggingface_hub._snapshot_download.shutil.disk_usage")
+    def test_not_enough_disk_space(self, mock_disk_usage: Mock) -> None:
+        mock_disk_usage.return_value = Mock(free=10)
+        with self.assertRaises(OSError):
+            self._snapshot_download()
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+
+@patch("huggingface_hub._snapshot_download.HF_HUB_ENABLE_ASYNC_DOWNLOAD", True)
+class SnapshotDownloadAsyncTest(SnapshotManifestTest):
+    """Same tests as `SnapshotManifestTest` + specific ones, using the asyncio engine."""
+
+    def test_async_download(self) -> None:
+        with patch(
+            "huggingface_hub._snapshot_download.hf_hub_download"
+        ) as mock_hf_hub_download:
+            snapshot_path = self._snapshot_download()
+
+        mock_hf_hub_download.assert_not_called()  # sync path not used
+        for filename, content in self.files.items():
+            path = Path(snapshot_path) / filename
+            self.assertTrue(path.is_symlink())
+            self.assertEqual(path.read_bytes(), content)
+
+        # No HEAD calls: etags are known from the repo metadata
+        self.assertEqual(
+            sorted(request.method for request in self.server.requests), ["GET"] * 3
+        )
+
+    @patch(
+        "huggingface_hub._snapshot_download.HF_HUB_ASYNC_DOWNLOAD_MAX_CONCURRENCY", 1
+    )
+    def test_largest_files_scheduled_first(self) -> None:
+        self._snapshot_download()
+        self.assertEqual(
+            [request.path.split("/")[-1] for request in self.server.requests],
+            ["model.safetensors", "model.bin", "config.json"],
+        )
+
+    def test_max_workers_caps_concurrency(self) -> None:
+        with patch(
+            "huggingface_hub._async_download.download_snapshot_files",
+            wraps=download_snapshot_files,
+        ) as mock_download:
+            self._snapshot_download(max_workers=2)
+        self.assertEqual(mock_download.call_args.kwargs["max_concurrency"], 2)
+
+    def test_async_download_corrupted_file(self) -> None:
+        self.server.files["/user/repo/resolve/" + "a" * 40 + "/model.bin"] = b"corrupt"
+        with self.assertRaises(OSError):
+            self._snapshot_download()
+        self.assertFalse(os.path.exists(os.path.join(self.snapshot_path, "model.bin")))
+
+    def test_async_download_unknown_etag_fallback(self) -> None:
+        self.mock_repo_info.return_value.siblings[0].blob_id = None  # config.json
+        with patch(
+            "huggingface_hub._snapshot_download.hf_hub_download", wraps=hf_hub_download
+        ) as mock_hf_hub_download:
+            self._snapshot_download()
+        self.assertEqual(mock_hf_hub_download.call_count, 1)
+        self.assertEqual(
+            mock_hf_hub_download.call_args.kwargs["filename"], "config.json"
+        )
+
+    def test_async_download_from_running_event_loop(self) -> None:
+        async def _main() -> str:
+            return self._snapshot_download()
+
+        self.assertEqual(asyncio.run(_main()), self.snapshot_path)
+
+    @patch("huggingface_hub._async_download.is_aiohttp_available", return_value=False)
+    def test_aiohttp_not_installed(self, mock: Mock) -> None:
+        with self.assertRaises(ValueError):
+            self._snapshot_download()
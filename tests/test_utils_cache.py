@@ -3,10 +3,11 @@ import tempfile
 import time
 import unittest
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
+from huggingface_hub import hf_hub_download
 from huggingface_hub._snapshot_download import snapshot_download
 from huggingface_hub.commands.scan_cache import ScanCacheCommand
 from huggingface_hub.utils import DeleteCacheStrategy, HFCacheInfo, scan_cache_dir
@@ -21,6 +22,7 @@ from .testing_constants import TOKEN
 from .testing_utils import (
     capture_output,
     rmtree_with_retry,
+    start_local_hub,
     with_production_testing,
     xfail_on_windows,
 )
@@ -736,6 +738,86 @@ class TestDeleteRevisionsDryRun(unittest.TestCase):
         )
 
 
+@pytest.mark.usefixtures("fx_cache_dir")
+class TestSharedBlobsCache(unittest.TestCase):
+    cache_dir: Path
+
+    def setUp(self) -> None:
+        """Download a file shared by 2 repos and a file specific to each repo."""
+        server = start_local_hub(self)
+        self.shared_etag = server.add_repo_file(
+            "user/base", "model.bin", b"weights", lfs=True
+        )
+        server.add_repo_file("user/base", "README.md", b"base", lfs=True)
+        server.add_repo_file(
+            "user/finetuned", "model.bin", b"weights", commit_hash="b" * 40, lfs=True
+        )
+        server.add_repo_file(
+            "user/finetuned", "README.md", b"finetuned", commit_hash="b" * 40, lfs=True
+        )
+
+        with patch("huggingface_hub.file_download.HF_HUB_ENABLE_SHARED_BLOBS", True):
+            for repo_id in ("user/base", "user/finetuned"):
+                for filename in ("model.bin", "README.md"):
+                    hf_hub_download(repo_id, filename, cache_dir=self.cache_dir)
+
+        self.shared_blob_path = self.cache_dir / "blobs" / self.shared_etag
+
+    def test_scan_counts_shared_blobs_once(self) -> None:
+        report = scan_cache_dir(self.cache_dir)
+
+        self.assertEqual(report.warnings, [])  # shared folder is not a repo
+        self.assertEqual(len(report.repos), 2)
+        sizes = {repo.repo_id: repo.size_on_disk for repo in report.repos}
+        self.assertEqual(sizes, {"user/base": 7 + 4, "user/finetuned": 7 + 9})
+        # "weights" + "base" + "finetuned"
+        self.assertEqual(report.size_on_disk, 7 + 4 + 9)
+
+    def test_delete_repo_keeps_shared_blob(self) -> None:
+        report = scan_cache_dir(self.cache_dir)
+        strategy = report.delete_revisions("a" * 40)
+
+        self.assertEqual(strategy.expected_freed_size, 4)  # only "base"
+        self.assertNotIn(self.shared_blob_path.resolve(), strategy.blobs)
+        strategy.execute()
+
+        self.assertFalse((self.cache_dir / "models--user--base").exists())
+        self.assertTrue(self.shared_blob_path.is_file())
+        report = scan_cache_dir(self.cache_dir)
+        self.assertEqual(report.warnings, [])
+        self.assertEqual(report.size_on_disk, 7 + 9)
+
+    def test_delete_all_repos_deletes_shared_blob(self) -> None:
+        report = scan_cache_dir(self.cache_dir)
+        strategy = report.delete_revisions("a" * 40, "b" * 40)
+
+        self.assertEqual(strategy.expected_freed_size, 7 + 4 + 9)
+        strategy.execute()
+        self.assertFalse(self.shared_blob_path.exists())
+
+    def test_delete_revision_keeps_shared_blob(self) -> None:
+        # Another revision of "user/base" only contains the README
+        repo_path = self.cache_dir / "models--user--base"
+        snapshot_path = repo_path / "snapshots" / ("c" * 40)
+        snapshot_path.mkdir()
+        readme_blob_path = (
+            repo_path / "snapshots" / ("a" * 40) / "README.md"
+        ).resolve()
+        (snapshot_path / "README.md").symlink_to(readme_blob_path)
+
+        strategy = scan_cache_dir(self.cache_dir).delete_revisions("a" * 40)
+
+        # Only the link from the repo to the shared blob is deleted
+        repo_blob_link_path = repo_path.resolve() / "blobs" / self.shared_etag
+        self.assertEqual(strategy.expected_freed_size, 0)
+        self.assertEqual(strategy.blobs, {repo_blob_link_path})
+        strategy.execute()
+
+        self.assertFalse(repo_blob_link_path.is_symlink())
+        self.assertTrue(self.shared_blob_path.is_file())
+        self.assertEqual(scan_cache_dir(self.cache_dir).warnings, [])
+
+
 @pytest.mark.usefixtures("fx_cache_dir")
 class TestDeleteStrategyExecute(unittest.TestCase):
     cache_dir: Path
@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+from huggingface_hub.file_download import OfflineModeIsEnabled
+from huggingface_hub.utils import AdaptiveConcurrency, LocalEntryNotFoundError
+from huggingface_hub.utils._concurrency import is_congestion_error
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+
+def _http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"{status_code} error", response=response)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        patcher = patch("huggingface_hub.utils._concurrency.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run_window(
+        self, controller: AdaptiveConcurrency, units: float, duration: float
+    ) -> None:
+        """Simulate a window of 1s during which `units` are transferred."""
+        self.clock.now += 1.0
+        controller.record_success(units, duration)
+
+    def test_invalid_bounds(self) -> None:
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(initial=4, min_concurrency=5)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(initial=10, max_concurrency=8)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(initial=0, min_concurrency=0)
+
+    def test_additive_increase_while_throughput_improves(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, window=1.0)
+        self._run_window(controller, units=100, duration=1.0)
+        self.assertEqual(controller.limit, 3)
+        self._run_window(controller, units=150, duration=1.0)
+        self.assertEqual(controller.limit, 4)
+
+    def test_no_increase_on_plateau(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, window=1.0)
+        self._run_window(controller, units=100, duration=1.0)
+        self._run_window(controller, units=102, duration=1.0)
+        self.assertEqual(controller.limit, 3)
+
+    def test_no_update_within_window(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, window=1.0)
+        self.clock.now += 0.5
+        controller.record_success(100, 0.5)
+        self.assertEqual(controller.limit, 2)
+
+    def test_decrease_when_streams_slow_down(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, window=1.0)
+        self._run_window(controller, units=100, duration=1.0)
+        self.assertEqual(controller.limit, 3)
+        # Same aggregate throughput but each transfer is twice slower
+        self._run_window(controller, units=100, duration=2.0)
+        self.assertEqual(controller.limit, 2)
+
+    def test_bounded_by_max_concurrency(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, max_concurrency=2, window=1.0)
+        self._run_window(controller, units=100, duration=1.0)
+        self.assertEqual(controller.limit, 2)
+
+    def test_multiplicative_decrease_on_congestion(self) -> None:
+        controller = AdaptiveConcurrency(initial=16, window=1.0)
+        controller.record_congestion()
+        self.assertEqual(controller.limit, 8)
+
+        # Other transfers failing in the same window => single decrease
+        controller.record_congestion()
+        self.assertEqual(controller.limit, 8)
+
+        self.clock.now += 1.0
+        controller.record_congestion()
+        self.assertEqual(controller.limit, 4)
+
+    def test_congestion_bounded_by_min_concurrency(self) -> None:
+        controller = AdaptiveConcurrency(initial=4, min_concurrency=3)
+        controller.record_congestion()
+        self.assertEqual(controller.limit, 3)
+
+    def test_acquire_respects_limit(self) -> None:
+        controller = AdaptiveConcurrency(initial=2)
+        self.assertTrue(controller.try_acquire())
+        self.assertTrue(controller.try_acquire())
+        self.assertFalse(controller.try_acquire())
+        controller.release()
+        self.assertTrue(controller.try_acquire())
+
+
+class TestAdaptiveConcurrencyMap(unittest.TestCase):
+    def test_map_returns_results_in_order(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, max_concurrency=4)
+        results = controller.map(lambda x: x * 2, range(10), sizes=[1] * 10)
+        self.assertEqual(results, [x * 2 for x in range(10)])
+
+    def test_map_never_exceeds_limit(self) -> None:
+        controller = AdaptiveConcurrency(initial=2, max_concurrency=8, window=3600)
+        lock = threading.Lock()
+        running = []
+        max_running = []
+
+        def _task(x: int) -> int:
+            with lock:
+                running.append(x)
+                max_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(x)
+            return x
+
+        controller.map(_task, range(20))
+        self.assertEqual(max(max_running), 2)
+
+    @patch("huggingface_hub.utils._concurrency._CONGESTION_RETRY_DELAY", 0)
+    def test_map_retries_on_congestion(self) -> None:
+        controller = AdaptiveConcurrency(initial=4)
+        calls = []
+
+        def _task(x: int) -> int:
+            calls.append(x)
+            if x == 0 and calls.count(0) == 1:
+                raise _http_error(429)
+            return x
+
+        self.assertEqual(controller.map(_task, range(3)), [0, 1, 2])
+        self.assertEqual(calls.count(0), 2)
+        self.assertEqual(controller.limit, 2)
+
+    @patch("huggingface_hub.utils._concurrency._CONGESTION_RETRY_DELAY", 0)
+    def test_map_gives_up_after_retries(self) -> None:
+        controller = AdaptiveConcurrency(initial=4)
+
+        def _task(x: int) -> int:
+            raise requests.ConnectTimeout()
+
+        with self.assertRaises(requests.ConnectTimeout):
+            controller.map(_task, range(1))
+
+    def test_map_other_errors_not_retried(self) -> None:
+        controller = AdaptiveConcurrency(initial=4)
+        calls = []
+
+        def _task(x: int) -> int:
+            calls.append(x)
+            raise ValueError("not a congestion error")
+
+        with self.assertRaises(ValueError):
+            controller.map(_task, range(1))
+        self.assertEqual(calls, [0])
+        self.assertEqual(controller.limit, 4)
+
+
+class TestIsCongestionError(unittest.TestCase):
+    def test_congestion_errors(self) -> None:
+        self.assertTrue(is_congestion_error(_http_error(429)))
+        self.assertTrue(is_congestion_error(_http_error(503)))
+        self.assertTrue(is_congestion_error(requests.ReadTimeout()))
+        self.assertTrue(is_congestion_error(requests.ConnectTimeout()))
+        self.assertTrue(is_congestion_error(asyncio.TimeoutError()))
+        self.assertTrue(is_congestion_error(ConnectionResetError()))
+
+    def test_connection_reset_wrapped_by_requests(self) -> None:
+        # As raised by `requests` when the server closes the connection
+        error = requests.ConnectionError(
+            ProtocolError("Connection aborted.", ConnectionResetError(104, "reset"))
+        )
+        self.assertTrue(is_congestion_error(error))
+
+    def test_other_errors(self) -> None:
+        self.assertFalse(is_congestion_error(_http_error(404)))
+        self.assertFalse(is_congestion_error(_http_error(500)))
+        self.assertFalse(is_congestion_error(ValueError()))
+        self.assertFalse(is_congestion_error(OfflineModeIsEnabled()))
+
+    def test_connection_failures_are_not_congestion(self) -> None:
+        # DNS failure and connection refused, as raised by `requests`
+        for reason in (
+            NewConnectionError(None, "Failed to resolve 'huggingface.co'"),
+            NewConnectionError(None, "[Errno 111] Connection refused"),
+        ):
+            error = requests.ConnectionError(
+                MaxRetryError(None, "https://huggingface.co", reason)
+            )
+            self.assertFalse(is_congestion_error(error))
+
+    def test_connection_failure_cause_of_download_error(self) -> None:
+        try:
+            try:
+                raise requests.ConnectionError("Failed to resolve 'huggingface.co'")
+            except requests.ConnectionError as error:
+                raise LocalEntryNotFoundError("Cannot find file") from error
+        except LocalEntryNotFoundError as error:
+            self.assertFalse(is_congestion_error(error))
+
+    def test_chained_error(self) -> None:
+        try:
+            try:
+                raise _http_error(503)
+            except requests.HTTPError as error:
+                raise RuntimeError("Error while uploading") from error
+        except RuntimeError as error:
+            self.assertTrue(is_congestion_error(error))
@@ -1,33 +1,50 @@
+import threading
 import time
 import unittest
 from typing import Generator
 from unittest.mock import Mock, call, patch
 
-from huggingface_hub.utils._http import http_backoff
+import requests
+from huggingface_hub.utils._http import (
+    configure_http_backend,
+    get_session,
+    http_backoff,
+)
 from requests import ConnectTimeout, HTTPError
 
 
 URL = "https://www.google.com"
 
 
-@patch("huggingface_hub.utils._http.requests.request")
 class TestHttpBackoff(unittest.TestCase):
-    def test_backoff_no_errors(self, mock_request: Mock) -> None:
+    def setUp(self) -> None:
+        get_session_mock = Mock()
+        self.mock_request = get_session_mock().request
+
+        self.patcher = patch(
+            "huggingface_hub.utils._http.get_session", get_session_mock
+        )
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+
+    def test_backoff_no_errors(self) -> None:
         """Test normal usage of `http_backoff`."""
         data_mock = Mock()
         response = http_backoff("GET", URL, data=data_mock)
-        mock_request.assert_called_once_with(method="GET", url=URL, data=data_mock)
-        self.assertIs(response, mock_request())
+        self.mock_request.assert_called_once_with(method="GET", url=URL, data=data_mock)
+        self.assertIs(response, self.mock_request())
 
-    def test_backoff_3_calls(self, mock_request: Mock) -> None:
+    def test_backoff_3_calls(self) -> None:
         """Test `http_backoff` with 2 fails."""
         response_mock = Mock()
-        mock_request.side_effect = (ValueError(), ValueError(), response_mock)
+        self.mock_request.side_effect = (ValueError(), ValueError(), response_mock)
         response = http_backoff(  # retry on ValueError, instant retry
             "GET", URL, retry_on_exceptions=ValueError, base_wait_time=0.0
         )
-        self.assertEqual(mock_request.call_count, 3)
-        mock_request.assert_has_calls(
+        self.assertEqual(self.mock_request.call_count, 3)
+        self.mock_request.assert_has_calls(
             calls=[
                 call(method="GET", url=URL),
                 call(method="GET", url=URL),
@@ -36,23 +53,23 @@ class TestHttpBackoff(unittest.TestCase):
         )
         self.assertIs(response, response_mock)
 
-    def test_backoff_on_exception_until_max(self, mock_request: Mock) -> None:
+    def test_backoff_on_exception_until_max(self) -> None:
         """Test `http_backoff` until max limit is reached with exceptions."""
-        mock_request.side_effect = ConnectTimeout()
+        self.mock_request.side_effect = ConnectTimeout()
 
         with self.assertRaises(ConnectTimeout):
             http_backoff("GET", URL, base_wait_time=0.0, max_retries=3)
 
-        self.assertEqual(mock_request.call_count, 4)
+        self.assertEqual(self.mock_request.call_count, 4)
 
-    def test_backoff_on_status_code_until_max(self, mock_request: Mock) -> None:
+    def test_backoff_on_status_code_until_max(self) -> None:
         """Test `http_backoff` until max limit is reached with status codes."""
         mock_503 = Mock()
         mock_503.status_code = 503
         mock_504 = Mock()
         mock_504.status_code = 504
         mock_504.raise_for_status.side_effect = HTTPError()
-        mock_request.side_effect = (mock_503, mock_504, mock_503, mock_504)
+        self.mock_request.side_effect = (mock_503, mock_504, mock_503, mock_504)
 
         with self.assertRaises(HTTPError):
             http_backoff(
@@ -63,20 +80,20 @@ class TestHttpBackoff(unittest.TestCase):
                 retry_on_status_codes=(503, 504),
             )
 
-        self.assertEqual(mock_request.call_count, 4)
+        self.assertEqual(self.mock_request.call_count, 4)
 
-    def test_backoff_on_exceptions_and_status_codes(self, mock_request: Mock) -> None:
+    def test_backoff_on_exceptions_and_status_codes(self) -> None:
         """Test `http_backoff` until max limit with status codes and exceptions."""
         mock_503 = Mock()
         mock_503.status_code = 503
-        mock_request.side_effect = (mock_503, ConnectTimeout())
+        self.mock_request.side_effect = (mock_503, ConnectTimeout())
 
         with self.assertRaises(ConnectTimeout):
             http_backoff("GET", URL, base_wait_time=0.0, max_retries=1)
 
-        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(self.mock_request.call_count, 2)
 
-    def test_backoff_on_valid_status_code(self, mock_request: Mock) -> None:
+    def test_backoff_on_valid_status_code(self) -> None:
         """Test `http_backoff` until max limit with a valid status code.
 
         Quite a corner case: the user wants to retry is status code is 200. Requests are
@@ -85,16 +102,16 @@ class TestHttpBackoff(unittest.TestCase):
         """
         mock_200 = Mock()
         mock_200.status_code = 200
-        mock_request.side_effect = (mock_200, mock_200, mock_200, mock_200)
+        self.mock_request.side_effect = (mock_200, mock_200, mock_200, mock_200)
 
         response = http_backoff(
             "GET", URL, base_wait_time=0.0, max_retries=3, retry_on_status_codes=200
         )
 
-        self.assertEqual(mock_request.call_count, 4)
+        self.assertEqual(self.mock_request.call_count, 4)
         self.assertIs(response, mock_200)
 
-    def test_backoff_sleep_time(self, mock_request: Mock) -> None:
+    def test_backoff_sleep_time(self) -> None:
         """Test `http_backoff` sleep time goes exponential until max limit.
 
         Since timing between 2 requests is sleep duration + some other stuff, this test
@@ -113,15 +130,70 @@ class TestHttpBackoff(unittest.TestCase):
                 sleep_times.append(round(t1 - t0, 1))
                 t0 = t1
 
-        mock_request.side_effect = _side_effect_timer()
+        self.mock_request.side_effect = _side_effect_timer()
 
         with self.assertRaises(ConnectTimeout):
             http_backoff(
                 "GET", URL, base_wait_time=0.1, max_wait_time=0.5, max_retries=5
             )
 
-        self.assertEqual(mock_request.call_count, 6)
+        self.assertEqual(self.mock_request.call_count, 6)
 
         # Assert sleep times are exponential until plateau
         expected_sleep_times = [0.1, 0.2, 0.4, 0.5, 0.5]
         self.assertListEqual(sleep_times, expected_sleep_times)
+
+
+class TestConfigureSession(unittest.TestCase):
+    def setUp(self) -> None:
+        # Reconfigure + clear session cache between each test
+        configure_http_backend()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        # Clear all sessions after tests
+        configure_http_backend()
+
+    @staticmethod
+    def _factory() -> requests.Session:
+        session = requests.Session()
+        session.headers.update({"x-test-header": "4"})
+        return session
+
+    def test_default_session_is_pooled(self) -> None:
+        session = get_session()
+        adapter = session.get_adapter("https://huggingface.co")
+        self.assertGreater(adapter._pool_maxsize, 10)  # more than requests' default
+
+    def test_get_session_twice(self):
+        session_1 = get_session()
+        session_2 = get_session()
+        self.assertIs(session_1, session_2)  # exact same instance
+
+    def test_get_session_shared_across_threads(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(get_session()))
+        thread.start()
+        thread.join()
+        self.assertIs(sessions[0], get_session())
+
+    def test_get_session_after_fork(self):
+        session = get_session()
+        with patch("huggingface_hub.utils._http.os.getpid", return_value=-1):
+            session_in_child = get_session()
+        self.assertIsNot(session, session_in_child)
+
+    def test_set_configuration(self) -> None:
+        configure_http_backend(backend_factory=self._factory)
+
+        # Check headers have been set correctly
+        session = get_session()
+        self.assertNotEqual(session.headers, {"x-test-header": 4})
+        self.assertEqual(session.headers["x-test-header"], "4")
+
+    def test_configure_closes_previous_session(self) -> None:
+        session = get_session()
+        with patch.object(session, "close") as mock_close:
+            configure_http_backend(backend_factory=self._factory)
+        mock_close.assert_called_once()
+        self.assertIsNot(session, get_session())
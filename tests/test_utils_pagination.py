@@ -7,12 +7,13 @@ from .testing_utils import handle_injection_in_test
 
 
 class TestPagination(unittest.TestCase):
-    @patch("huggingface_hub.utils._pagination.requests.get")
+    @patch("huggingface_hub.utils._pagination.get_session")
     @patch("huggingface_hub.utils._pagination.hf_raise_for_status")
     @handle_injection_in_test
     def test_mocked_paginate(
-        self, mock_get: Mock, mock_hf_raise_for_status: Mock
+        self, mock_get_session: Mock, mock_hf_raise_for_status: Mock
     ) -> None:
+        mock_get = mock_get_session().get
         mock_params = Mock()
         mock_headers = Mock()
 
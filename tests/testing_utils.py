@@ -1,17 +1,32 @@
+import hashlib
 import inspect
 import os
+import re
 import shutil
 import stat
 import sys
+import threading
 import time
 import unittest
 import uuid
 from contextlib import contextmanager
 from enum import Enum
 from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import StringIO
 from pathlib import Path
-from typing import Callable, Generator, Optional, Type, TypeVar, Union
+from typing import (
+    Callable,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from unittest.mock import Mock, patch
 
 import pytest
@@ -141,15 +156,17 @@ def offline(mode=OfflineSimulationMode.CONNECTION_FAILS, timeout=1e-16):
         Connection errors are created by mocking socket.socket
     CONNECTION_TIMES_OUT: the connection hangs until it times out.
         The default timeout value is low (1e-16) to speed up the tests.
-        Timeout errors are created by mocking requests.request
+        Timeout errors are created by mocking requests.Session.request
     HF_HUB_OFFLINE_SET_TO_1: the HF_HUB_OFFLINE_SET_TO_1 environment variable is set to 1.
         This makes the http/ftp calls of the library instantly fail and raise an OfflineModeEnabled error.
     """
     import socket
 
-    from requests import request as online_request
+    from requests import Session
+
+    online_request = Session.request
 
-    def timeout_request(method, url, **kwargs):
+    def timeout_request(self, method, url, **kwargs):
         # Change the url to an invalid url so that the connection hangs
         invalid_url = "https://10.255.255.1"
         if kwargs.get("timeout") is None:
@@ -159,7 +176,7 @@ def offline(mode=OfflineSimulationMode.CONNECTION_FAILS, timeout=1e-16):
             )
         kwargs["timeout"] = timeout
         try:
-            return online_request(method, invalid_url, **kwargs)
+            return online_request(self, method, invalid_url, **kwargs)
         except Exception as e:
             # The following changes in the error are just here to make the offline timeout error prettier
             e.request.url = url
@@ -179,7 +196,7 @@ def offline(mode=OfflineSimulationMode.CONNECTION_FAILS, timeout=1e-16):
             yield
     elif mode is OfflineSimulationMode.CONNECTION_TIMES_OUT:
         # inspired from https://stackoverflow.com/a/904609
-        with patch("requests.request", timeout_request):
+        with patch("requests.Session.request", timeout_request):
             yield
     elif mode is OfflineSimulationMode.HF_HUB_OFFLINE_SET_TO_1:
         with patch("huggingface_hub.constants.HF_HUB_OFFLINE", True):
@@ -349,6 +366,182 @@ def capture_output() -> Generator[StringIO, None, None]:
     sys.stdout = previous_output
 
 
+class RecordedRequest(NamedTuple):
+    method: str
+    path: str
+    headers: Dict[str, str]
+    query: str = ""
+
+
+class LocalHttpServer:
+    """Minimal HTTP server serving in-memory files on localhost, for offline tests.
+
+    Supports `HEAD` and `GET` requests, including HTTP range requests. Each request is
+    recorded in `server.requests` so that tests can check which calls have been made.
+    Connection drops can be simulated by appending a number of bytes to
+    `server.interrupt_after`: the next `GET` response is cut after that many bytes.
+    If `server.token` is set, requests without this token get a 401 (as for a private
+    repo on the Hub).
+
+    Example:
+    ```py
+    with LocalHttpServer() as server:
+        server.add_file("/file.bin", b"content", headers={"ETag": '"123"'})
+        requests.get(server.url + "/file.bin", headers={"Range": "bytes=0-2"}) # b"con"
+        server.requests # [RecordedRequest(method="GET", path="/file.bin", ...)]
+    ```
+
+    In a `unittest.TestCase`, use `start_local_hub(self)` in `setUp` to start a server
+    for the duration of the test and download files from it.
+    """
+
+    def __init__(self) -> None:
+        self.files: Dict[str, bytes] = {}
+        self.headers: Dict[str, Dict[str, str]] = {}
+        self.requests: List[RecordedRequest] = []
+        self.support_ranges = True
+        self.interrupt_after: List[int] = []
+        self.not_found_headers: Dict[str, str] = {}
+        self.token: Optional[str] = None
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass  # silent
+
+            def do_HEAD(self) -> None:
+                self._respond(send_body=False)
+
+            def do_GET(self) -> None:
+                self._respond(send_body=True)
+
+            def _respond(self, send_body: bool) -> None:
+                path, _, query = self.path.partition("?")
+                server.requests.append(
+                    RecordedRequest(self.command, path, dict(self.headers), query)
+                )
+                if server.token is not None and self.headers["Authorization"] != (
+                    "Bearer " + server.token
+                ):
+                    self.send_response(401)
+                    self.send_header("X-Error-Code", "RepoNotFound")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if path not in server.files:
+                    self.send_response(404)
+                    for key, value in server.not_found_headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                content = server.files[path]
+                status = 200
+                range_match = re.match(
+                    r"bytes=(\d+)-(\d*)", self.headers["Range"] or ""
+                )
+                if range_match is not None and server.support_ranges:
+                    start = int(range_match.group(1))
+                    end = int(range_match.group(2) or len(content) - 1)
+                    status = 206
+                    content = content[start : end + 1]
+
+                self.send_response(status)
+                for key, value in server.headers.get(path, {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if send_body:
+                    if server.interrupt_after:
+                        # Send partial content and drop the connection
+                        content = content[: server.interrupt_after.pop(0)]
+                        self.close_connection = True
+                    self.wfile.write(content)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def add_file(
+        self, path: str, content: bytes, headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Serve `content` at `path`. Returns the full url of the file."""
+        self.files[path] = content
+        self.headers[path] = headers or {}
+        return self.url + path
+
+    def add_repo_file(
+        self,
+        repo_id: str,
+        filename: str,
+        content: bytes,
+        *,
+        commit_hash: str = "a" * 40,
+        revisions: Tuple[str, ...] = ("main",),
+        lfs: bool = False,
+    ) -> str:
+        """Serve a file as the Hub `resolve/` endpoint would. Returns its etag.
+
+        To be used with `HUGGINGFACE_CO_URL_TEMPLATE` patched (see
+        `LocalHttpServer.patch_hub`).
+        """
+        if lfs:
+            etag = hashlib.sha256(content).hexdigest()
+        else:
+            etag = hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+        headers = {
+            "ETag": f'"{etag}"',
+            "X-Repo-Commit": commit_hash,
+            "X-Linked-Size": str(len(content)),
+        }
+        for revision in {*revisions, commit_hash}:
+            self.add_file(f"/{repo_id}/resolve/{revision}/{filename}", content, headers)
+        # Missing files are reported as such by the Hub
+        self.not_found_headers = {
+            "X-Error-Code": "EntryNotFound",
+            "X-Repo-Commit": commit_hash,
+        }
+        return etag
+
+    def patch_hub(self):
+        """Patch `HUGGINGFACE_CO_URL_TEMPLATE` so that files are downloaded from this server.
+
+        Can be used as a context manager or started/stopped as any `unittest.mock` patcher.
+        """
+        return patch_hub_url(self.url)
+
+    def __enter__(self) -> "LocalHttpServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def patch_hub_url(url: str):
+    """Patch `HUGGINGFACE_CO_URL_TEMPLATE` so that files are downloaded from `url`."""
+    return patch(
+        "huggingface_hub.file_download.HUGGINGFACE_CO_URL_TEMPLATE",
+        url + "/{repo_id}/resolve/{revision}/{filename}",
+    )
+
+
+def start_local_hub(test_case: unittest.TestCase) -> LocalHttpServer:
+    """Start a [`LocalHttpServer`] for the duration of a test and download files from it.
+
+    Both the server and the patch of `HUGGINGFACE_CO_URL_TEMPLATE` are cleaned up at the
+    end of the test. To be called in `setUp`.
+    """
+    server = LocalHttpServer().__enter__()
+    test_case.addCleanup(server.__exit__)
+    patcher = server.patch_hub()
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return server
+
+
 T = TypeVar("T")
 
 